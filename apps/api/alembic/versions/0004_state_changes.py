@@ -0,0 +1,44 @@
+"""state change feed
+
+Revision ID: 0004_state_changes
+Revises: 0003_prod_hardening_indexes
+Create Date: 2026-10-19 09:00:00
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision = "0004_state_changes"
+down_revision = "0003_prod_hardening_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "state_changes",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), primary_key=True, nullable=False),
+        sa.Column(
+            "workspace_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("workspaces.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("change_type", sa.String(length=64), nullable=False),
+        sa.Column("entity_type", sa.String(length=32), nullable=False),
+        sa.Column("entity_id", sa.String(length=255), nullable=False),
+        sa.Column("data", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index(
+        "ix_state_changes_workspace_id_id",
+        "state_changes",
+        ["workspace_id", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_state_changes_workspace_id_id", table_name="state_changes")
+    op.drop_table("state_changes")
@@ -0,0 +1,73 @@
+"""effective policy projection
+
+Revision ID: 0005_effective_policy
+Revises: 0004_state_changes
+Create Date: 2026-10-19 15:00:00
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision = "0005_effective_policy"
+down_revision = "0004_state_changes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Concurrent binds could leave more than one active binding per agent; keep the
+    # most recent one so the partial unique index can be built.
+    op.execute(
+        """
+        UPDATE agent_policy_bindings AS stale
+        SET status = 'inactive', unbound_at = now()
+        WHERE stale.status = 'active'
+          AND EXISTS (
+            SELECT 1 FROM agent_policy_bindings AS newer
+            WHERE newer.agent_id = stale.agent_id
+              AND newer.status = 'active'
+              AND (newer.bound_at, newer.id) > (stale.bound_at, stale.id)
+          )
+        """
+    )
+    op.create_index(
+        "uq_agent_policy_bindings_active_agent",
+        "agent_policy_bindings",
+        ["workspace_id", "agent_id"],
+        unique=True,
+        postgresql_where=sa.text("status = 'active'"),
+    )
+
+    op.add_column(
+        "agents",
+        sa.Column(
+            "effective_policy_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey(
+                "policies.id",
+                name="fk_agents_effective_policy_id_policies",
+                ondelete="SET NULL",
+            ),
+            nullable=True,
+        ),
+    )
+    op.execute(
+        """
+        UPDATE agents
+        SET effective_policy_id = binding.policy_id
+        FROM agent_policy_bindings AS binding
+        WHERE binding.agent_id = agents.id
+          AND binding.workspace_id = agents.workspace_id
+          AND binding.status = 'active'
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("agents", "effective_policy_id")
+    op.drop_index(
+        "uq_agent_policy_bindings_active_agent",
+        table_name="agent_policy_bindings",
+    )
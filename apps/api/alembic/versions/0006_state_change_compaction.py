@@ -0,0 +1,29 @@
+"""state change compaction indexes
+
+Revision ID: 0006_state_change_compaction
+Revises: 0005_effective_policy
+Create Date: 2026-10-19 18:00:00
+"""
+
+from alembic import op
+
+revision = "0006_state_change_compaction"
+down_revision = "0005_effective_policy"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Finding whether a newer change to the same entity exists, and the rows old
+    # enough to prune.
+    op.create_index(
+        "ix_state_changes_entity",
+        "state_changes",
+        ["workspace_id", "entity_type", "entity_id", "id"],
+    )
+    op.create_index("ix_state_changes_created_at", "state_changes", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_state_changes_created_at", table_name="state_changes")
+    op.drop_index("ix_state_changes_entity", table_name="state_changes")
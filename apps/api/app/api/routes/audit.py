@@ -1,17 +1,31 @@
 import logging
+from collections.abc import Iterator
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.core.auth import AuthContext, ensure_workspace_match, get_auth_context
-from app.core.openapi import COMMON_ERROR_RESPONSES
-from app.db.session import get_db
-from app.modules.audit_log.export_service import build_audit_csv
+from app.core.openapi import COMMON_ERROR_RESPONSES, WORKSPACE_BUSY_RESPONSES
+from app.core.responses import serialized_response
+from app.core.workspace_scheduler import (
+    WorkspaceLease,
+    acquire_workspace_slot,
+    lease_workspace_slot,
+)
+from app.db.replicas import get_read_db, read_router
+from app.modules.audit_log.export_service import build_audit_csv, iter_audit_ndjson
 from app.modules.audit_log.integrity_service import check_audit_integrity
-from app.modules.audit_log.query_service import list_audit_events, list_audit_events_for_export
+from app.modules.audit_log.query_service import (
+    iter_audit_event_batches_for_chain_export,
+    list_audit_events,
+    list_audit_events_for_export,
+)
 from app.observability.metrics import observe_audit_integrity
 from app.schemas.audit import (
+    AUDIT_EVENT_LIST_ADAPTER,
+    AUDIT_EVENTS_PAGE_ADAPTER,
     AuditEventResponse,
     AuditEventsListResponse,
     AuditExportQueryParams,
@@ -26,8 +40,11 @@ from app.schemas.audit_integrity import (
 )
 
 router = APIRouter(tags=["audit"])
-DbSession = Annotated[Session, Depends(get_db)]
+# Audit reads and exports go to a replica when one is configured and current.
+ReadDbSession = Annotated[Session, Depends(get_read_db)]
 Auth = Annotated[AuthContext, Depends(get_auth_context)]
+WorkspaceSlot = Annotated[None, Depends(acquire_workspace_slot)]
+StreamWorkspaceSlot = Annotated[WorkspaceLease | None, Depends(lease_workspace_slot)]
 AuditQuery = Annotated[AuditQueryParams, Depends(get_audit_query_params)]
 AuditExportQuery = Annotated[AuditExportQueryParams, Depends(get_audit_export_query_params)]
 AuditIntegrityQuery = Annotated[
@@ -41,21 +58,23 @@ logger = logging.getLogger("kya.audit")
     response_model=AuditEventsListResponse,
     summary="List Audit Events",
     description="Returns paginated audit events with optional filters.",
-    responses=COMMON_ERROR_RESPONSES,
+    responses={**COMMON_ERROR_RESPONSES, **WORKSPACE_BUSY_RESPONSES},
 )
 def list_audit_events_endpoint(
+    _: WorkspaceSlot,
     query: AuditQuery,
     auth: Auth,
-    db: DbSession,
-) -> AuditEventsListResponse:
+    db: ReadDbSession,
+) -> Response:
     ensure_workspace_match(auth.workspace_id, query.workspace_id)
     events, count = list_audit_events(db, query)
-    return AuditEventsListResponse(
-        items=[AuditEventResponse.model_validate(event) for event in events],
+    page = AuditEventsListResponse(
+        items=AUDIT_EVENT_LIST_ADAPTER.validate_python(events, from_attributes=True),
         count=count,
         limit=query.limit,
         offset=query.offset,
     )
+    return serialized_response(AUDIT_EVENTS_PAGE_ADAPTER, page)
 
 
 @router.get(
@@ -63,28 +82,31 @@ def list_audit_events_endpoint(
     response_model=list[AuditEventResponse],
     summary="Export Audit Events (JSON)",
     description="Exports filtered audit events as JSON.",
-    responses=COMMON_ERROR_RESPONSES,
+    responses={**COMMON_ERROR_RESPONSES, **WORKSPACE_BUSY_RESPONSES},
 )
 def export_audit_json_endpoint(
+    _: WorkspaceSlot,
     query: AuditExportQuery,
     auth: Auth,
-    db: DbSession,
-) -> list[AuditEventResponse]:
+    db: ReadDbSession,
+) -> Response:
     ensure_workspace_match(auth.workspace_id, query.workspace_id)
     events = list_audit_events_for_export(db, query)
-    return [AuditEventResponse.model_validate(event) for event in events]
+    items = AUDIT_EVENT_LIST_ADAPTER.validate_python(events, from_attributes=True)
+    return serialized_response(AUDIT_EVENT_LIST_ADAPTER, items)
 
 
 @router.get(
     "/audit/export.csv",
     summary="Export Audit Events (CSV)",
     description="Exports filtered audit events as CSV.",
-    responses=COMMON_ERROR_RESPONSES,
+    responses={**COMMON_ERROR_RESPONSES, **WORKSPACE_BUSY_RESPONSES},
 )
 def export_audit_csv_endpoint(
+    _: WorkspaceSlot,
     query: AuditExportQuery,
     auth: Auth,
-    db: DbSession,
+    db: ReadDbSession,
 ) -> Response:
     ensure_workspace_match(auth.workspace_id, query.workspace_id)
     events = list_audit_events_for_export(db, query)
@@ -92,6 +114,48 @@ def export_audit_csv_endpoint(
     return Response(content=content, media_type="text/csv")
 
 
+@router.get(
+    "/audit/export.ndjson",
+    summary="Export Audit Chain (NDJSON)",
+    description=(
+        "Exports the audit hash chain oldest-first as newline-delimited JSON, including "
+        "every hash input, for offline verification with `limiq-audit-verify`."
+    ),
+    responses={**COMMON_ERROR_RESPONSES, **WORKSPACE_BUSY_RESPONSES},
+)
+def export_audit_ndjson_endpoint(
+    lease: StreamWorkspaceSlot,
+    query: AuditIntegrityQuery,
+    auth: Auth,
+) -> StreamingResponse:
+    ensure_workspace_match(auth.workspace_id, query.workspace_id)
+    stream = _stream_chain_export(query, lease)
+    # Started here, so the stream owns the workspace slot from now on and releases
+    # it when it finishes, fails or is dropped with the connection.
+    next(stream)
+    return StreamingResponse(stream, media_type="application/x-ndjson")
+
+
+def _stream_chain_export(
+    query: AuditIntegrityQueryParams, lease: WorkspaceLease | None
+) -> Iterator[str]:
+    if lease is not None:
+        lease.keep()
+    try:
+        yield ""
+        # Request-scoped sessions are closed before the body is sent, so the stream
+        # owns its own. One cursor in one transaction keeps the export a consistent
+        # snapshot of the chain however long it takes to send.
+        db = read_router.session()
+        try:
+            yield from iter_audit_ndjson(iter_audit_event_batches_for_chain_export(db, query))
+        finally:
+            db.close()
+    finally:
+        if lease is not None:
+            lease.release()
+
+
 @router.get(
     "/audit/integrity/check",
     response_model=AuditIntegrityResponse,
@@ -99,12 +163,13 @@ def export_audit_csv_endpoint(
     description=(
         "Verifies hash-chain continuity in a workspace. Returns OK, BROKEN or PARTIAL."
     ),
-    responses=COMMON_ERROR_RESPONSES,
+    responses={**COMMON_ERROR_RESPONSES, **WORKSPACE_BUSY_RESPONSES},
 )
 def check_audit_integrity_endpoint(
+    _: WorkspaceSlot,
     query: AuditIntegrityQuery,
     auth: Auth,
-    db: DbSession,
+    db: ReadDbSession,
 ) -> AuditIntegrityResponse:
     ensure_workspace_match(auth.workspace_id, query.workspace_id)
     result = check_audit_integrity(db, query)
@@ -4,14 +4,23 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from app.core.auth import AuthContext, ensure_workspace_match, get_auth_context
-from app.core.openapi import COMMON_ERROR_RESPONSES
+from app.core.errors import raise_http_error
+from app.core.openapi import COMMON_ERROR_RESPONSES, WORKSPACE_BUSY_RESPONSES
+from app.core.workspace_scheduler import acquire_workspace_slot
 from app.db.session import get_db
 from app.modules.capability_issuer.service import issue_capability
-from app.schemas.capability import CapabilityIssueResponse, CapabilityRequest
+from app.modules.revocation.service import get_capability_for_revoke, revoke_capability
+from app.schemas.capability import (
+    CapabilityIssueResponse,
+    CapabilityRequest,
+    CapabilityRevokeRequest,
+    CapabilityRevokeResponse,
+)
 
 router = APIRouter(tags=["capabilities"])
 DbSession = Annotated[Session, Depends(get_db)]
 Auth = Annotated[AuthContext, Depends(get_auth_context)]
+WorkspaceSlot = Annotated[None, Depends(acquire_workspace_slot)]
 
 
 @router.post(
@@ -22,6 +31,7 @@ Auth = Annotated[AuthContext, Depends(get_auth_context)]
     description="Issues a signed capability token if agent/policy constraints allow it.",
     responses={
         **COMMON_ERROR_RESPONSES,
+        **WORKSPACE_BUSY_RESPONSES,
         404: {
             "description": "Agent or policy binding not found.",
             "content": {
@@ -48,9 +58,73 @@ Auth = Annotated[AuthContext, Depends(get_auth_context)]
     },
 )
 def request_capability_endpoint(
+    _: WorkspaceSlot,
     payload: CapabilityRequest,
     auth: Auth,
     db: DbSession,
 ) -> CapabilityIssueResponse:
     ensure_workspace_match(auth.workspace_id, payload.workspace_id)
     return issue_capability(db, payload)
+
+
+@router.post(
+    "/capabilities/{jti}/revoke",
+    response_model=CapabilityRevokeResponse,
+    summary="Revoke Capability",
+    description=(
+        "Revokes an issued capability token by its `jti`. Verification of the token is "
+        "denied from then on, and embedded verifiers learn of it through the change feed."
+    ),
+    responses={
+        **COMMON_ERROR_RESPONSES,
+        404: {
+            "description": "Capability not found.",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": {
+                            "code": "CAPABILITY_NOT_FOUND",
+                            "message": "Capability not found",
+                        }
+                    }
+                }
+            },
+        },
+        409: {
+            "description": "Capability already revoked.",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": {
+                            "code": "CAPABILITY_ALREADY_REVOKED",
+                            "message": "Capability is already revoked",
+                        }
+                    }
+                }
+            },
+        },
+    },
+)
+def revoke_capability_endpoint(
+    jti: str,
+    payload: CapabilityRevokeRequest,
+    auth: Auth,
+    db: DbSession,
+) -> CapabilityRevokeResponse:
+    ensure_workspace_match(auth.workspace_id, payload.workspace_id)
+    capability = get_capability_for_revoke(db, workspace_id=auth.workspace_id, jti=jti)
+    if capability is None:
+        raise_http_error(404, "CAPABILITY_NOT_FOUND", "Capability not found")
+    if capability.status == "revoked":
+        raise_http_error(409, "CAPABILITY_ALREADY_REVOKED", "Capability is already revoked")
+
+    capability = revoke_capability(db, capability, reason=payload.reason)
+    if capability.revoked_at is None:
+        raise RuntimeError("revoked_at must be set after revoke")
+
+    return CapabilityRevokeResponse(
+        capability_id=capability.id,
+        jti=capability.jti,
+        status=capability.status,
+        revoked_at=capability.revoked_at,
+    )
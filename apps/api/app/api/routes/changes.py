@@ -0,0 +1,70 @@
+import asyncio
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from starlette.concurrency import run_in_threadpool
+
+from app.core.auth import AuthContext, ensure_workspace_match, get_auth_context
+from app.core.config import settings
+from app.core.openapi import COMMON_ERROR_RESPONSES
+from app.db.session import SessionLocal
+from app.modules.change_feed.service import list_state_changes
+from app.schemas.change_feed import StateChangeItem, StateChangesResponse
+
+router = APIRouter(tags=["verifier"])
+Auth = Annotated[AuthContext, Depends(get_auth_context)]
+
+
+def _load_changes(workspace_id: UUID, cursor: int, limit: int) -> list[StateChangeItem]:
+    # A short session per poll: a waiting request must not pin a pooled connection.
+    with SessionLocal() as db:
+        return [
+            StateChangeItem(
+                cursor=change.id,
+                change_type=change.change_type,
+                entity_type=change.entity_type,
+                entity_id=change.entity_id,
+                data=change.data,
+                created_at=change.created_at,
+            )
+            for change in list_state_changes(
+                db, workspace_id=workspace_id, cursor=cursor, limit=limit
+            )
+        ]
+
+
+@router.get(
+    "/changes",
+    response_model=StateChangesResponse,
+    summary="List State Changes",
+    description=(
+        "Returns agent, policy, binding and revocation changes after 'cursor', oldest first. "
+        "With 'wait_seconds', the request is held until a change arrives or the wait ends. "
+        "Changes older than STATE_CHANGE_RETENTION_SECONDS are compacted. Each change "
+        "carries the full entity state, so a reader that far behind still reaches current "
+        "state, but it does not see every intermediate change."
+    ),
+    responses=COMMON_ERROR_RESPONSES,
+)
+async def list_state_changes_endpoint(
+    workspace_id: Annotated[UUID, Query(description="Workspace identifier")],
+    auth: Auth,
+    cursor: Annotated[int, Query(ge=0, description="Last cursor already applied")] = 0,
+    limit: Annotated[int, Query(ge=1, le=500, description="Page size")] = 100,
+    wait_seconds: Annotated[
+        float, Query(ge=0, description="Long-poll duration when nothing is pending")
+    ] = 0.0,
+) -> StateChangesResponse:
+    ensure_workspace_match(auth.workspace_id, workspace_id)
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + min(wait_seconds, settings.change_feed_max_wait_seconds)
+    while True:
+        items = await run_in_threadpool(_load_changes, workspace_id, cursor, limit)
+        remaining = deadline - loop.time()
+        if items or remaining <= 0:
+            break
+        await asyncio.sleep(min(settings.change_feed_poll_interval_seconds, remaining))
+
+    return StateChangesResponse(items=items, next_cursor=items[-1].cursor if items else cursor)
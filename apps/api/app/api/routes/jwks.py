@@ -0,0 +1,42 @@
+import hashlib
+import json
+from typing import Annotated
+
+from fastapi import APIRouter, Header, Response
+
+from app.core.config import settings
+from app.core.jwt_keys import jwt_public_jwks
+from app.schemas.jwks import JwksResponse
+
+router = APIRouter(tags=["keys"])
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # Weak comparison (RFC 9110 13.1.2): a W/ prefix from an intermediary still matches.
+    candidates = [value.strip().removeprefix("W/") for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+@router.get(
+    "/.well-known/jwks.json",
+    response_model=JwksResponse,
+    summary="Get Capability Token Keys",
+    description=(
+        "Public Ed25519 keys, by 'kid', that verify capability tokens: the signing key and "
+        "any retired key whose tokens may still be live. Cacheable; revalidate with "
+        "If-None-Match."
+    ),
+    responses={304: {"description": "Key set unchanged since the given ETag."}},
+)
+def get_jwks_endpoint(
+    if_none_match: Annotated[str | None, Header(include_in_schema=False)] = None,
+) -> Response:
+    body = json.dumps({"keys": jwt_public_jwks()}, separators=(",", ":"), sort_keys=True)
+    etag = f'"{hashlib.sha256(body.encode("utf-8")).hexdigest()[:32]}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.jwks_cache_max_age_seconds}",
+    }
+    if if_none_match is not None and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,60 @@
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.core.auth import AuthContext, ensure_workspace_match, get_auth_context
+from app.core.openapi import COMMON_ERROR_RESPONSES, WORKSPACE_BUSY_RESPONSES
+from app.core.workspace_scheduler import acquire_workspace_slot
+from app.db.session import get_db
+from app.modules.verifier_sync.service import build_verifier_state, record_local_decisions
+from app.schemas.verifier import (
+    LocalDecisionBatchRequest,
+    LocalDecisionBatchResponse,
+    VerifierStateResponse,
+)
+
+router = APIRouter(tags=["verifier"])
+DbSession = Annotated[Session, Depends(get_db)]
+Auth = Annotated[AuthContext, Depends(get_auth_context)]
+WorkspaceSlot = Annotated[None, Depends(acquire_workspace_slot)]
+
+
+@router.get(
+    "/verifier/state",
+    response_model=VerifierStateResponse,
+    summary="Get Verifier State",
+    description=(
+        "Returns what an embedded verifier needs to decide locally: capability token keys, "
+        "agents, policies, active bindings and revoked capabilities, with the change feed "
+        "cursor to follow GET /changes from."
+    ),
+    responses={**COMMON_ERROR_RESPONSES, **WORKSPACE_BUSY_RESPONSES},
+)
+def get_verifier_state_endpoint(
+    _: WorkspaceSlot,
+    workspace_id: Annotated[UUID, Query(description="Workspace identifier")],
+    auth: Auth,
+    db: DbSession,
+) -> VerifierStateResponse:
+    ensure_workspace_match(auth.workspace_id, workspace_id)
+    return build_verifier_state(db, workspace_id=workspace_id)
+
+
+@router.post(
+    "/verifier/decisions",
+    response_model=LocalDecisionBatchResponse,
+    status_code=201,
+    summary="Record Local Decisions",
+    description="Appends a batch of decisions taken by an embedded verifier to the audit log.",
+    responses={**COMMON_ERROR_RESPONSES, **WORKSPACE_BUSY_RESPONSES},
+)
+def record_local_decisions_endpoint(
+    _: WorkspaceSlot,
+    payload: LocalDecisionBatchRequest,
+    auth: Auth,
+    db: DbSession,
+) -> LocalDecisionBatchResponse:
+    ensure_workspace_match(auth.workspace_id, payload.workspace_id)
+    return LocalDecisionBatchResponse(accepted=record_local_decisions(db, payload))
@@ -1,23 +1,56 @@
 import logging
 from time import perf_counter
-from typing import Annotated
+from typing import Annotated, Any
 
 import jwt
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
 
+from app.core.admission import VerifyAdmission, admit_verify_request, shed_expired_deadline
 from app.core.auth import AuthContext, ensure_workspace_match, get_auth_context
-from app.core.openapi import COMMON_ERROR_RESPONSES
+from app.core.config import settings
+from app.core.deadlines import RequestDeadline, get_request_deadline
+from app.core.openapi import COMMON_ERROR_RESPONSES, WORKSPACE_BUSY_RESPONSES
+from app.core.workspace_scheduler import acquire_workspace_slot
 from app.db.session import get_db
 from app.modules.verify_engine.service import verify_action
-from app.observability.metrics import observe_verify
-from app.schemas.verify import VerifyRequest, VerifyResponse
+from app.observability.metrics import observe_verify, observe_verify_stages
+from app.observability.stage_timer import StageTimer
+from app.schemas.verify import (
+    VerifyBatchRequest,
+    VerifyBatchResponse,
+    VerifyRequest,
+    VerifyResponse,
+)
 
 router = APIRouter(tags=["verify"])
 DbSession = Annotated[Session, Depends(get_db)]
 Auth = Annotated[AuthContext, Depends(get_auth_context)]
+Deadline = Annotated[RequestDeadline | None, Depends(get_request_deadline)]
+Admitted = Annotated[VerifyAdmission, Depends(admit_verify_request)]
+WorkspaceSlot = Annotated[None, Depends(acquire_workspace_slot)]
 logger = logging.getLogger("kya.verify")
 
+SHED_RESPONSES: dict[int | str, dict[str, Any]] = {
+    503: {
+        "description": (
+            "Shed before processing: the X-Request-Timeout-Ms budget expired "
+            "(DEADLINE_EXCEEDED), or verify is at its concurrency limit (OVERLOADED, "
+            "with Retry-After)."
+        ),
+        "content": {
+            "application/json": {
+                "example": {
+                    "detail": {
+                        "code": "DEADLINE_EXCEEDED",
+                        "message": "Request deadline expired before processing",
+                    }
+                }
+            }
+        },
+    },
+}
+
 
 def _extract_jti_unverified(token: str) -> str | None:
     try:
@@ -46,20 +79,12 @@ def _extract_jti_unverified(token: str) -> str | None:
     return str(jti) if isinstance(jti, str) else None
 
 
-@router.post(
-    "/verify",
-    response_model=VerifyResponse,
-    summary="Verify Action",
-    description=(
-        "Validates an agent action request against capability token, signature, "
-        "policy binding and runtime constraints."
-    ),
-    responses=COMMON_ERROR_RESPONSES,
-)
-def verify_endpoint(payload: VerifyRequest, auth: Auth, db: DbSession) -> VerifyResponse:
-    ensure_workspace_match(auth.workspace_id, payload.workspace_id)
+def _verify_and_observe(
+    db: Session, payload: VerifyRequest, *, path: str
+) -> tuple[VerifyResponse, StageTimer, float]:
+    timer = StageTimer()
     start = perf_counter()
-    response = verify_action(db, payload)
+    response = verify_action(db, payload, timer)
     latency_seconds = perf_counter() - start
 
     observe_verify(
@@ -67,6 +92,7 @@ def verify_endpoint(payload: VerifyRequest, auth: Auth, db: DbSession) -> Verify
         reason_code=response.reason_code,
         latency_seconds=latency_seconds,
     )
+    observe_verify_stages(response.decision, timer.durations)
     logger.info(
         "verify_decision",
         extra={
@@ -77,8 +103,71 @@ def verify_endpoint(payload: VerifyRequest, auth: Auth, db: DbSession) -> Verify
             "decision": response.decision,
             "reason_code": response.reason_code,
             "audit_event_id": str(response.audit_event_id),
-            "path": "/verify",
+            "latency_ms": round(latency_seconds * 1000, 2),
+            "stage_ms": timer.as_milliseconds(),
+            "path": path,
             "method": "POST",
         },
     )
+    return response, timer, latency_seconds
+
+
+@router.post(
+    "/verify",
+    response_model=VerifyResponse,
+    summary="Verify Action",
+    description=(
+        "Validates an agent action request against capability token, signature, "
+        "policy binding and runtime constraints."
+    ),
+    responses={**COMMON_ERROR_RESPONSES, **WORKSPACE_BUSY_RESPONSES, **SHED_RESPONSES},
+)
+def verify_endpoint(
+    # Workspace quota first, so one tenant's backlog queues behind its own quota
+    # instead of holding global admission slots.
+    _workspace: WorkspaceSlot,
+    _: Admitted,
+    payload: VerifyRequest,
+    auth: Auth,
+    db: DbSession,
+    http_response: Response,
+    deadline: Deadline,
+) -> VerifyResponse:
+    ensure_workspace_match(auth.workspace_id, payload.workspace_id)
+    # Checked again here: the budget may have run out while waiting for a thread.
+    shed_expired_deadline(deadline)
+    response, timer, latency_seconds = _verify_and_observe(db, payload, path="/verify")
+    if settings.verify_server_timing_enabled:
+        http_response.headers["Server-Timing"] = timer.server_timing_header(latency_seconds)
     return response
+
+
+@router.post(
+    "/verify/batch",
+    response_model=VerifyBatchResponse,
+    summary="Verify Actions (Batch)",
+    description=(
+        "Verifies up to 100 actions of one workspace in one request, each exactly as "
+        "POST /verify would, with its own decision and audit events. Results are in "
+        "request order."
+    ),
+    responses={**COMMON_ERROR_RESPONSES, **WORKSPACE_BUSY_RESPONSES, **SHED_RESPONSES},
+)
+def verify_batch_endpoint(
+    _workspace: WorkspaceSlot,
+    admission: Admitted,
+    payload: VerifyBatchRequest,
+    auth: Auth,
+    db: DbSession,
+    deadline: Deadline,
+) -> VerifyBatchResponse:
+    # Every item is checked before any is decided, so a mismatch never leaves part
+    # of the batch audited.
+    for item in payload.items:
+        ensure_workspace_match(auth.workspace_id, item.workspace_id)
+    shed_expired_deadline(deadline)
+    # One admission slot, one thread and one DB session for the whole batch.
+    admission.decisions = len(payload.items)
+    return VerifyBatchResponse(
+        results=[_verify_and_observe(db, item, path="/verify/batch")[0] for item in payload.items]
+    )
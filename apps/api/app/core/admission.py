@@ -0,0 +1,113 @@
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Annotated
+
+from fastapi import Depends
+
+from app.core.config import settings
+from app.core.deadlines import RequestDeadline, ensure_deadline_not_expired, get_request_deadline
+from app.core.errors import raise_http_error
+from app.observability.metrics import observe_verify_admission, observe_verify_shed
+
+
+@dataclass
+class VerifyAdmission:
+    # Decisions made under this admission. A batch takes one slot (one thread, one DB
+    # connection) but reports its latency per decision, so batching does not read as
+    # congestion.
+    decisions: int = 1
+
+
+@dataclass(frozen=True)
+class AdmissionPolicy:
+    initial_limit: int
+    min_limit: int
+    max_limit: int
+    # Completions slower than this are treated as congestion.
+    latency_target_seconds: float
+    backoff_ratio: float = 0.9
+
+
+# AIMD concurrency limit. Each fast completion while at least half the limit is in
+# use adds 1/limit, so the limit only grows while it is actually being used. A
+# completion slower than the latency target cuts it by backoff_ratio, at most once
+# per target interval, so one burst of slow responses cannot collapse it. Used
+# from the event loop only, so it needs no locking.
+class AdaptiveConcurrencyLimiter:
+    def __init__(self, policy: AdmissionPolicy, clock: Callable[[], float] = perf_counter) -> None:
+        self._policy = policy
+        self._clock = clock
+        self._limit = float(min(max(policy.initial_limit, policy.min_limit), policy.max_limit))
+        self._in_flight = 0
+        self._last_decrease = -float("inf")
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def try_acquire(self) -> bool:
+        if self._in_flight >= self.limit:
+            return False
+        self._in_flight += 1
+        return True
+
+    def release(self, latency_seconds: float) -> None:
+        self._in_flight -= 1
+        policy = self._policy
+        if latency_seconds > policy.latency_target_seconds:
+            now = self._clock()
+            if now - self._last_decrease >= policy.latency_target_seconds:
+                self._last_decrease = now
+                self._limit = max(float(policy.min_limit), self._limit * policy.backoff_ratio)
+        elif self._in_flight * 2 >= self.limit:
+            self._limit = min(float(policy.max_limit), self._limit + 1 / self._limit)
+
+
+verify_limiter = AdaptiveConcurrencyLimiter(
+    AdmissionPolicy(
+        initial_limit=settings.verify_concurrency_initial,
+        min_limit=settings.verify_concurrency_min,
+        max_limit=settings.verify_concurrency_max,
+        latency_target_seconds=settings.verify_latency_target_ms / 1000,
+    )
+)
+
+
+def shed_expired_deadline(deadline: RequestDeadline | None) -> None:
+    if deadline is not None and deadline.expired():
+        observe_verify_shed("deadline_expired")
+    ensure_deadline_not_expired(deadline)
+
+
+async def admit_verify_request(
+    deadline: Annotated[RequestDeadline | None, Depends(get_request_deadline)],
+) -> AsyncIterator[VerifyAdmission]:
+    # Runs on the event loop before the request takes a threadpool slot or a DB
+    # connection, so excess load is turned away in microseconds instead of queueing
+    # until the caller gives up. Latency is measured from admission to completion.
+    shed_expired_deadline(deadline)
+    admission = VerifyAdmission()
+    if not settings.verify_admission_enabled:
+        yield admission
+        return
+
+    if not verify_limiter.try_acquire():
+        observe_verify_shed("concurrency_limit")
+        raise_http_error(
+            503,
+            "OVERLOADED",
+            "Verify is at its concurrency limit, retry later",
+            headers={"Retry-After": str(settings.verify_retry_after_seconds)},
+        )
+    observe_verify_admission(verify_limiter.in_flight, verify_limiter.limit)
+    start = perf_counter()
+    try:
+        yield admission
+    finally:
+        verify_limiter.release((perf_counter() - start) / max(1, admission.decisions))
+        observe_verify_admission(verify_limiter.in_flight, verify_limiter.limit)
@@ -8,7 +8,13 @@ BASE_DIR = Path(__file__).resolve().parents[2]
 class Settings(BaseSettings):
     app_name: str = "limiq-io-api"
     app_env: str = "development"
+    app_host: str = "0.0.0.0"
     app_port: int = 8000
+    # Worker processes started by `python -m app.serve`.
+    web_concurrency: int = 1
+    # Metric files shared by workers when web_concurrency > 1; a fresh temporary
+    # directory is used when unset.
+    prometheus_multiproc_dir: str | None = None
 
     postgres_user: str = "kya"
     postgres_password: str = "kya"
@@ -23,12 +29,15 @@ class Settings(BaseSettings):
     kya_jwt_private_key_pem: str | None = None
     kya_jwt_public_key_pem: str | None = None
     kya_jwt_kid: str | None = None
+    # Retired verification keys still published after a rotation, as JSON {"kid": "PEM"}.
+    kya_jwt_previous_public_keys: dict[str, str] = {}
     kya_workspace_bootstrap_token: str | None = None
 
     jwt_leeway_seconds: int = 5
     capability_default_ttl_minutes: int = 15
     capability_min_ttl_minutes: int = 5
     capability_max_ttl_minutes: int = 30
+    jwks_cache_max_age_seconds: int = 300
 
     rate_limit_window_seconds: int = 60
     rate_limit_redis_key_ttl_seconds: int = 70
@@ -37,10 +46,59 @@ class Settings(BaseSettings):
     db_pool_size: int = 5
     db_max_overflow: int = 10
     db_pool_recycle_seconds: int = 1800
+    # Idle pooled connections are pinged in the background at this interval; 0 pings
+    # on every checkout instead.
+    db_pool_validate_interval_seconds: float = 30.0
+    db_slow_query_threshold_ms: float = 100.0
+    # Comma-separated SQLAlchemy URLs of read replicas for audit and lookup reads.
+    db_replica_urls: str = ""
+    # Replicas further behind than this (or unreachable) are skipped for the primary.
+    db_replica_max_lag_seconds: float = 5.0
+    db_replica_check_interval_seconds: float = 2.0
 
     log_level: str = "INFO"
+    # Records buffered for the background log writer; 0 writes synchronously.
+    log_queue_size: int = 10000
+    # Fraction of INFO records kept per "event_name" or "event_name:decision".
+    log_sample_rates: dict[str, float] = {}
+    verify_server_timing_enabled: bool = False
+    # Adaptive concurrency limit for /verify; requests over it get 503 OVERLOADED.
+    verify_admission_enabled: bool = True
+    verify_concurrency_initial: int = 20
+    verify_concurrency_min: int = 4
+    verify_concurrency_max: int = 40
+    verify_latency_target_ms: float = 250.0
+    verify_retry_after_seconds: int = 1
+    # Per-workspace bulkheads for verify, capabilities, verifier and audit routes, off
+    # by default. When on, at most workspace_scheduler_capacity of these run at once,
+    # each workspace at most its quota; the rest queue and are released by weight.
+    # Keys are workspace ids; only these workspaces get their own metric labels.
+    workspace_scheduler_enabled: bool = False
+    workspace_scheduler_capacity: int = 32
+    # Unset means the whole capacity, so a workspace on its own is never held back.
+    # At or below verify_concurrency_min, one workspace cannot fill verify admission.
+    workspace_max_concurrency: int | None = None
+    workspace_concurrency_quotas: dict[str, int] = {}
+    workspace_weights: dict[str, float] = {}
+    workspace_max_queued: int = 64
+    # Queued requests across all workspaces, whatever X-Workspace-Id values arrive.
+    workspace_max_queued_total: int = 256
+    workspace_queue_timeout_seconds: float = 2.0
+    workspace_retry_after_seconds: int = 1
+    # Share one in-flight agent/binding/policy query between concurrent verify and
+    # capability requests for the same key.
+    singleflight_enabled: bool = True
+
+    canonical_json_backend: str = "auto"
 
     audit_export_max_rows: int = 10000
+    change_feed_max_wait_seconds: float = 25.0
+    change_feed_poll_interval_seconds: float = 0.25
+    # Changes older than the retention are compacted every prune interval: dropped once
+    # a newer change to the same entity exists, and revocations once their token has
+    # expired. An interval of 0 disables pruning.
+    state_change_retention_seconds: int = 86400
+    state_change_prune_interval_seconds: float = 300.0
     cors_allow_origins: str = "http://localhost:5173,http://127.0.0.1:5173"
 
     model_config = SettingsConfigDict(
@@ -59,6 +117,10 @@ class Settings(BaseSettings):
     def redis_url(self) -> str:
         return f"redis://{self.redis_host}:{self.redis_port}/{self.redis_db}"
 
+    @property
+    def replica_database_urls(self) -> list[str]:
+        return [url.strip() for url in self.db_replica_urls.split(",") if url.strip()]
+
     @property
     def cors_origins(self) -> list[str]:
         return [origin.strip() for origin in self.cors_allow_origins.split(",") if origin.strip()]
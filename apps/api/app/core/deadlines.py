@@ -0,0 +1,51 @@
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Annotated
+
+from fastapi import Header
+
+from app.core.errors import raise_http_error
+
+REQUEST_TIMEOUT_HEADER = "X-Request-Timeout-Ms"
+
+
+@dataclass(frozen=True)
+class RequestDeadline:
+    expires_at: float
+
+    def remaining_seconds(self) -> float:
+        return self.expires_at - perf_counter()
+
+    def expired(self) -> bool:
+        return perf_counter() >= self.expires_at
+
+
+async def get_request_deadline(
+    x_request_timeout_ms: Annotated[
+        str | None,
+        Header(
+            alias=REQUEST_TIMEOUT_HEADER,
+            description=(
+                "Optional remaining client budget in milliseconds. Requests that are "
+                "already past it when processing starts are rejected with "
+                "503 DEADLINE_EXCEEDED instead of doing work nobody waits for."
+            ),
+        ),
+    ] = None,
+) -> RequestDeadline | None:
+    # Async on purpose: resolved on the event loop as the request arrives, before a
+    # sync endpoint waits for a threadpool slot, so queueing time counts.
+    if x_request_timeout_ms is None:
+        return None
+    try:
+        budget_ms = int(x_request_timeout_ms)
+    except ValueError:
+        return None
+    if budget_ms < 0:
+        return None
+    return RequestDeadline(expires_at=perf_counter() + budget_ms / 1000)
+
+
+def ensure_deadline_not_expired(deadline: RequestDeadline | None) -> None:
+    if deadline is not None and deadline.expired():
+        raise_http_error(503, "DEADLINE_EXCEEDED", "Request deadline expired before processing")
@@ -1,7 +1,14 @@
+from collections.abc import Mapping
 from typing import NoReturn
 
 from fastapi import HTTPException
 
 
-def raise_http_error(status_code: int, code: str, message: str) -> NoReturn:
-    raise HTTPException(status_code=status_code, detail={"code": code, "message": message})
+def raise_http_error(
+    status_code: int, code: str, message: str, headers: Mapping[str, str] | None = None
+) -> NoReturn:
+    raise HTTPException(
+        status_code=status_code,
+        detail={"code": code, "message": message},
+        headers=dict(headers) if headers is not None else None,
+    )
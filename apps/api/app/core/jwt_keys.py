@@ -1,3 +1,6 @@
+import base64
+from functools import lru_cache
+
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
 
@@ -26,26 +29,78 @@ def load_jwt_private_key() -> Ed25519PrivateKey:
     return key
 
 
-def load_jwt_public_key() -> Ed25519PublicKey:
-    if not settings.kya_jwt_public_key_pem:
-        raise RuntimeError("Missing required setting: KYA_JWT_PUBLIC_KEY_PEM")
-
+def _load_public_key(pem: str, setting_name: str) -> Ed25519PublicKey:
     try:
-        key = serialization.load_pem_public_key(
-            _normalize_pem(settings.kya_jwt_public_key_pem).encode("utf-8")
-        )
+        key = serialization.load_pem_public_key(_normalize_pem(pem).encode("utf-8"))
     except Exception as exc:  # pragma: no cover
-        raise RuntimeError("Invalid KYA_JWT_PUBLIC_KEY_PEM") from exc
+        raise RuntimeError(f"Invalid {setting_name}") from exc
 
     if not isinstance(key, Ed25519PublicKey):
-        raise RuntimeError("KYA_JWT_PUBLIC_KEY_PEM must be an Ed25519 public key")
+        raise RuntimeError(f"{setting_name} must contain Ed25519 public keys")
 
     return key
 
 
+def load_jwt_public_key() -> Ed25519PublicKey:
+    if not settings.kya_jwt_public_key_pem:
+        raise RuntimeError("Missing required setting: KYA_JWT_PUBLIC_KEY_PEM")
+
+    return _load_public_key(settings.kya_jwt_public_key_pem, "KYA_JWT_PUBLIC_KEY_PEM")
+
+
+@lru_cache(maxsize=4)
+def _verification_keys(
+    kid: str, public_key_pem: str, previous: tuple[tuple[str, str], ...]
+) -> dict[str, Ed25519PublicKey]:
+    # Keyed on the settings values, so a changed configuration is picked up while
+    # the hot path skips PEM parsing.
+    keys = {kid: _load_public_key(public_key_pem, "KYA_JWT_PUBLIC_KEY_PEM")}
+    for previous_kid, pem in previous:
+        keys.setdefault(previous_kid, _load_public_key(pem, "KYA_JWT_PREVIOUS_PUBLIC_KEYS"))
+    return keys
+
+
+def load_jwt_verification_keys() -> dict[str, Ed25519PublicKey]:
+    # The signing key first, then retired keys still needed for tokens issued before
+    # a rotation.
+    if not settings.kya_jwt_kid:
+        raise RuntimeError("Missing required setting: KYA_JWT_KID")
+    if not settings.kya_jwt_public_key_pem:
+        raise RuntimeError("Missing required setting: KYA_JWT_PUBLIC_KEY_PEM")
+
+    return _verification_keys(
+        settings.kya_jwt_kid,
+        settings.kya_jwt_public_key_pem,
+        tuple(sorted(settings.kya_jwt_previous_public_keys.items())),
+    )
+
+
 def validate_jwt_key_config() -> None:
     if not settings.kya_jwt_kid:
         raise RuntimeError("Missing required setting: KYA_JWT_KID")
 
     load_jwt_private_key()
     load_jwt_public_key()
+    load_jwt_verification_keys()
+
+
+def jwt_public_jwks() -> list[dict[str, str]]:
+    # RFC 8037 OKP keys so verifiers outside the API can check capability tokens.
+    return [
+        {
+            "kty": "OKP",
+            "crv": "Ed25519",
+            "alg": "EdDSA",
+            "use": "sig",
+            "kid": kid,
+            "x": base64.urlsafe_b64encode(
+                key.public_bytes(
+                    encoding=serialization.Encoding.Raw,
+                    format=serialization.PublicFormat.Raw,
+                )
+            )
+            .rstrip(b"=")
+            .decode("ascii"),
+        }
+        for kid, key in load_jwt_verification_keys().items()
+    ]
@@ -5,7 +5,7 @@ from uuid import UUID
 import jwt
 
 from app.core.config import settings
-from app.core.jwt_keys import load_jwt_private_key, load_jwt_public_key
+from app.core.jwt_keys import load_jwt_private_key, load_jwt_verification_keys
 
 ALGO = "EdDSA"
 
@@ -48,7 +48,12 @@ def encode_capability_token(claims: dict[str, object]) -> str:
 
 
 def decode_capability_token(token: str) -> dict[str, object]:
-    public_key = load_jwt_public_key()
+    keys = load_jwt_verification_keys()
+    kid = jwt.get_unverified_header(token).get("kid", settings.kya_jwt_kid)
+    public_key = keys.get(kid) if isinstance(kid, str) else None
+    if public_key is None:
+        raise jwt.InvalidTokenError("Unknown capability token key id")
+
     claims = jwt.decode(
         token,
         public_key,
@@ -25,10 +25,18 @@ OPENAPI_TAGS_METADATA = [
         "name": "capabilities",
         "description": "Capability token issuance for delegated actions.",
     },
+    {
+        "name": "keys",
+        "description": "Published capability token verification keys (JWKS).",
+    },
     {
         "name": "verify",
         "description": "Verification engine endpoint returning ALLOW/DENY decisions.",
     },
+    {
+        "name": "verifier",
+        "description": "State sync, change feed and audit ingestion for embedded verifiers.",
+    },
     {
         "name": "audit",
         "description": "Audit trail query, export, and integrity verification.",
@@ -105,6 +113,26 @@ COMMON_ERROR_RESPONSES: dict[int | str, dict[str, Any]] = {
     },
 }
 
+# For routes behind the per-workspace scheduler.
+WORKSPACE_BUSY_RESPONSES: dict[int | str, dict[str, Any]] = {
+    429: {
+        "description": (
+            "The workspace is at its concurrency quota and its queue is full or the wait "
+            "timed out. Retry after the Retry-After header."
+        ),
+        "content": {
+            "application/json": {
+                "example": {
+                    "detail": {
+                        "code": "WORKSPACE_BUSY",
+                        "message": "Workspace is at its concurrency quota, retry later",
+                    }
+                }
+            }
+        },
+    },
+}
+
 
 def install_custom_openapi(app: FastAPI) -> Callable[[], dict[str, Any]]:
     def custom_openapi() -> dict[str, Any]:
@@ -0,0 +1,36 @@
+from typing import Any, TypeVar
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None  # type: ignore[assignment]
+
+T = TypeVar("T")
+
+
+# App-wide default response class. Renders the same compact UTF-8 JSON as
+# JSONResponse, with orjson when it is installed; content orjson cannot encode
+# (non-str keys, integers beyond 64 bits) goes through the stdlib encoder.
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            try:
+                return orjson.dumps(content)
+            except orjson.JSONEncodeError:
+                pass
+        return super().render(content)
+
+
+def serialized_response(adapter: TypeAdapter[T], content: T, status_code: int = 200) -> Response:
+    # For content already built as the route's response_model: pydantic-core writes
+    # the JSON in one pass, skipping FastAPI's re-validation, jsonable_encoder walk
+    # and second encode. The route keeps response_model for the OpenAPI schema.
+    return Response(
+        content=adapter.dump_json(content),
+        status_code=status_code,
+        media_type="application/json",
+    )
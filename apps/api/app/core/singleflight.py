@@ -0,0 +1,57 @@
+import threading
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass, field
+from typing import TypeVar, cast
+
+from app.core.config import settings
+from app.observability.metrics import observe_singleflight
+
+V = TypeVar("V")
+
+
+@dataclass
+class _Call:
+    done: threading.Event = field(default_factory=threading.Event)
+    result: object = None
+    succeeded: bool = False
+
+
+# Collapses concurrent loads of the same key within the process: the first caller
+# runs the load and callers arriving while it is in flight wait for and share its
+# result. Nothing is cached once the load returns, so a follower sees data at most
+# one query older than it would have read itself. If the load fails, each follower
+# loads for itself, since the failure may belong to the leader's session. Results
+# are shared across threads and must not be mutated.
+class SingleFlight:
+    def __init__(self, group: str) -> None:
+        self.group = group
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, load: Callable[[], V]) -> V:
+        if not settings.singleflight_enabled:
+            return load()
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.succeeded:
+                observe_singleflight(self.group, "coalesced")
+                return cast(V, call.result)
+            observe_singleflight(self.group, "load")
+            return load()
+
+        observe_singleflight(self.group, "load")
+        try:
+            result = load()
+            call.result = result
+            call.succeeded = True
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return result
@@ -0,0 +1,264 @@
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Mapping
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import Depends, Security
+
+from app.core.auth import workspace_id_header
+from app.core.config import settings
+from app.core.deadlines import RequestDeadline, get_request_deadline
+from app.core.errors import raise_http_error
+from app.observability.metrics import (
+    observe_workspace_in_flight,
+    observe_workspace_queue_wait,
+    observe_workspace_rejected,
+)
+
+
+class WorkspaceBusyError(Exception):
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+@dataclass
+class _Waiter:
+    future: asyncio.Future[None]
+    finish_tag: float
+
+
+@dataclass
+class _WorkspaceState:
+    in_flight: int = 0
+    last_finish_tag: float = 0.0
+    waiters: deque[_Waiter] = field(default_factory=deque)
+
+
+# Weighted fair queuing over a shared pool of execution slots. A workspace runs at
+# most its quota of requests at once, so a noisy tenant cannot hold every DB
+# connection while its audit appends wait on its own advisory lock. When slots are
+# contended, queued requests are released in order of virtual finish tag: each one
+# costs 1/weight, so a workspace with weight 2 gets twice the slots of one with
+# weight 1, and an idle workspace does not bank credit. State exists only for
+# workspaces with requests in flight or queued, and the total queue is bounded, so
+# arbitrary X-Workspace-Id values cannot grow it. Used from the event loop only, so
+# it needs no locking.
+class FairScheduler:
+    def __init__(
+        self,
+        *,
+        capacity: int,
+        max_concurrency: int,
+        max_queued: int,
+        max_queued_total: int | None = None,
+        weights: Mapping[str, float] | None = None,
+        quotas: Mapping[str, int] | None = None,
+    ) -> None:
+        self._capacity = capacity
+        self._max_concurrency = max_concurrency
+        self._max_queued = max_queued
+        self._max_queued_total = max_queued_total
+        self._weights = dict(weights or {})
+        self._quotas = dict(quotas or {})
+        self._states: dict[str, _WorkspaceState] = {}
+        self._in_flight = 0
+        self._queued_total = 0
+        self._virtual_time = 0.0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def workspace_in_flight(self, workspace: str) -> int:
+        state = self._states.get(workspace)
+        return state.in_flight if state is not None else 0
+
+    def queued(self, workspace: str) -> int:
+        state = self._states.get(workspace)
+        return len(state.waiters) if state is not None else 0
+
+    def quota(self, workspace: str) -> int:
+        return self._quotas.get(workspace, self._max_concurrency)
+
+    async def acquire(self, workspace: str, timeout_seconds: float) -> None:
+        state = self._states.setdefault(workspace, _WorkspaceState())
+        if (
+            self._in_flight < self._capacity
+            and state.in_flight < self.quota(workspace)
+            and not state.waiters
+        ):
+            self._start(state)
+            return
+        if (
+            len(state.waiters) >= self._max_queued
+            or (
+                self._max_queued_total is not None
+                and self._queued_total >= self._max_queued_total
+            )
+            or timeout_seconds <= 0
+        ):
+            self._forget_if_idle(workspace, state)
+            raise WorkspaceBusyError("queue_full" if timeout_seconds > 0 else "queue_timeout")
+
+        weight = self._weights.get(workspace, 1.0)
+        finish_tag = max(self._virtual_time, state.last_finish_tag) + 1 / weight
+        state.last_finish_tag = finish_tag
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), finish_tag)
+        state.waiters.append(waiter)
+        self._queued_total += 1
+        try:
+            async with asyncio.timeout(timeout_seconds):
+                await waiter.future
+        except BaseException as error:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # The slot was handed over just as the wait was abandoned.
+                self.release(workspace)
+            else:
+                state.waiters.remove(waiter)
+                self._queued_total -= 1
+                self._forget_if_idle(workspace, state)
+            if isinstance(error, TimeoutError):
+                raise WorkspaceBusyError("queue_timeout") from None
+            raise
+
+    def release(self, workspace: str) -> None:
+        state = self._states[workspace]
+        state.in_flight -= 1
+        self._in_flight -= 1
+        self._dispatch()
+        self._forget_if_idle(workspace, state)
+
+    def _start(self, state: _WorkspaceState) -> None:
+        state.in_flight += 1
+        self._in_flight += 1
+
+    def _dispatch(self) -> None:
+        while self._in_flight < self._capacity:
+            selected: _WorkspaceState | None = None
+            for workspace, state in self._states.items():
+                if not state.waiters or state.in_flight >= self.quota(workspace):
+                    continue
+                if selected is None or state.waiters[0].finish_tag < selected.waiters[0].finish_tag:
+                    selected = state
+            if selected is None:
+                return
+            waiter = selected.waiters.popleft()
+            self._queued_total -= 1
+            self._virtual_time = waiter.finish_tag
+            self._start(selected)
+            waiter.future.set_result(None)
+
+    def _forget_if_idle(self, workspace: str, state: _WorkspaceState) -> None:
+        if state.in_flight == 0 and not state.waiters:
+            self._states.pop(workspace, None)
+
+
+workspace_scheduler = FairScheduler(
+    capacity=settings.workspace_scheduler_capacity,
+    max_concurrency=settings.workspace_max_concurrency or settings.workspace_scheduler_capacity,
+    max_queued=settings.workspace_max_queued,
+    max_queued_total=settings.workspace_max_queued_total,
+    weights=settings.workspace_weights,
+    quotas=settings.workspace_concurrency_quotas,
+)
+
+
+def _metric_label(workspace: str) -> str:
+    # The header is not authenticated, so only configured workspaces get their own
+    # series; any other value would add one per UUID a client sends.
+    configured = settings.workspace_concurrency_quotas.keys() | settings.workspace_weights.keys()
+    return workspace if workspace in configured else "other"
+
+
+# A slot granted to one request. It may be released from a worker thread, so the
+# scheduler itself is only touched on the event loop that granted it.
+class WorkspaceLease:
+    def __init__(self, scheduler: FairScheduler, workspace: str, label: str) -> None:
+        self._scheduler = scheduler
+        self._workspace = workspace
+        self._label = label
+        self._loop = asyncio.get_running_loop()
+        self._released = False
+        self.kept = False
+
+    def keep(self) -> None:
+        # Taken over by a response body, which is sent after the request's
+        # dependencies have exited; the body must release it.
+        self.kept = True
+
+    def release(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        observe_workspace_in_flight(self._label, -1)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._scheduler.release(self._workspace)
+        else:
+            self._loop.call_soon_threadsafe(self._scheduler.release, self._workspace)
+
+
+async def _lease(
+    deadline: RequestDeadline | None, x_workspace_id: str | None
+) -> WorkspaceLease | None:
+    # Runs on the event loop before the request takes a threadpool slot or a DB
+    # connection. Requests without a valid workspace header are left to auth to reject.
+    if not settings.workspace_scheduler_enabled or x_workspace_id is None:
+        return None
+    try:
+        workspace = str(UUID(x_workspace_id))
+    except ValueError:
+        return None
+
+    timeout_seconds = settings.workspace_queue_timeout_seconds
+    if deadline is not None:
+        timeout_seconds = min(timeout_seconds, deadline.remaining_seconds())
+    scheduler = workspace_scheduler
+    label = _metric_label(workspace)
+    start = perf_counter()
+    try:
+        await scheduler.acquire(workspace, timeout_seconds)
+    except WorkspaceBusyError as error:
+        observe_workspace_rejected(label, error.reason)
+        raise_http_error(
+            429,
+            "WORKSPACE_BUSY",
+            "Workspace is at its concurrency quota, retry later",
+            headers={"Retry-After": str(settings.workspace_retry_after_seconds)},
+        )
+    observe_workspace_queue_wait(label, perf_counter() - start)
+    observe_workspace_in_flight(label, 1)
+    return WorkspaceLease(scheduler, workspace, label)
+
+
+async def acquire_workspace_slot(
+    deadline: Annotated[RequestDeadline | None, Depends(get_request_deadline)],
+    x_workspace_id: str | None = Security(workspace_id_header),
+) -> AsyncIterator[None]:
+    lease = await _lease(deadline, x_workspace_id)
+    try:
+        yield
+    finally:
+        if lease is not None:
+            lease.release()
+
+
+async def lease_workspace_slot(
+    deadline: Annotated[RequestDeadline | None, Depends(get_request_deadline)],
+    x_workspace_id: str | None = Security(workspace_id_header),
+) -> AsyncIterator[WorkspaceLease | None]:
+    # For streaming routes: the slot is released here unless the response body has
+    # kept the lease, in which case the body releases it once it is done.
+    lease = await _lease(deadline, x_workspace_id)
+    try:
+        yield lease
+    finally:
+        if lease is not None and not lease.kept:
+            lease.release()
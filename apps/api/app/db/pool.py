@@ -0,0 +1,153 @@
+import logging
+import threading
+from time import perf_counter
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import ConnectionPoolEntry, PoolProxiedConnection, QueuePool
+from sqlalchemy.util import queue as sqla_queue
+
+from app.observability.metrics import (
+    observe_db_pool_invalidated,
+    observe_db_pool_state,
+    observe_db_pool_timeout,
+    observe_db_pool_wait,
+)
+
+logger = logging.getLogger("kya.db")
+
+
+# QueuePool that reports how long each checkout took to get a usable connection
+# (waiting for a free one, or opening a new one) and keeps the pool gauges current,
+# so saturation shows up before requests start hitting the pool timeout.
+class InstrumentedQueuePool(QueuePool):
+    def connect(self) -> PoolProxiedConnection:
+        start = perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            observe_db_pool_timeout()
+            raise
+        finally:
+            observe_db_pool_wait(perf_counter() - start)
+            self._publish_state()
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        super()._do_return_conn(record)
+        self._publish_state()
+
+    def _publish_state(self) -> None:
+        observe_db_pool_state(
+            checked_out=self.checkedout(),
+            overflow=max(0, self.overflow()),
+            idle=self.checkedin(),
+        )
+
+
+def warm_up_pool(engine: Engine, size: int) -> int:
+    # Holds `size` connections at once so that many are opened, then returns them
+    # all to the pool idle.
+    connections: list[PoolProxiedConnection] = []
+    try:
+        for _ in range(size):
+            connections.append(engine.raw_connection())
+    except exc.SQLAlchemyError as error:
+        logger.warning(
+            "db_pool_warmup_failed",
+            extra={
+                "event_name": "db_pool_warmup_failed",
+                "connection_count": len(connections),
+                "error_type": type(error).__name__,
+            },
+        )
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
+
+
+def validate_idle_connections(engine: Engine) -> int:
+    # Pings each idle connection once (the idle queue is FIFO, so each one comes up
+    # once) and invalidates the dead ones, which reconnect on their next checkout.
+    # Connections are taken straight off the idle queue without blocking, so the
+    # validator never opens a connection, never waits behind requests and never
+    # shows up in the checkout wait histogram or the pool gauges.
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return 0
+
+    invalidated = 0
+    for _ in range(pool.checkedin()):
+        try:
+            record = pool._pool.get(False)
+        except sqla_queue.Empty:
+            break
+        try:
+            if record.dbapi_connection is not None:
+                engine.dialect.do_ping(record.dbapi_connection)
+        except engine.dialect.loaded_dbapi.Error as error:
+            record.invalidate(error)
+            invalidated += 1
+        finally:
+            # QueuePool's own return path, not the instrumented override.
+            QueuePool._do_return_conn(pool, record)
+
+    if invalidated:
+        observe_db_pool_invalidated(invalidated)
+        logger.warning(
+            "db_pool_connections_invalidated",
+            extra={
+                "event_name": "db_pool_connections_invalidated",
+                "connection_count": invalidated,
+            },
+        )
+    return invalidated
+
+
+# Background replacement for pool_pre_ping: instead of a round trip on every
+# checkout, idle connections are checked every interval_seconds.
+class PoolValidator:
+    def __init__(self, engine: Engine, interval_seconds: float) -> None:
+        self._engine = engine
+        self._interval = interval_seconds
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="kya-db-pool-validator", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=self._interval + 5)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                validate_idle_connections(self._engine)
+            except exc.SQLAlchemyError:
+                logger.exception(
+                    "db_pool_validation_failed",
+                    extra={"event_name": "db_pool_validation_failed"},
+                )
+
+
+_POOL_VALIDATOR: PoolValidator | None = None
+
+
+def start_pool_maintenance(engine: Engine, *, warmup_size: int, validate_interval: float) -> None:
+    global _POOL_VALIDATOR
+    opened = warm_up_pool(engine, warmup_size)
+    logger.info(
+        "db_pool_warmed_up",
+        extra={"event_name": "db_pool_warmed_up", "connection_count": opened},
+    )
+    if validate_interval > 0 and _POOL_VALIDATOR is None:
+        _POOL_VALIDATOR = PoolValidator(engine, validate_interval)
+        _POOL_VALIDATOR.start()
+
+
+def stop_pool_maintenance() -> None:
+    global _POOL_VALIDATOR
+    if _POOL_VALIDATOR is not None:
+        _POOL_VALIDATOR.stop()
+        _POOL_VALIDATOR = None
@@ -0,0 +1,157 @@
+import itertools
+import logging
+import math
+import threading
+from collections.abc import Generator
+from dataclasses import dataclass
+
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.observability.metrics import observe_db_read_session, observe_db_replica_lag
+from app.observability.query_tracking import instrument_engine
+
+logger = logging.getLogger("kya.db")
+
+# Seconds behind the primary. A replica that has replayed everything it received
+# reports 0 even when the primary has been idle, but only while its WAL receiver is
+# streaming: a replica cut off from the primary has also replayed everything it
+# received and would otherwise report 0 forever. A stopped receiver, or one in any
+# other state, yields NULL (unhealthy), as does nothing replayed yet. status is NULL
+# for roles without pg_read_all_stats, so a running receiver is then trusted. A
+# server that is not in recovery is treated as current.
+_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (
+            SELECT 1 FROM pg_stat_wal_receiver
+            WHERE status IS NULL OR status = 'streaming'
+        ) THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+    """
+)
+
+
+@dataclass
+class Replica:
+    name: str
+    engine: Engine
+    session_factory: sessionmaker[Session]
+    # None until the first check, and while the replica is unreachable.
+    lag_seconds: float | None = None
+
+
+def build_replica(name: str, url: str) -> Replica:
+    engine = create_engine(
+        url,
+        pool_pre_ping=True,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        connect_args={"application_name": f"{settings.app_name}-{name}"},
+    )
+    instrument_engine(engine)
+    session_factory = sessionmaker(bind=engine, autocommit=False, autoflush=False, class_=Session)
+    return Replica(name=name, engine=engine, session_factory=session_factory)
+
+
+# Hands out sessions for read-only routes: round-robin over replicas whose last
+# measured lag is within max_lag_seconds, and the primary when none qualifies
+# (none configured, not yet checked, unreachable or too far behind).
+class ReadRouter:
+    def __init__(
+        self,
+        primary: sessionmaker[Session],
+        replicas: list[Replica],
+        *,
+        max_lag_seconds: float,
+    ) -> None:
+        self.primary = primary
+        self.replicas = replicas
+        self._max_lag = max_lag_seconds
+        self._next = itertools.count()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def session(self) -> Session:
+        if not self.replicas:
+            return self.primary()
+        healthy = [
+            replica
+            for replica in self.replicas
+            if replica.lag_seconds is not None and replica.lag_seconds <= self._max_lag
+        ]
+        if not healthy:
+            observe_db_read_session("primary_fallback")
+            return self.primary()
+        observe_db_read_session("replica")
+        return healthy[next(self._next) % len(healthy)].session_factory()
+
+    def refresh(self) -> None:
+        for replica in self.replicas:
+            replica.lag_seconds = self._measure_lag(replica)
+            observe_db_replica_lag(
+                replica.name, math.inf if replica.lag_seconds is None else replica.lag_seconds
+            )
+
+    def start(self, interval_seconds: float) -> None:
+        if not self.replicas or self._thread is not None:
+            return
+        self.refresh()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(interval_seconds,), name="kya-db-replica-monitor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    def _run(self, interval_seconds: float) -> None:
+        while not self._stop.wait(interval_seconds):
+            self.refresh()
+
+    def _measure_lag(self, replica: Replica) -> float | None:
+        try:
+            with replica.engine.connect() as connection:
+                lag = connection.execute(_LAG_SQL).scalar_one()
+        except exc.SQLAlchemyError as error:
+            logger.warning(
+                "db_replica_unavailable",
+                extra={
+                    "event_name": "db_replica_unavailable",
+                    "replica": replica.name,
+                    "error_type": type(error).__name__,
+                },
+            )
+            return None
+        return None if lag is None else max(0.0, float(lag))
+
+
+read_router = ReadRouter(
+    SessionLocal,
+    [
+        build_replica(f"replica-{index}", url)
+        for index, url in enumerate(settings.replica_database_urls)
+    ],
+    max_lag_seconds=settings.db_replica_max_lag_seconds,
+)
+
+
+def get_read_db() -> Generator[Session, None, None]:
+    # For routes that only read and tolerate data up to db_replica_max_lag_seconds old.
+    db = read_router.session()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -5,15 +5,21 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
+from app.db.pool import InstrumentedQueuePool
+from app.observability.query_tracking import instrument_engine
 
 engine = create_engine(
     settings.database_url,
     future=True,
-    pool_pre_ping=True,
+    poolclass=InstrumentedQueuePool,
+    # Idle connections are validated in the background instead (app.db.pool);
+    # a zero interval falls back to pinging on every checkout.
+    pool_pre_ping=settings.db_pool_validate_interval_seconds <= 0,
     pool_size=settings.db_pool_size,
     max_overflow=settings.db_max_overflow,
     pool_recycle=settings.db_pool_recycle_seconds,
 )
+instrument_engine(engine)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, class_=Session)
 
 redis_client = Redis.from_url(settings.redis_url, decode_responses=True)
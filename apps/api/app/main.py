@@ -3,28 +3,55 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
 
 from app.api.routes.agents import router as agents_router
 from app.api.routes.audit import router as audit_router
 from app.api.routes.capabilities import router as capabilities_router
+from app.api.routes.changes import router as changes_router
 from app.api.routes.health import router as health_router
+from app.api.routes.jwks import router as jwks_router
 from app.api.routes.metrics import router as metrics_router
 from app.api.routes.policies import router as policies_router
+from app.api.routes.verifier import router as verifier_router
 from app.api.routes.verify import router as verify_router
 from app.api.routes.workspaces import router as workspaces_router
 from app.core.config import settings
 from app.core.jwt_keys import validate_jwt_key_config
 from app.core.openapi import API_DESCRIPTION, install_custom_openapi
-from app.observability.logging import configure_logging
-from app.observability.request_logging import request_logging_middleware
+from app.core.responses import FastJSONResponse
+from app.db.pool import start_pool_maintenance, stop_pool_maintenance
+from app.db.replicas import read_router
+from app.db.session import SessionLocal, engine
+from app.modules.change_feed.pruning import (
+    start_state_change_pruning,
+    stop_state_change_pruning,
+)
+from app.observability.logging import configure_logging, shutdown_logging
+from app.observability.metrics import mark_worker_dead
+from app.observability.request_logging import RequestLoggingMiddleware
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI) -> AsyncIterator[None]:
     configure_logging()
     validate_jwt_key_config()
+    start_pool_maintenance(
+        engine,
+        warmup_size=settings.db_pool_size,
+        validate_interval=settings.db_pool_validate_interval_seconds,
+    )
+    read_router.start(settings.db_replica_check_interval_seconds)
+    start_state_change_pruning(
+        SessionLocal,
+        retention_seconds=settings.state_change_retention_seconds,
+        interval_seconds=settings.state_change_prune_interval_seconds,
+    )
     yield
+    stop_state_change_pruning()
+    read_router.stop()
+    stop_pool_maintenance()
+    shutdown_logging()
+    mark_worker_dead()
 
 
 app = FastAPI(
@@ -44,6 +71,7 @@ app = FastAPI(
     servers=[
         {"url": "http://localhost:8000", "description": "Local development"},
     ],
+    default_response_class=FastJSONResponse,
     lifespan=lifespan,
 )
 app.openapi = install_custom_openapi(app)  # type: ignore[method-assign]
@@ -54,13 +82,16 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-app.add_middleware(BaseHTTPMiddleware, dispatch=request_logging_middleware)
+app.add_middleware(RequestLoggingMiddleware)
 
 app.include_router(health_router)
 app.include_router(workspaces_router)
 app.include_router(agents_router)
 app.include_router(policies_router)
 app.include_router(capabilities_router)
+app.include_router(jwks_router)
 app.include_router(verify_router)
+app.include_router(verifier_router)
+app.include_router(changes_router)
 app.include_router(audit_router)
 app.include_router(metrics_router)
@@ -4,6 +4,7 @@ from app.models.audit_event import AuditEvent
 from app.models.capability import Capability
 from app.models.policy import Policy
 from app.models.revocation import Revocation
+from app.models.state_change import StateChange
 from app.models.workspace import Workspace
 
 __all__ = [
@@ -13,5 +14,6 @@ __all__ = [
     "Capability",
     "Policy",
     "Revocation",
+    "StateChange",
     "Workspace",
 ]
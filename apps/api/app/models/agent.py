@@ -31,3 +31,12 @@ class Agent(Base):
     )
     revoked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     revoke_reason: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # Policy of the agent's active binding, kept in step by bind_policy_to_agent so the
+    # hot paths read agent and policy in one lookup.
+    effective_policy_id: Mapped[PyUUID | None] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey(
+            "policies.id", name="fk_agents_effective_policy_id_policies", ondelete="SET NULL"
+        ),
+        nullable=True,
+    )
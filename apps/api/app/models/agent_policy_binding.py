@@ -2,7 +2,7 @@ from datetime import UTC, datetime
 from uuid import UUID as PyUUID
 from uuid import uuid4
 
-from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy import DateTime, ForeignKey, Index, String, text
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -11,6 +11,15 @@ from app.db.base import Base
 
 class AgentPolicyBinding(Base):
     __tablename__ = "agent_policy_bindings"
+    __table_args__ = (
+        Index(
+            "uq_agent_policy_bindings_active_agent",
+            "workspace_id",
+            "agent_id",
+            unique=True,
+            postgresql_where=text("status = 'active'"),
+        ),
+    )
 
     id: Mapped[PyUUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, default=uuid4)
     workspace_id: Mapped[PyUUID] = mapped_column(
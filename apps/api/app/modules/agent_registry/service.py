@@ -9,6 +9,7 @@ from app.core.fingerprints import compute_public_key_fingerprint
 from app.models.agent import Agent
 from app.models.workspace import Workspace
 from app.modules.audit_log.service import append_audit_event
+from app.modules.change_feed.service import record_agent_change
 from app.schemas.agent import AgentCreateRequest
 
 
@@ -52,6 +53,7 @@ def create_agent(db: Session, payload: AgentCreateRequest) -> Agent:
         subject_id=agent.id,
         event_data={"workspace_id": str(payload.workspace_id), "name": payload.name},
     )
+    record_agent_change(db, agent, change_type="agent.created")
 
     db.commit()
     db.refresh(agent)
@@ -86,6 +88,7 @@ def revoke_agent(db: Session, *, agent_id: UUID, workspace_id: UUID, reason: str
         subject_id=agent.id,
         event_data={"workspace_id": str(workspace_id), "reason": reason},
     )
+    record_agent_change(db, agent, change_type="agent.revoked")
 
     db.commit()
     db.refresh(agent)
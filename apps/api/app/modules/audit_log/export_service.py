@@ -1,5 +1,6 @@
 import csv
-from collections.abc import Sequence
+import json
+from collections.abc import Iterable, Iterator, Sequence
 from io import StringIO
 
 from app.models.audit_event import AuditEvent
@@ -54,3 +55,30 @@ def build_audit_csv(events: Sequence[AuditEvent]) -> str:
         )
 
     return output.getvalue()
+
+
+def _chain_record(event: AuditEvent) -> dict[str, object]:
+    # Every input of compute_audit_event_hash, plus the stored event_hash, so the
+    # chain can be re-verified offline without database access.
+    return {
+        "id": str(event.id),
+        "workspace_id": str(event.workspace_id),
+        "event_time": event.event_time.isoformat(),
+        "event_type": event.event_type,
+        "actor_type": event.actor_type,
+        "actor_id": str(event.actor_id) if event.actor_id else None,
+        "subject_type": event.subject_type,
+        "subject_id": str(event.subject_id) if event.subject_id else None,
+        "event_data": event.event_data,
+        "payload_hash": event.payload_hash,
+        "prev_hash": event.prev_hash,
+        "event_hash": event.event_hash,
+    }
+
+
+def iter_audit_ndjson(batches: Iterable[Sequence[AuditEvent]]) -> Iterator[str]:
+    for batch in batches:
+        yield "".join(
+            json.dumps(_chain_record(event), ensure_ascii=False, separators=(",", ":")) + "\n"
+            for event in batch
+        )
@@ -1,4 +1,4 @@
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 
 from sqlalchemy import Select, func, select
 from sqlalchemy.orm import Session
@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from app.core.config import settings
 from app.models.audit_event import AuditEvent
 from app.schemas.audit import AuditExportQueryParams, AuditQueryParams
+from app.schemas.audit_integrity import AuditIntegrityQueryParams
 
 
 def _apply_filters(
@@ -54,3 +55,27 @@ def list_audit_events_for_export(
             settings.audit_export_max_rows
         )
     ).all()
+
+
+# Rows fetched per round trip when streaming the chain export.
+CHAIN_EXPORT_BATCH_SIZE = 1000
+
+
+def iter_audit_event_batches_for_chain_export(
+    db: Session, query: AuditIntegrityQueryParams
+) -> Iterator[Sequence[AuditEvent]]:
+    # Chain order (oldest first) and time-window filters only, matching the
+    # selection used by check_audit_integrity so offline results agree. Not capped:
+    # a truncated export would verify as a valid prefix of the chain.
+    stmt = select(AuditEvent).where(AuditEvent.workspace_id == query.workspace_id)
+    if query.from_time is not None:
+        stmt = stmt.where(AuditEvent.event_time >= query.from_time)
+    if query.to_time is not None:
+        stmt = stmt.where(AuditEvent.event_time <= query.to_time)
+
+    result = db.scalars(
+        stmt.order_by(AuditEvent.event_time.asc(), AuditEvent.id.asc()).execution_options(
+            yield_per=CHAIN_EXPORT_BATCH_SIZE
+        )
+    )
+    yield from result.partitions()
@@ -8,6 +8,18 @@ from app.models.audit_event import AuditEvent
 from app.modules.audit_log.hash_chain import compute_audit_event_hash
 
 
+def lock_workspace_audit_chain(db: Session, *, workspace_id: UUID) -> None:
+    # Serializes a workspace's audit and state-change writes until commit.
+    db.execute(
+        text(
+            "SELECT pg_advisory_xact_lock("
+            "hashtextextended(CAST(:workspace_id AS text), 0)"
+            ")"
+        ),
+        {"workspace_id": str(workspace_id)},
+    )
+
+
 def append_audit_event(
     db: Session,
     *,
@@ -18,14 +30,7 @@ def append_audit_event(
     event_data: dict[str, object],
     actor_type: str = "system",
 ) -> AuditEvent:
-    db.execute(
-        text(
-            "SELECT pg_advisory_xact_lock("
-            "hashtextextended(CAST(:workspace_id AS text), 0)"
-            ")"
-        ),
-        {"workspace_id": str(workspace_id)},
-    )
+    lock_workspace_audit_chain(db, workspace_id=workspace_id)
     previous_hash = db.scalar(
         select(AuditEvent.event_hash)
         .where(AuditEvent.workspace_id == workspace_id)
@@ -1,62 +1,35 @@
 from datetime import UTC, datetime, timedelta
-from uuid import UUID, uuid4
+from uuid import uuid4
 
-from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.errors import raise_http_error
 from app.core.jwt_tokens import build_capability_claims, encode_capability_token
-from app.models.agent import Agent
-from app.models.agent_policy_binding import AgentPolicyBinding
 from app.models.capability import Capability
-from app.models.policy import Policy
 from app.modules.audit_log.service import append_audit_event
+from app.modules.change_feed.service import record_capability_change
+from app.modules.verify_engine.lookups import AgentSnapshot, PolicySnapshot, get_agent_snapshot
 from app.modules.verify_engine.policy_eval import policy_allows_scope, policy_allows_spend_request
 from app.schemas.capability import CapabilityIssueResponse, CapabilityRequest
 
 
-def _get_active_policy_for_agent(db: Session, *, workspace_id: UUID, agent_id: UUID) -> Policy:
-    binding = db.scalar(
-        select(AgentPolicyBinding).where(
-            AgentPolicyBinding.workspace_id == workspace_id,
-            AgentPolicyBinding.agent_id == agent_id,
-            AgentPolicyBinding.status == "active",
-        )
-    )
-    if binding is None:
+def _get_active_policy_for_agent(agent: AgentSnapshot) -> PolicySnapshot:
+    if agent.bound_policy_id is None:
         raise_http_error(404, "POLICY_NOT_BOUND", "No active policy binding for agent")
-
-    policy = db.scalar(
-        select(Policy).where(
-            Policy.id == binding.policy_id,
-            Policy.workspace_id == workspace_id,
-            Policy.is_active.is_(True),
-        )
-    )
-    if policy is None:
+    if agent.policy is None:
         raise_http_error(404, "POLICY_NOT_BOUND", "No active policy found for binding")
-
-    return policy
+    return agent.policy
 
 
 def issue_capability(db: Session, payload: CapabilityRequest) -> CapabilityIssueResponse:
-    agent = db.scalar(
-        select(Agent).where(
-            Agent.id == payload.agent_id,
-            Agent.workspace_id == payload.workspace_id,
-        )
-    )
+    agent = get_agent_snapshot(db, workspace_id=payload.workspace_id, agent_id=payload.agent_id)
     if agent is None:
         raise_http_error(404, "AGENT_NOT_FOUND", "Agent not found")
     if agent.status != "active":
         raise_http_error(409, "AGENT_REVOKED", "Agent is revoked")
 
-    policy = _get_active_policy_for_agent(
-        db,
-        workspace_id=payload.workspace_id,
-        agent_id=payload.agent_id,
-    )
+    policy = _get_active_policy_for_agent(agent)
 
     if not policy_allows_scope(
         policy_json=policy.policy_json,
@@ -118,6 +91,7 @@ def issue_capability(db: Session, payload: CapabilityRequest) -> CapabilityIssue
             "exp": int(expires_at.timestamp()),
         },
     )
+    record_capability_change(db, capability, change_type="capability.issued")
 
     db.commit()
     db.refresh(capability)
@@ -0,0 +1,95 @@
+import logging
+import threading
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import exc
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.modules.change_feed.service import prune_state_changes
+from app.observability.metrics import observe_state_changes_pruned
+
+logger = logging.getLogger("kya.change_feed")
+
+# Rows deleted per transaction, so pruning never holds long locks on the feed.
+PRUNE_BATCH_SIZE = 1000
+
+
+def prune_expired_state_changes(
+    session_factory: sessionmaker[Session], *, retention_seconds: int
+) -> int:
+    older_than = datetime.now(tz=UTC) - timedelta(seconds=retention_seconds)
+    pruned = 0
+    with session_factory() as db:
+        while True:
+            deleted = prune_state_changes(db, older_than=older_than, batch_size=PRUNE_BATCH_SIZE)
+            pruned += deleted
+            if deleted < PRUNE_BATCH_SIZE:
+                break
+    if pruned:
+        observe_state_changes_pruned(pruned)
+        logger.info(
+            "state_changes_pruned",
+            extra={"event_name": "state_changes_pruned", "change_count": pruned},
+        )
+    return pruned
+
+
+# Keeps state_changes bounded by the number of live entities rather than by the
+# number of writes ever made.
+class StateChangePruner:
+    def __init__(
+        self,
+        session_factory: sessionmaker[Session],
+        *,
+        retention_seconds: int,
+        interval_seconds: float,
+    ) -> None:
+        self._session_factory = session_factory
+        self._retention = retention_seconds
+        self._interval = interval_seconds
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="kya-state-change-pruner", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=self._interval + 5)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                prune_expired_state_changes(
+                    self._session_factory, retention_seconds=self._retention
+                )
+            except exc.SQLAlchemyError:
+                logger.exception(
+                    "state_change_pruning_failed",
+                    extra={"event_name": "state_change_pruning_failed"},
+                )
+
+
+_PRUNER: StateChangePruner | None = None
+
+
+def start_state_change_pruning(
+    session_factory: sessionmaker[Session], *, retention_seconds: int, interval_seconds: float
+) -> None:
+    global _PRUNER
+    if interval_seconds > 0 and _PRUNER is None:
+        _PRUNER = StateChangePruner(
+            session_factory,
+            retention_seconds=retention_seconds,
+            interval_seconds=interval_seconds,
+        )
+        _PRUNER.start()
+
+
+def stop_state_change_pruning() -> None:
+    global _PRUNER
+    if _PRUNER is not None:
+        _PRUNER.stop()
+        _PRUNER = None
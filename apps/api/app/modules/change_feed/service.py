@@ -0,0 +1,141 @@
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from uuid import UUID
+
+from sqlalchemy import and_, delete, exists, func, or_, select
+from sqlalchemy.orm import Session, aliased
+
+from app.models.agent import Agent
+from app.models.agent_policy_binding import AgentPolicyBinding
+from app.models.capability import Capability
+from app.models.policy import Policy
+from app.models.state_change import StateChange
+from app.modules.audit_log.service import lock_workspace_audit_chain
+
+
+def record_state_change(
+    db: Session,
+    *,
+    workspace_id: UUID,
+    change_type: str,
+    entity_type: str,
+    entity_id: str,
+    data: dict[str, object],
+) -> StateChange:
+    # Ids come from one sequence, so without the workspace lock a reader could see
+    # id N+1 committed before id N and skip N for good. Under the lock, ids of one
+    # workspace are committed in order and a cursor never jumps over a change.
+    lock_workspace_audit_chain(db, workspace_id=workspace_id)
+    change = StateChange(
+        workspace_id=workspace_id,
+        change_type=change_type,
+        entity_type=entity_type,
+        entity_id=entity_id,
+        data=data,
+    )
+    db.add(change)
+    db.flush()
+    return change
+
+
+def record_agent_change(db: Session, agent: Agent, *, change_type: str) -> StateChange:
+    return record_state_change(
+        db,
+        workspace_id=agent.workspace_id,
+        change_type=change_type,
+        entity_type="agent",
+        entity_id=str(agent.id),
+        data={"id": str(agent.id), "status": agent.status, "public_key": agent.public_key},
+    )
+
+
+def record_policy_change(db: Session, policy: Policy, *, change_type: str) -> StateChange:
+    return record_state_change(
+        db,
+        workspace_id=policy.workspace_id,
+        change_type=change_type,
+        entity_type="policy",
+        entity_id=str(policy.id),
+        data={
+            "id": str(policy.id),
+            "is_active": policy.is_active,
+            "policy_json": policy.policy_json,
+        },
+    )
+
+
+def record_capability_change(
+    db: Session, capability: Capability, *, change_type: str
+) -> StateChange:
+    return record_state_change(
+        db,
+        workspace_id=capability.workspace_id,
+        change_type=change_type,
+        entity_type="capability",
+        entity_id=capability.jti,
+        data={"jti": capability.jti, "status": capability.status},
+    )
+
+
+def record_binding_change(
+    db: Session, binding: AgentPolicyBinding, *, change_type: str
+) -> StateChange:
+    return record_state_change(
+        db,
+        workspace_id=binding.workspace_id,
+        change_type=change_type,
+        entity_type="binding",
+        entity_id=str(binding.id),
+        data={
+            "agent_id": str(binding.agent_id),
+            "policy_id": str(binding.policy_id),
+            "status": binding.status,
+        },
+    )
+
+
+def list_state_changes(
+    db: Session, *, workspace_id: UUID, cursor: int, limit: int
+) -> Sequence[StateChange]:
+    return db.scalars(
+        select(StateChange)
+        .where(StateChange.workspace_id == workspace_id, StateChange.id > cursor)
+        .order_by(StateChange.id)
+        .limit(limit)
+    ).all()
+
+
+def latest_state_change_cursor(db: Session, *, workspace_id: UUID) -> int:
+    latest = db.scalar(
+        select(func.max(StateChange.id)).where(StateChange.workspace_id == workspace_id)
+    )
+    return latest or 0
+
+
+def prune_state_changes(db: Session, *, older_than: datetime, batch_size: int) -> int:
+    # Every change carries the full state of its entity, so dropping the ones a newer
+    # change to the same entity supersedes still lets a reader at any cursor converge
+    # on current state. A capability or its revocation stops mattering once the token
+    # has expired.
+    newer = aliased(StateChange)
+    superseded = exists().where(
+        newer.workspace_id == StateChange.workspace_id,
+        newer.entity_type == StateChange.entity_type,
+        newer.entity_id == StateChange.entity_id,
+        newer.id > StateChange.id,
+    )
+    expired_token = and_(
+        StateChange.entity_type.in_(("capability", "revocation")),
+        exists().where(
+            Capability.jti == StateChange.entity_id,
+            Capability.expires_at < datetime.now(tz=UTC),
+        ),
+    )
+    batch = (
+        select(StateChange.id)
+        .where(StateChange.created_at < older_than, or_(superseded, expired_token))
+        .limit(batch_size)
+    )
+    result = db.execute(delete(StateChange).where(StateChange.id.in_(batch.scalar_subquery())))
+    db.commit()
+    return int(result.rowcount)
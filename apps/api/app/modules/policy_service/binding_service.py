@@ -8,6 +8,7 @@ from app.core.errors import raise_http_error
 from app.models.agent import Agent
 from app.models.agent_policy_binding import AgentPolicyBinding
 from app.modules.audit_log.service import append_audit_event
+from app.modules.change_feed.service import record_binding_change
 from app.modules.policy_service.service import get_policy_in_workspace
 
 
@@ -18,7 +19,13 @@ def bind_policy_to_agent(
     policy_id: UUID,
     workspace_id: UUID,
 ) -> AgentPolicyBinding:
-    agent = db.scalar(select(Agent).where(Agent.id == agent_id, Agent.workspace_id == workspace_id))
+    # Row lock: concurrent binds for one agent take turns, so exactly one binding stays
+    # active and effective_policy_id matches it.
+    agent = db.scalar(
+        select(Agent)
+        .where(Agent.id == agent_id, Agent.workspace_id == workspace_id)
+        .with_for_update()
+    )
     if agent is None:
         raise_http_error(404, "AGENT_NOT_FOUND", "Agent not found")
 
@@ -39,6 +46,7 @@ def bind_policy_to_agent(
     for binding in active_bindings:
         binding.status = "inactive"
         binding.unbound_at = now
+    db.flush()
 
     new_binding = AgentPolicyBinding(
         workspace_id=workspace_id,
@@ -48,6 +56,7 @@ def bind_policy_to_agent(
         bound_at=now,
     )
     db.add(new_binding)
+    agent.effective_policy_id = policy_id
     db.flush()
 
     append_audit_event(
@@ -58,6 +67,9 @@ def bind_policy_to_agent(
         subject_id=agent_id,
         event_data={"workspace_id": str(workspace_id), "policy_id": str(policy_id)},
     )
+    for binding in active_bindings:
+        record_binding_change(db, binding, change_type="binding.deactivated")
+    record_binding_change(db, new_binding, change_type="binding.created")
 
     db.commit()
     db.refresh(new_binding)
@@ -9,6 +9,7 @@ from app.core.errors import raise_http_error
 from app.models.policy import Policy
 from app.models.workspace import Workspace
 from app.modules.audit_log.service import append_audit_event
+from app.modules.change_feed.service import record_policy_change
 from app.modules.policy_service.schema import PolicySchema
 from app.schemas.policy import PolicyCreateRequest
 
@@ -52,6 +53,7 @@ def create_policy(db: Session, payload: PolicyCreateRequest) -> Policy:
             "version": payload.version,
         },
     )
+    record_policy_change(db, policy, change_type="policy.created")
 
     db.commit()
     db.refresh(policy)
@@ -10,6 +10,8 @@ from app.core.config import settings
 from app.db.session import redis_client
 from app.models.capability import Capability
 from app.models.revocation import Revocation
+from app.modules.audit_log.service import append_audit_event
+from app.modules.change_feed.service import record_state_change
 
 logger = logging.getLogger("kya.revocation")
 
@@ -44,6 +46,56 @@ def is_jti_revoked(db: Session, *, jti: str) -> bool:
     return revocation is not None
 
 
+def get_capability_for_revoke(db: Session, *, workspace_id: UUID, jti: str) -> Capability | None:
+    # Row lock so concurrent revokes of one token see each other's status.
+    return db.scalar(
+        select(Capability)
+        .where(Capability.jti == jti, Capability.workspace_id == workspace_id)
+        .with_for_update()
+    )
+
+
+def revoke_capability(db: Session, capability: Capability, *, reason: str) -> Capability:
+    workspace_id = capability.workspace_id
+    jti = capability.jti
+    now = datetime.now(tz=UTC)
+    capability.status = "revoked"
+    capability.revoked_at = now
+    capability.revoke_reason = reason
+    db.add(
+        Revocation(
+            workspace_id=workspace_id,
+            entity_type="capability",
+            entity_id=capability.id,
+            jti=jti,
+            reason=reason,
+            revoked_at=now,
+        )
+    )
+
+    append_audit_event(
+        db,
+        workspace_id=workspace_id,
+        event_type="capability.revoked",
+        subject_type="agent",
+        subject_id=capability.agent_id,
+        event_data={"workspace_id": str(workspace_id), "jti": jti, "reason": reason},
+    )
+    record_state_change(
+        db,
+        workspace_id=workspace_id,
+        change_type="capability.revoked",
+        entity_type="revocation",
+        entity_id=jti,
+        data={"jti": jti},
+    )
+
+    db.commit()
+    blacklist_jti_until_expiry(jti=jti, exp_timestamp=int(capability.expires_at.timestamp()))
+    db.refresh(capability)
+    return capability
+
+
 def check_rate_limit(
     *,
     workspace_id: UUID,
@@ -0,0 +1,107 @@
+from datetime import UTC, datetime
+from uuid import UUID
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from app.core.jwt_keys import jwt_public_jwks
+from app.models.agent import Agent
+from app.models.agent_policy_binding import AgentPolicyBinding
+from app.models.capability import Capability
+from app.models.policy import Policy
+from app.models.revocation import Revocation
+from app.modules.audit_log.service import append_audit_event
+from app.modules.change_feed.service import latest_state_change_cursor
+from app.schemas.verifier import (
+    LocalDecisionBatchRequest,
+    VerifierAgentState,
+    VerifierBindingState,
+    VerifierCapabilityState,
+    VerifierPolicyState,
+    VerifierStateResponse,
+)
+
+
+def build_verifier_state(db: Session, *, workspace_id: UUID) -> VerifierStateResponse:
+    as_of = datetime.now(tz=UTC)
+    # Read before the state: changes landing in between are replayed by the feed,
+    # which is harmless because each change carries the full entity state.
+    cursor = latest_state_change_cursor(db, workspace_id=workspace_id)
+
+    agents_stmt = select(Agent).where(Agent.workspace_id == workspace_id)
+    policies_stmt = select(Policy).where(Policy.workspace_id == workspace_id)
+    bindings_stmt = select(AgentPolicyBinding).where(
+        AgentPolicyBinding.workspace_id == workspace_id,
+        AgentPolicyBinding.status == "active",
+    )
+    # /verify requires an active capability row, so the verifier gets the rows too.
+    capabilities_stmt = select(Capability).where(
+        Capability.workspace_id == workspace_id,
+        Capability.expires_at > as_of,
+    )
+    revoked_jti_stmt = select(Revocation.jti).where(
+        Revocation.workspace_id == workspace_id,
+        Revocation.jti.is_not(None),
+    )
+    # Expired tokens fail the exp check anyway, so they are not worth shipping.
+    revoked_stmt = select(Capability.jti).where(
+        Capability.workspace_id == workspace_id,
+        Capability.expires_at > as_of,
+        or_(Capability.status == "revoked", Capability.jti.in_(revoked_jti_stmt)),
+    )
+
+    return VerifierStateResponse(
+        workspace_id=workspace_id,
+        as_of=as_of,
+        cursor=cursor,
+        jwt_keys=jwt_public_jwks(),
+        agents=[VerifierAgentState.model_validate(agent) for agent in db.scalars(agents_stmt)],
+        policies=[
+            VerifierPolicyState.model_validate(policy) for policy in db.scalars(policies_stmt)
+        ],
+        bindings=[
+            VerifierBindingState.model_validate(binding)
+            for binding in db.scalars(bindings_stmt.order_by(AgentPolicyBinding.bound_at))
+        ],
+        capabilities=[
+            VerifierCapabilityState.model_validate(capability)
+            for capability in db.scalars(capabilities_stmt)
+        ],
+        revoked_jtis=list(db.scalars(revoked_stmt)),
+    )
+
+
+def record_local_decisions(db: Session, payload: LocalDecisionBatchRequest) -> int:
+    # Decisions taken by an embedded verifier land in the same hash chain as /verify
+    # decisions, tagged with their source so they can be told apart.
+    for item in payload.decisions:
+        event_type = (
+            "action.verification.allowed"
+            if item.decision == "ALLOW"
+            else "action.verification.denied"
+        )
+        event_data: dict[str, object] = {
+            "decision": item.decision,
+            "reason_code": item.reason_code,
+            "action_type": item.action_type,
+            "target_service": item.target_service,
+            "source": "local",
+            "verifier_id": payload.verifier_id,
+            "decided_at": item.decided_at.isoformat(),
+        }
+        if item.reason_code is not None:
+            event_data["reason"] = item.reason_code
+        if item.jti is not None:
+            event_data["jti"] = item.jti
+
+        append_audit_event(
+            db,
+            workspace_id=payload.workspace_id,
+            event_type=event_type,
+            subject_type="agent",
+            subject_id=item.agent_id,
+            event_data=event_data,
+        )
+
+    db.commit()
+    return len(payload.decisions)
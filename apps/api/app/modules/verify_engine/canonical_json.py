@@ -1,8 +1,104 @@
 import json
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
+from typing import Any
+
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None  # type: ignore[assignment]
+
+CanonicalEncoder = Callable[[Mapping[str, object]], bytes]
+
+# Stable and language-agnostic canonical form for signing and verification. The
+# reference output is json.dumps(sort_keys=True, separators=(",", ":"),
+# ensure_ascii=False) encoded as UTF-8; every backend must match it byte-for-byte.
+_STDLIB_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+# orjson nests at most 255 levels; deeper payloads go through the stdlib encoder.
+_ORJSON_MAX_DEPTH = 254
+_ORJSON_MIN_INT = -(1 << 63)
+_ORJSON_MAX_INT = (1 << 64) - 1
+
+
+def _stdlib_canonical_json_bytes(payload: Mapping[str, object]) -> bytes:
+    return _STDLIB_ENCODER.encode(payload).encode("utf-8")
+
+
+def _orjson_compatible(value: Any, depth: int = 0) -> bool:
+    # orjson formats floats outside [1e-4, 1e16) with a different exponent syntax
+    # (1e16 vs 1e+16, 0.00001 vs 1e-05), rejects non-str keys and big integers,
+    # and natively serializes types (UUID, datetime) that json.dumps rejects.
+    # Exact type checks with inlined str fast paths keep this walk cheap.
+    kind = type(value)
+    if kind is str or kind is bool or value is None:
+        return True
+    if kind is dict:
+        if depth >= _ORJSON_MAX_DEPTH:
+            return False
+        for key, item in value.items():
+            if type(key) is not str:
+                return False
+            if type(item) is not str and not _orjson_compatible(item, depth + 1):
+                return False
+        return True
+    if kind is list or kind is tuple:
+        if depth >= _ORJSON_MAX_DEPTH:
+            return False
+        for item in value:
+            if type(item) is not str and not _orjson_compatible(item, depth + 1):
+                return False
+        return True
+    if kind is int:
+        return bool(_ORJSON_MIN_INT <= value <= _ORJSON_MAX_INT)
+    if kind is float:
+        return bool(value == 0.0 or 1e-4 <= abs(value) < 1e16)
+    if isinstance(value, str):
+        return True
+    if isinstance(value, int):
+        return _ORJSON_MIN_INT <= value <= _ORJSON_MAX_INT
+    return False
+
+
+def _orjson_canonical_json_bytes(payload: Mapping[str, object]) -> bytes:
+    if orjson is None or not _orjson_compatible(payload):
+        return _stdlib_canonical_json_bytes(payload)
+    try:
+        return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    except orjson.JSONEncodeError:
+        # Let the reference encoder raise its usual error (e.g. lone surrogates).
+        return _stdlib_canonical_json_bytes(payload)
+
+
+CANONICAL_JSON_BACKENDS: dict[str, CanonicalEncoder] = {
+    "stdlib": _stdlib_canonical_json_bytes,
+}
+if orjson is not None:
+    CANONICAL_JSON_BACKENDS["orjson"] = _orjson_canonical_json_bytes
+
+
+def _resolve_backend(name: str) -> str:
+    if name == "auto":
+        return "orjson" if "orjson" in CANONICAL_JSON_BACKENDS else "stdlib"
+    if name not in CANONICAL_JSON_BACKENDS:
+        raise RuntimeError(f"Unavailable canonical JSON backend: {name}")
+    return name
+
+
+_active_backend = _resolve_backend(settings.canonical_json_backend)
+_active_encoder = CANONICAL_JSON_BACKENDS[_active_backend]
+
+
+def get_canonical_json_backend() -> str:
+    return _active_backend
+
+
+def set_canonical_json_backend(name: str) -> None:
+    global _active_backend, _active_encoder
+    _active_backend = _resolve_backend(name)
+    _active_encoder = CANONICAL_JSON_BACKENDS[_active_backend]
 
 
 def canonical_json_bytes(payload: Mapping[str, object]) -> bytes:
-    # Stable and language-agnostic canonical form for signing and verification.
-    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
-    return canonical.encode("utf-8")
+    return _active_encoder(payload)
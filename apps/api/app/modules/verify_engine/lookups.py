@@ -0,0 +1,70 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
+
+from app.core.singleflight import SingleFlight
+from app.models.agent import Agent
+from app.models.policy import Policy
+
+# Column snapshots rather than ORM instances: a coalesced result is handed to
+# requests running on other threads with other sessions.
+
+
+@dataclass(frozen=True)
+class PolicySnapshot:
+    id: UUID
+    version: int
+    policy_json: dict[str, object]
+
+
+@dataclass(frozen=True)
+class AgentSnapshot:
+    status: str
+    public_key: str
+    # Policy of the active binding, if any, and that policy when it is still active.
+    bound_policy_id: UUID | None
+    policy: PolicySnapshot | None
+
+
+_agent_flight = SingleFlight("agent")
+
+
+def get_agent_snapshot(db: Session, *, workspace_id: UUID, agent_id: UUID) -> AgentSnapshot | None:
+    def load() -> AgentSnapshot | None:
+        row = db.execute(
+            select(
+                Agent.status,
+                Agent.public_key,
+                Agent.effective_policy_id,
+                Policy.id,
+                Policy.version,
+                Policy.policy_json,
+            )
+            .outerjoin(
+                Policy,
+                and_(
+                    Policy.id == Agent.effective_policy_id,
+                    Policy.workspace_id == Agent.workspace_id,
+                    Policy.is_active.is_(True),
+                ),
+            )
+            .where(Agent.id == agent_id, Agent.workspace_id == workspace_id)
+        ).one_or_none()
+        if row is None:
+            return None
+        status, public_key, bound_policy_id, policy_id, version, policy_json = row
+        policy = (
+            None
+            if policy_id is None
+            else PolicySnapshot(id=policy_id, version=version, policy_json=policy_json)
+        )
+        return AgentSnapshot(
+            status=status,
+            public_key=public_key,
+            bound_policy_id=bound_policy_id,
+            policy=policy,
+        )
+
+    return _agent_flight.do((workspace_id, agent_id), load)
@@ -1,11 +1,20 @@
 import json
 import logging
+import queue
+import random
+import threading
+from collections.abc import Mapping
 from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+from time import monotonic
 from typing import Any
 
 from app.core.config import settings
+from app.observability.metrics import observe_log_records_dropped
 
 _LOGGING_CONFIGURED = False
+_LOG_WRITER: "LogWriter | None" = None
+_DROP_REPORT_INTERVAL_SECONDS = 10.0
 
 
 class JsonLogFormatter(logging.Formatter):
@@ -19,17 +28,27 @@ class JsonLogFormatter(logging.Formatter):
         "audit_event_id",
         "status",
         "latency_ms",
+        "stage_ms",
+        "db_query_count",
+        "db_time_ms",
+        "statement",
+        "call_site",
         "checked_count",
         "broken_at_event_id",
         "action_type",
         "configured_level",
         "path",
         "method",
+        "dropped_count",
+        "connection_count",
+        "error_type",
+        "replica",
     )
 
     def format(self, record: logging.LogRecord) -> str:
         payload: dict[str, Any] = {
-            "timestamp": datetime.now(tz=UTC).isoformat(),
+            # When the record was emitted, not when the writer thread got to it.
+            "timestamp": datetime.fromtimestamp(record.created, tz=UTC).isoformat(),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -43,8 +62,119 @@ class JsonLogFormatter(logging.Formatter):
         return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
 
 
+class EventSampler(logging.Filter):
+    # Keeps a fraction of INFO-and-below records per event, looked up as
+    # "<event_name>:<decision>" first, then "<event_name>". Unlisted events and
+    # WARNING+ records are always kept.
+    def __init__(self, rates: Mapping[str, float]) -> None:
+        super().__init__()
+        self._rates = dict(rates)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        event_name = getattr(record, "event_name", None)
+        if event_name is None:
+            return True
+        rate = self._rates.get(f"{event_name}:{getattr(record, 'decision', None)}")
+        if rate is None:
+            rate = self._rates.get(event_name)
+        if rate is None or rate >= 1.0 or (rate > 0.0 and random.random() < rate):
+            return True
+        observe_log_records_dropped("sampled")
+        return False
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    # Hands records to a bounded queue; formatting and I/O happen on the writer
+    # thread. When the queue is full (stdout backed up) the record is dropped and
+    # counted instead of blocking the request.
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]") -> None:
+        super().__init__(log_queue)
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message now, since args may change after the call returns.
+        # JsonLogFormatter never renders tracebacks, so exc_info is not carried over.
+        # A plain __dict__ copy costs about half of copy.copy on the caller's thread.
+        prepared = logging.LogRecord.__new__(logging.LogRecord)
+        prepared.__dict__.update(record.__dict__)
+        prepared.msg = record.getMessage()
+        prepared.args = None
+        prepared.exc_info = None
+        prepared.exc_text = None
+        return prepared
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self._dropped += 1
+            observe_log_records_dropped("overflow")
+
+
+class LogWriter(QueueListener):
+    def __init__(self, source: NonBlockingQueueHandler, target: logging.Handler) -> None:
+        super().__init__(source.queue, target, respect_handler_level=True)
+        self._source = source
+        self._target = target
+        self._reported_dropped = 0
+        self._last_report = monotonic()
+
+    def handle(self, record: logging.LogRecord) -> None:
+        super().handle(record)
+        dropped = self._source.dropped
+        if dropped != self._reported_dropped and (
+            monotonic() - self._last_report >= _DROP_REPORT_INTERVAL_SECONDS
+        ):
+            self._report_dropped(dropped)
+
+    def enqueue_sentinel(self) -> None:
+        # Blocking: at shutdown, wait for room rather than lose the stop signal.
+        self.queue.put(self._sentinel)  # type: ignore[attr-defined]
+
+    def stop(self) -> None:
+        super().stop()
+        if self._source.dropped != self._reported_dropped:
+            self._report_dropped(self._source.dropped)
+        self._target.flush()
+
+    def _report_dropped(self, dropped: int) -> None:
+        record = logging.LogRecord(
+            "kya.logging", logging.WARNING, __file__, 0, "log_records_dropped", None, None
+        )
+        record.event_name = "log_records_dropped"
+        record.dropped_count = dropped - self._reported_dropped
+        self._target.handle(record)
+        self._reported_dropped = dropped
+        self._last_report = monotonic()
+
+
+def build_log_handler(
+    stream_handler: logging.Handler,
+    *,
+    queue_size: int,
+    sample_rates: Mapping[str, float],
+) -> tuple[logging.Handler, LogWriter | None]:
+    handler: logging.Handler = stream_handler
+    writer: LogWriter | None = None
+    if queue_size > 0:
+        queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=queue_size))
+        writer = LogWriter(queue_handler, stream_handler)
+        handler = queue_handler
+    if sample_rates:
+        handler.addFilter(EventSampler(sample_rates))
+    return handler, writer
+
+
 def configure_logging() -> None:
-    global _LOGGING_CONFIGURED
+    global _LOGGING_CONFIGURED, _LOG_WRITER
     if _LOGGING_CONFIGURED:
         return
 
@@ -63,8 +193,24 @@ def configure_logging() -> None:
 
     root_logger.setLevel(level)
 
-    handler = logging.StreamHandler()
-    handler.setFormatter(JsonLogFormatter())
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(JsonLogFormatter())
+    handler, _LOG_WRITER = build_log_handler(
+        stream_handler,
+        queue_size=settings.log_queue_size,
+        sample_rates=settings.log_sample_rates,
+    )
+    if _LOG_WRITER is not None:
+        _LOG_WRITER.start()
     root_logger.handlers = [handler]
 
     _LOGGING_CONFIGURED = True
+
+
+def shutdown_logging() -> None:
+    # Drains the queue so nothing logged before shutdown is lost.
+    global _LOGGING_CONFIGURED, _LOG_WRITER
+    if _LOG_WRITER is not None:
+        _LOG_WRITER.stop()
+        _LOG_WRITER = None
+    _LOGGING_CONFIGURED = False
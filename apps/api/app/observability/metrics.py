@@ -1,4 +1,20 @@
-from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+import os
+from collections.abc import Mapping
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Set by app.serve before workers start (or by the process manager). prometheus_client
+# reads it at import time and then keeps metric values in per-process mmap files
+# under this directory instead of process memory.
+MULTIPROCESS_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
 
 VERIFY_TOTAL = Counter(
     "kya_verify_total",
@@ -9,6 +25,120 @@ VERIFY_LATENCY_SECONDS = Histogram(
     "kya_verify_latency_seconds",
     "Latency of verify endpoint in seconds",
 )
+VERIFY_STAGE_LATENCY_SECONDS = Histogram(
+    "kya_verify_stage_latency_seconds",
+    "Latency of individual verify pipeline stages in seconds",
+    labelnames=("stage", "decision"),
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+VERIFY_SHED_TOTAL = Counter(
+    "kya_verify_shed_total",
+    "Total number of verify requests rejected before processing, by reason",
+    labelnames=("reason",),
+)
+VERIFY_IN_FLIGHT = Gauge(
+    "kya_verify_in_flight",
+    "Verify requests currently admitted",
+    multiprocess_mode="livesum",
+)
+VERIFY_CONCURRENCY_LIMIT = Gauge(
+    "kya_verify_concurrency_limit",
+    "Current adaptive concurrency limit for verify",
+    multiprocess_mode="livesum",
+)
+WORKSPACE_IN_FLIGHT = Gauge(
+    "kya_workspace_in_flight",
+    "Scheduled requests currently running, by workspace (other: not configured)",
+    labelnames=("workspace_id",),
+    multiprocess_mode="livesum",
+)
+WORKSPACE_QUEUE_WAIT_SECONDS = Histogram(
+    "kya_workspace_queue_wait_seconds",
+    "Time scheduled requests waited for a workspace slot in seconds",
+    labelnames=("workspace_id",),
+    buckets=(0.0001, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+WORKSPACE_REJECTED_TOTAL = Counter(
+    "kya_workspace_rejected_total",
+    "Total number of requests rejected by the workspace scheduler, by reason",
+    labelnames=("workspace_id", "reason"),
+)
+HTTP_DB_QUERIES = Histogram(
+    "kya_http_db_queries",
+    "Number of SQL statements executed per HTTP request",
+    labelnames=("route",),
+    buckets=(0, 1, 2, 4, 6, 8, 10, 15, 20, 30, 50, 100),
+)
+HTTP_DB_TIME_SECONDS = Histogram(
+    "kya_http_db_time_seconds",
+    "Total SQL execution time per HTTP request in seconds",
+    labelnames=("route",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+HTTP_REQUEST_LATENCY_SECONDS = Histogram(
+    "kya_http_request_latency_seconds",
+    "Time to response start per HTTP request in seconds, by route template",
+    labelnames=("route", "method", "status_class"),
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+DB_SLOW_QUERIES_TOTAL = Counter(
+    "kya_db_slow_queries_total",
+    "Total number of SQL statements slower than the configured threshold",
+)
+# Pool gauges are per process; livesum adds up live workers in multiprocess mode.
+DB_POOL_CHECKED_OUT = Gauge(
+    "kya_db_pool_checked_out",
+    "Database connections currently checked out of the pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "kya_db_pool_overflow",
+    "Database connections open beyond db_pool_size",
+    multiprocess_mode="livesum",
+)
+DB_POOL_IDLE = Gauge(
+    "kya_db_pool_idle",
+    "Idle database connections in the pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_WAIT_SECONDS = Histogram(
+    "kya_db_pool_wait_seconds",
+    "Time to obtain a database connection from the pool in seconds",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0, 5.0, 30.0),
+)
+DB_POOL_TIMEOUTS_TOTAL = Counter(
+    "kya_db_pool_timeouts_total",
+    "Total number of checkouts that timed out waiting for a database connection",
+)
+DB_POOL_INVALIDATED_TOTAL = Counter(
+    "kya_db_pool_invalidated_total",
+    "Total number of idle database connections invalidated by background validation",
+)
+DB_REPLICA_LAG_SECONDS = Gauge(
+    "kya_db_replica_lag_seconds",
+    "Replication lag of each read replica in seconds (+Inf while unreachable)",
+    labelnames=("replica",),
+    multiprocess_mode="livemax",
+)
+DB_READ_SESSIONS_TOTAL = Counter(
+    "kya_db_read_sessions_total",
+    "Sessions opened for read-only routes, by target (replica, primary_fallback)",
+    labelnames=("target",),
+)
+SINGLEFLIGHT_TOTAL = Counter(
+    "kya_singleflight_total",
+    "Total number of coalescible lookups, by group and outcome (load, coalesced)",
+    labelnames=("group", "outcome"),
+)
+STATE_CHANGES_PRUNED_TOTAL = Counter(
+    "kya_state_changes_pruned_total",
+    "Total number of change feed entries removed by compaction",
+)
+LOG_RECORDS_DROPPED_TOTAL = Counter(
+    "kya_log_records_dropped_total",
+    "Total number of log records not written, by reason (sampled, overflow)",
+    labelnames=("reason",),
+)
 AUDIT_INTEGRITY_TOTAL = Counter(
     "kya_audit_integrity_total",
     "Total number of audit integrity checks",
@@ -21,13 +151,107 @@ def observe_verify(decision: str, reason_code: str | None, latency_seconds: floa
     VERIFY_LATENCY_SECONDS.observe(latency_seconds)
 
 
+def observe_verify_stages(decision: str, stage_seconds: Mapping[str, float]) -> None:
+    for stage, seconds in stage_seconds.items():
+        VERIFY_STAGE_LATENCY_SECONDS.labels(stage=stage, decision=decision).observe(seconds)
+
+
+def observe_verify_shed(reason: str) -> None:
+    VERIFY_SHED_TOTAL.labels(reason=reason).inc()
+
+
+def observe_verify_admission(in_flight: int, limit: int) -> None:
+    VERIFY_IN_FLIGHT.set(in_flight)
+    VERIFY_CONCURRENCY_LIMIT.set(limit)
+
+
+def observe_workspace_in_flight(workspace_id: str, delta: int) -> None:
+    WORKSPACE_IN_FLIGHT.labels(workspace_id=workspace_id).inc(delta)
+
+
+def observe_workspace_queue_wait(workspace_id: str, seconds: float) -> None:
+    WORKSPACE_QUEUE_WAIT_SECONDS.labels(workspace_id=workspace_id).observe(seconds)
+
+
+def observe_workspace_rejected(workspace_id: str, reason: str) -> None:
+    WORKSPACE_REJECTED_TOTAL.labels(workspace_id=workspace_id, reason=reason).inc()
+
+
+def observe_request_queries(route: str, query_count: int, db_seconds: float) -> None:
+    HTTP_DB_QUERIES.labels(route=route).observe(query_count)
+    HTTP_DB_TIME_SECONDS.labels(route=route).observe(db_seconds)
+
+
+def observe_request_latency(route: str, method: str, status: int, seconds: float) -> None:
+    HTTP_REQUEST_LATENCY_SECONDS.labels(
+        route=route, method=method, status_class=f"{status // 100}xx"
+    ).observe(seconds)
+
+
+def observe_db_slow_query() -> None:
+    DB_SLOW_QUERIES_TOTAL.inc()
+
+
+def observe_db_pool_state(*, checked_out: int, overflow: int, idle: int) -> None:
+    DB_POOL_CHECKED_OUT.set(checked_out)
+    DB_POOL_OVERFLOW.set(overflow)
+    DB_POOL_IDLE.set(idle)
+
+
+def observe_db_pool_wait(seconds: float) -> None:
+    DB_POOL_WAIT_SECONDS.observe(seconds)
+
+
+def observe_db_pool_timeout() -> None:
+    DB_POOL_TIMEOUTS_TOTAL.inc()
+
+
+def observe_db_pool_invalidated(count: int) -> None:
+    DB_POOL_INVALIDATED_TOTAL.inc(count)
+
+
+def observe_db_replica_lag(replica: str, seconds: float) -> None:
+    DB_REPLICA_LAG_SECONDS.labels(replica=replica).set(seconds)
+
+
+def observe_db_read_session(target: str) -> None:
+    DB_READ_SESSIONS_TOTAL.labels(target=target).inc()
+
+
+def observe_singleflight(group: str, outcome: str) -> None:
+    SINGLEFLIGHT_TOTAL.labels(group=group, outcome=outcome).inc()
+
+
+def observe_state_changes_pruned(count: int) -> None:
+    STATE_CHANGES_PRUNED_TOTAL.inc(count)
+
+
+def observe_log_records_dropped(reason: str) -> None:
+    LOG_RECORDS_DROPPED_TOTAL.labels(reason=reason).inc()
+
+
 def observe_audit_integrity(status: str) -> None:
     AUDIT_INTEGRITY_TOTAL.labels(status=status).inc()
 
 
+def multiprocess_mode_enabled() -> bool:
+    return bool(os.environ.get(MULTIPROCESS_DIR_ENV))
+
+
+def mark_worker_dead(pid: int | None = None) -> None:
+    # Drops the worker's live-gauge files; counter and histogram files are kept so
+    # totals stay monotonic after a worker exits or is replaced.
+    if multiprocess_mode_enabled():
+        multiprocess.mark_process_dead(os.getpid() if pid is None else pid)  # type: ignore[no-untyped-call]
+
+
 def export_metrics_text() -> str:
-    payload = generate_latest()
-    return payload.decode("utf-8")
+    if not multiprocess_mode_enabled():
+        return generate_latest().decode("utf-8")
+    # Whichever worker answers the scrape sums every worker's files.
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)  # type: ignore[no-untyped-call]
+    return generate_latest(registry).decode("utf-8")
 
 
 METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
@@ -0,0 +1,149 @@
+import logging
+import re
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.config import settings
+from app.observability.metrics import observe_db_slow_query
+
+logger = logging.getLogger("kya.db")
+
+_APP_DIR = str(Path(__file__).resolve().parents[1])
+_OBSERVABILITY_DIR = str(Path(__file__).resolve().parent)
+_START_KEY = "kya_query_start"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL_RE = re.compile(r"(?<![\w%$])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_RE = re.compile(r"%\(\w+\)s|\$\d+|%s|\?")
+_PLACEHOLDER_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+@dataclass(frozen=True)
+class SlowQuery:
+    statement: str
+    duration_ms: float
+    call_site: str | None
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+    slow_queries: list[SlowQuery] = field(default_factory=list)
+
+    @property
+    def milliseconds(self) -> float:
+        return round(self.seconds * 1000, 3)
+
+
+# Holds a mutable QueryStats per request. Threadpool workers and middleware tasks
+# copy the context, so they all update the same object.
+_current_stats: ContextVar[QueryStats | None] = ContextVar("kya_query_stats", default=None)
+
+
+def normalize_sql(statement: str) -> str:
+    normalized = _STRING_LITERAL_RE.sub("?", statement)
+    normalized = _NUMBER_LITERAL_RE.sub("?", normalized)
+    normalized = _PLACEHOLDER_RE.sub("?", normalized)
+    normalized = _PLACEHOLDER_LIST_RE.sub("(...)", normalized)
+    return _WHITESPACE_RE.sub(" ", normalized).strip()
+
+
+def _call_site() -> str | None:
+    # First application frame outside this module, e.g. the service function that
+    # issued the statement through the ORM.
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_APP_DIR) and not filename.startswith(_OBSERVABILITY_DIR):
+            relative = filename[len(_APP_DIR) - len("app") :]
+            return f"{relative}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back  # type: ignore[assignment]
+    return None
+
+
+def _before_cursor_execute(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    conn.info.setdefault(_START_KEY, []).append(perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    starts = conn.info.get(_START_KEY)
+    if not starts:
+        return
+    elapsed = perf_counter() - starts.pop()
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+
+    duration_ms = elapsed * 1000
+    if duration_ms < settings.db_slow_query_threshold_ms:
+        return
+
+    slow_query = SlowQuery(
+        statement=normalize_sql(statement),
+        duration_ms=round(duration_ms, 3),
+        call_site=_call_site(),
+    )
+    if stats is not None:
+        stats.slow_queries.append(slow_query)
+    observe_db_slow_query()
+    logger.warning(
+        "db_slow_query",
+        extra={
+            "event_name": "db_slow_query",
+            "statement": slow_query.statement,
+            "call_site": slow_query.call_site,
+            "latency_ms": slow_query.duration_ms,
+        },
+    )
+
+
+def instrument_engine(engine: Engine) -> None:
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def start_query_tracking() -> tuple[QueryStats, Token[QueryStats | None]]:
+    stats = QueryStats()
+    return stats, _current_stats.set(stats)
+
+
+def stop_query_tracking(token: Token[QueryStats | None]) -> None:
+    _current_stats.reset(token)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    stats, token = start_query_tracking()
+    try:
+        yield stats
+    finally:
+        stop_query_tracking(token)
@@ -1,42 +1,78 @@
 import logging
 from time import perf_counter
 
-from fastapi import Request, Response
-from starlette.middleware.base import RequestResponseEndpoint
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.observability.metrics import observe_request_latency, observe_request_queries
+from app.observability.query_tracking import (
+    QueryStats,
+    start_query_tracking,
+    stop_query_tracking,
+)
 
 logger = logging.getLogger("kya.http")
 
 
-async def request_logging_middleware(
-    request: Request, call_next: RequestResponseEndpoint
-) -> Response:
-    start = perf_counter()
-    try:
-        response = await call_next(request)
-    except Exception:
-        latency_ms = (perf_counter() - start) * 1000
-        logger.info(
-            "http_request",
-            extra={
-                "event_name": "http_request",
-                "method": request.method,
-                "path": request.url.path,
-                "status": 500,
-                "latency_ms": round(latency_ms, 2),
-            },
-            exc_info=True,
-        )
-        raise
-
-    latency_ms = (perf_counter() - start) * 1000
+def _route_template(scope: Scope) -> str | None:
+    # Set by the router on the shared scope once a route has matched.
+    path = getattr(scope.get("route"), "path", None)
+    return path if isinstance(path, str) else None
+
+
+def _log_request(
+    scope: Scope, status: int, latency_seconds: float, stats: QueryStats, failed: bool
+) -> None:
+    route = _route_template(scope)
+    if route is not None:
+        observe_request_queries(route, stats.count, stats.seconds)
+        observe_request_latency(route, scope["method"], status, latency_seconds)
+
     logger.info(
         "http_request",
         extra={
             "event_name": "http_request",
-            "method": request.method,
-            "path": request.url.path,
-            "status": response.status_code,
-            "latency_ms": round(latency_ms, 2),
+            "method": scope["method"],
+            "path": scope["path"],
+            "status": status,
+            "latency_ms": round(latency_seconds * 1000, 2),
+            "db_query_count": stats.count,
+            "db_time_ms": stats.milliseconds,
         },
+        exc_info=failed,
     )
-    return response
+
+
+# Plain ASGI rather than BaseHTTPMiddleware: status and latency are taken from
+# http.response.start as it passes through, so the response body is never wrapped,
+# streamed through an extra task or buffered. Latency is time to response start,
+# and DB counts cover the whole request, including any streamed body.
+class RequestLoggingMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = perf_counter()
+        status = 500
+        latency_seconds: float | None = None
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status, latency_seconds
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                latency_seconds = perf_counter() - start
+            await send(message)
+
+        stats, token = start_query_tracking()
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception:
+            _log_request(scope, status, latency_seconds or perf_counter() - start, stats, True)
+            raise
+        finally:
+            stop_query_tracking(token)
+
+        _log_request(scope, status, latency_seconds or perf_counter() - start, stats, False)
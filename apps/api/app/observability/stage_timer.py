@@ -0,0 +1,48 @@
+from time import perf_counter
+from types import TracebackType
+
+
+class _Stage:
+    __slots__ = ("_timer", "_name", "_start")
+
+    def __init__(self, timer: "StageTimer", name: str) -> None:
+        self._timer = timer
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        self._start = perf_counter()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self._timer.add(self._name, perf_counter() - self._start)
+
+
+class StageTimer:
+    # Cheap enough to stay on in production: one perf_counter pair and a dict
+    # update per stage, no allocation beyond the small context object.
+    __slots__ = ("durations",)
+
+    def __init__(self) -> None:
+        self.durations: dict[str, float] = {}
+
+    def stage(self, name: str) -> _Stage:
+        return _Stage(self, name)
+
+    def add(self, name: str, seconds: float) -> None:
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def as_milliseconds(self) -> dict[str, float]:
+        return {name: round(seconds * 1000, 3) for name, seconds in self.durations.items()}
+
+    def server_timing_header(self, total_seconds: float | None = None) -> str:
+        entries = [
+            f"{name};dur={seconds * 1000:.3f}" for name, seconds in self.durations.items()
+        ]
+        if total_seconds is not None:
+            entries.append(f"total;dur={total_seconds * 1000:.3f}")
+        return ", ".join(entries)
@@ -3,7 +3,7 @@ from typing import Annotated, Literal
 from uuid import UUID
 
 from fastapi import Query
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 from app.core.errors import raise_http_error
 
@@ -33,6 +33,16 @@ class AuditEventsListResponse(BaseModel):
     offset: int
 
 
+# Convert ORM rows in a single pydantic-core call rather than one model_validate
+# per row, and serialize audit responses straight to JSON bytes.
+AUDIT_EVENT_LIST_ADAPTER: TypeAdapter[list[AuditEventResponse]] = TypeAdapter(
+    list[AuditEventResponse]
+)
+AUDIT_EVENTS_PAGE_ADAPTER: TypeAdapter[AuditEventsListResponse] = TypeAdapter(
+    AuditEventsListResponse
+)
+
+
 class AuditQueryParams(BaseModel):
     workspace_id: UUID
     from_time: datetime | None = None
@@ -25,3 +25,15 @@ class CapabilityIssueResponse(BaseModel):
     jti: str
     issued_at: datetime
     expires_at: datetime
+
+
+class CapabilityRevokeRequest(BaseModel):
+    workspace_id: UUID = Field(description="Workspace identifier (must match X-Workspace-Id).")
+    reason: str = Field(min_length=1, max_length=255, description="Reason for revocation.")
+
+
+class CapabilityRevokeResponse(BaseModel):
+    capability_id: UUID
+    jti: str
+    status: str
+    revoked_at: datetime
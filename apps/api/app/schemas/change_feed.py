@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class StateChangeItem(BaseModel):
+    cursor: int
+    change_type: str = Field(description="e.g. agent.revoked, binding.created.")
+    entity_type: str = Field(description="agent, policy, binding or revocation.")
+    entity_id: str
+    data: dict[str, object] = Field(description="Entity state after the change.")
+    created_at: datetime
+
+
+class StateChangesResponse(BaseModel):
+    items: list[StateChangeItem]
+    next_cursor: int = Field(description="Pass back as 'cursor' to continue after these items.")
@@ -0,0 +1,16 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class JsonWebKey(BaseModel):
+    kty: Literal["OKP"]
+    crv: Literal["Ed25519"]
+    alg: Literal["EdDSA"]
+    use: Literal["sig"]
+    kid: str = Field(description="Matches the 'kid' header of capability tokens.")
+    x: str = Field(description="Raw public key, base64url without padding.")
+
+
+class JwksResponse(BaseModel):
+    keys: list[JsonWebKey]
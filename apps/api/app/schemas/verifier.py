@@ -0,0 +1,70 @@
+from datetime import datetime
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class VerifierAgentState(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    status: str
+    public_key: str
+
+
+class VerifierPolicyState(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    is_active: bool
+    policy_json: dict[str, object]
+
+
+class VerifierBindingState(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    agent_id: UUID
+    policy_id: UUID
+    status: str
+
+
+class VerifierCapabilityState(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    jti: str
+    status: str
+
+
+class VerifierStateResponse(BaseModel):
+    workspace_id: UUID
+    as_of: datetime = Field(description="When the snapshot was taken.")
+    cursor: int = Field(description="Change feed position to follow GET /changes from.")
+    jwt_keys: list[dict[str, str]] = Field(description="Capability token keys as Ed25519 JWKs.")
+    agents: list[VerifierAgentState]
+    policies: list[VerifierPolicyState]
+    bindings: list[VerifierBindingState]
+    capabilities: list[VerifierCapabilityState] = Field(
+        description="Issued, not yet expired capabilities with their status."
+    )
+    revoked_jtis: list[str] = Field(description="Revoked, not yet expired capability ids.")
+
+
+class LocalDecision(BaseModel):
+    agent_id: UUID
+    action_type: str = Field(min_length=1, max_length=128)
+    target_service: str = Field(min_length=1, max_length=255)
+    decision: Literal["ALLOW", "DENY"]
+    reason_code: str | None = Field(default=None, max_length=64)
+    jti: str | None = Field(default=None, max_length=255)
+    decided_at: datetime
+
+
+class LocalDecisionBatchRequest(BaseModel):
+    workspace_id: UUID = Field(description="Workspace identifier (must match X-Workspace-Id).")
+    verifier_id: str = Field(min_length=1, max_length=128, description="Reporting verifier id.")
+    decisions: list[LocalDecision] = Field(min_length=1, max_length=500)
+
+
+class LocalDecisionBatchResponse(BaseModel):
+    accepted: int
@@ -3,6 +3,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+VERIFY_BATCH_MAX_ITEMS = 100
+
 
 class VerifyRequest(BaseModel):
     workspace_id: UUID = Field(description="Workspace identifier (must match X-Workspace-Id).")
@@ -22,3 +24,15 @@ class VerifyResponse(BaseModel):
         description="Reason code when decision is DENY, otherwise null.",
     )
     audit_event_id: UUID
+
+
+class VerifyBatchRequest(BaseModel):
+    items: list[VerifyRequest] = Field(
+        min_length=1,
+        max_length=VERIFY_BATCH_MAX_ITEMS,
+        description="Actions to verify, each as a POST /verify body, in one workspace.",
+    )
+
+
+class VerifyBatchResponse(BaseModel):
+    results: list[VerifyResponse] = Field(description="One decision per item, in order.")
@@ -0,0 +1,52 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import uvicorn
+
+from app.core.config import settings
+
+# Must not import prometheus_client (directly or through app.main): the
+# multiprocess directory has to be in the environment before it is first imported.
+MULTIPROCESS_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+
+def prepare_multiprocess_dir(configured: str | None) -> tuple[Path, bool]:
+    # Files left by a previous run would be summed into this one, so the directory
+    # starts empty. Returns the directory and whether it was created here.
+    if not configured:
+        return Path(tempfile.mkdtemp(prefix="kya-prometheus-")), True
+
+    directory = Path(configured)
+    directory.mkdir(parents=True, exist_ok=True)
+    for stale in directory.glob("*.db"):
+        stale.unlink()
+    return directory, False
+
+
+# Production entrypoint: python -m app.serve. Runs WEB_CONCURRENCY uvicorn worker
+# processes behind one socket. With more than one worker, metrics switch to
+# prometheus_client multiprocess mode so /metrics reports totals for all workers.
+def main() -> None:
+    workers = max(1, settings.web_concurrency)
+    created_dir: Path | None = None
+    if workers > 1:
+        directory, created = prepare_multiprocess_dir(settings.prometheus_multiproc_dir)
+        os.environ[MULTIPROCESS_DIR_ENV] = str(directory)
+        created_dir = directory if created else None
+
+    try:
+        uvicorn.run(
+            "app.main:app",
+            host=settings.app_host,
+            port=settings.app_port,
+            workers=workers,
+        )
+    finally:
+        if created_dir is not None:
+            shutil.rmtree(created_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
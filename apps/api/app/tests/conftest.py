@@ -1,10 +1,12 @@
 import os
-from collections.abc import Generator
+from collections.abc import Callable, Generator, Iterator
+from contextlib import AbstractContextManager, contextmanager
+from typing import Any
 from uuid import uuid4
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import text
+from sqlalchemy import event, text
 from sqlalchemy.orm import Session
 
 # Mandatory runtime JWT config for app startup in tests.
@@ -23,11 +25,13 @@ os.environ.setdefault(
 )
 os.environ.setdefault("KYA_WORKSPACE_BOOTSTRAP_TOKEN", "test-bootstrap-token")
 
-from app.db.session import SessionLocal  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
 from app.main import app  # noqa: E402
 from app.models.workspace import Workspace  # noqa: E402
+from app.observability.query_tracking import normalize_sql  # noqa: E402
 
 TABLES_TO_TRUNCATE = [
+    "state_changes",
     "revocations",
     "audit_events",
     "capabilities",
@@ -73,3 +77,28 @@ def workspace_id(db_session: Session) -> str:
 @pytest.fixture
 def auth_headers(workspace_id: str) -> dict[str, str]:
     return {"X-Workspace-Id": workspace_id}
+
+
+@pytest.fixture
+def assert_max_queries() -> Callable[[int], AbstractContextManager[list[str]]]:
+    # Counts every statement the engine executes inside the block, including the
+    # ones issued from the TestClient's app thread, and fails above the budget.
+    @contextmanager
+    def _assert_max_queries(max_queries: int) -> Iterator[list[str]]:
+        statements: list[str] = []
+
+        def _record(*args: Any) -> None:
+            statements.append(normalize_sql(args[2]))
+
+        event.listen(engine, "after_cursor_execute", _record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "after_cursor_execute", _record)
+
+        assert len(statements) <= max_queries, (
+            f"expected at most {max_queries} queries, got {len(statements)}:\n"
+            + "\n".join(statements)
+        )
+
+    return _assert_max_queries
@@ -0,0 +1,69 @@
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.core import admission
+from app.core.admission import AdaptiveConcurrencyLimiter, AdmissionPolicy
+
+
+def _shed(reason: str) -> float:
+    return REGISTRY.get_sample_value("kya_verify_shed_total", {"reason": reason}) or 0.0
+
+
+def test_limiter_grows_additively_and_backs_off_on_slow_completions() -> None:
+    now = [0.0]
+    limiter = AdaptiveConcurrencyLimiter(
+        AdmissionPolicy(initial_limit=4, min_limit=2, max_limit=8, latency_target_seconds=0.1),
+        clock=lambda: now[0],
+    )
+
+    # Fast completions at full use raise the limit up to the maximum.
+    for _ in range(20):
+        assert all(limiter.try_acquire() for _ in range(limiter.limit))
+        assert not limiter.try_acquire()
+        for _ in range(limiter.limit):
+            limiter.release(0.01)
+    assert limiter.limit == 8
+
+    # Slow completions cut the limit at most once per target interval.
+    for _ in range(3):
+        assert limiter.try_acquire()
+        limiter.release(0.5)
+    assert limiter.limit == 7
+    now[0] = 1.0
+    assert limiter.try_acquire()
+    limiter.release(0.5)
+    assert limiter.limit == 6
+    assert limiter.in_flight == 0
+
+
+def test_verify_over_concurrency_limit_gets_fast_503_with_retry_after(
+    client: TestClient, workspace_id: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    limiter = AdaptiveConcurrencyLimiter(
+        AdmissionPolicy(initial_limit=1, min_limit=1, max_limit=1, latency_target_seconds=1)
+    )
+    assert limiter.try_acquire()
+    monkeypatch.setattr(admission, "verify_limiter", limiter)
+    before = _shed("concurrency_limit")
+
+    response = client.post(
+        "/verify",
+        json={
+            "workspace_id": workspace_id,
+            "agent_id": str(uuid4()),
+            "action_type": "purchase",
+            "target_service": "stripe_proxy",
+            "payload": {"amount": 18},
+            "signature": "sig",
+            "capability_token": "token",
+        },
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert response.json()["detail"]["code"] == "OVERLOADED"
+    assert _shed("concurrency_limit") - before == 1
+    assert limiter.in_flight == 1
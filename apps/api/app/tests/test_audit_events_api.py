@@ -1,10 +1,13 @@
 from datetime import UTC, datetime, timedelta
 from uuid import UUID, uuid4
 
+from fastapi.encoders import jsonable_encoder
 from fastapi.testclient import TestClient
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.models.audit_event import AuditEvent
+from app.schemas.audit import AuditEventResponse
 
 
 def _insert_audit_event(
@@ -137,3 +140,27 @@ def test_list_audit_events_workspace_mismatch_denied(client: TestClient, workspa
 
     assert response.status_code == 403
     assert response.json()["detail"]["code"] == "WORKSPACE_MISMATCH"
+
+
+def test_list_audit_events_serialized_like_response_model(
+    client: TestClient, workspace_id: str, db_session: Session
+) -> None:
+    _insert_audit_event(
+        db_session,
+        workspace_id=workspace_id,
+        event_time=datetime(2026, 3, 1, 10, 0, 0, 123456, tzinfo=UTC),
+        event_type="action.verification.allowed",
+        subject_id=uuid4(),
+        event_data={"decision": "ALLOW", "note": "café €", "amount": 18.5, "tags": [1, None]},
+    )
+    event = db_session.scalars(
+        select(AuditEvent).where(AuditEvent.workspace_id == UUID(workspace_id))
+    ).one()
+    expected = jsonable_encoder(AuditEventResponse.model_validate(event))
+
+    listed = client.get(f"/audit/events?workspace_id={workspace_id}")
+    exported = client.get(f"/audit/export.json?workspace_id={workspace_id}")
+
+    assert listed.headers["content-type"] == "application/json"
+    assert listed.json() == {"items": [expected], "count": 1, "limit": 50, "offset": 0}
+    assert exported.json() == [expected]
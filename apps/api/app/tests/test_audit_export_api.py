@@ -1,4 +1,5 @@
 import csv
+import json
 from datetime import UTC, datetime, timedelta
 from io import StringIO
 from uuid import UUID, uuid4
@@ -9,6 +10,9 @@ from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.models.audit_event import AuditEvent
+from app.modules.audit_log import query_service
+from app.modules.audit_log.hash_chain import compute_audit_event_hash
+from app.modules.audit_log.service import append_audit_event
 
 
 def _insert_audit_event(
@@ -154,3 +158,71 @@ def test_export_audit_json_applies_max_rows_cap(
     assert response.status_code == 200
     payload = response.json()
     assert len(payload) == 1
+
+
+def test_export_audit_ndjson_contains_all_hash_inputs_in_chain_order(
+    client: TestClient, workspace_id: str, db_session: Session
+) -> None:
+    for decision in ("ALLOW", "DENY"):
+        append_audit_event(
+            db_session,
+            workspace_id=UUID(workspace_id),
+            event_type="action.verification.requested",
+            subject_type="agent",
+            subject_id=uuid4(),
+            event_data={"decision": decision, "note": "é"},
+        )
+        db_session.commit()
+
+    response = client.get(f"/audit/export.ndjson?workspace_id={workspace_id}")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [record["event_data"]["decision"] for record in records] == ["ALLOW", "DENY"]
+    assert records[0]["prev_hash"] is None
+    assert records[1]["prev_hash"] == records[0]["event_hash"]
+
+    for record in records:
+        recomputed = compute_audit_event_hash(
+            event_id=UUID(record["id"]),
+            workspace_id=UUID(record["workspace_id"]),
+            event_time=record["event_time"],
+            event_type=record["event_type"],
+            actor_type=record["actor_type"],
+            actor_id=None,
+            subject_type=record["subject_type"],
+            subject_id=UUID(record["subject_id"]),
+            event_data=record["event_data"],
+            payload_hash=record["payload_hash"],
+            prev_hash=record["prev_hash"],
+        )
+        assert recomputed == record["event_hash"]
+
+
+def test_export_audit_ndjson_streams_the_whole_chain_past_the_export_cap(
+    client: TestClient,
+    workspace_id: str,
+    db_session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    for index in range(5):
+        append_audit_event(
+            db_session,
+            workspace_id=UUID(workspace_id),
+            event_type="action.verification.requested",
+            subject_type="agent",
+            subject_id=uuid4(),
+            event_data={"index": index},
+        )
+        db_session.commit()
+    monkeypatch.setattr(settings, "audit_export_max_rows", 1)
+    monkeypatch.setattr(query_service, "CHAIN_EXPORT_BATCH_SIZE", 2)
+
+    response = client.get(f"/audit/export.ndjson?workspace_id={workspace_id}")
+
+    assert response.status_code == 200
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [record["event_data"]["index"] for record in records] == [0, 1, 2, 3, 4]
+    for previous, record in zip(records, records[1:], strict=False):
+        assert record["prev_hash"] == previous["event_hash"]
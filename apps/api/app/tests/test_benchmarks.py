@@ -0,0 +1,16 @@
+from benchmarks.hot_paths import compare
+
+
+def test_compare_flags_regressions_outside_tolerance() -> None:
+    report = compare(
+        {"fast": 10.0, "slow": 10.0, "better": 10.0, "dropped": 1.0},
+        {"fast": 11.0, "slow": 13.0, "better": 5.0, "added": 2.0},
+        0.25,
+    )
+
+    assert report["fast"]["status"] == "ok"
+    assert report["slow"]["status"] == "regressed"
+    assert report["slow"]["ratio"] == 1.3
+    assert report["better"]["status"] == "improved"
+    assert report["added"]["status"] == "new"
+    assert report["dropped"]["status"] == "missing"
@@ -1,11 +1,15 @@
 import base64
+from uuid import UUID
 
+import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import select
+from sqlalchemy import exc, select
 from sqlalchemy.orm import Session
 
+from app.models.agent import Agent
 from app.models.agent_policy_binding import AgentPolicyBinding
 from app.models.audit_event import AuditEvent
+from app.modules.verify_engine.lookups import get_agent_snapshot
 
 
 def _valid_public_key(raw: bytes) -> str:
@@ -94,6 +98,43 @@ def test_rebind_marks_old_binding_inactive(
     assert inactive_bindings[0].unbound_at is not None
 
 
+def test_rebind_updates_effective_policy_and_keeps_one_active_binding(
+    client: TestClient, workspace_id: str, db_session: Session
+) -> None:
+    agent_id = _create_agent(client, workspace_id, b"\x07" * 32)
+    first_policy_id = _create_policy(client, workspace_id, "purchase_basic", 1)
+    second_policy_id = _create_policy(client, workspace_id, "purchase_basic", 2)
+    for policy_id in (first_policy_id, second_policy_id):
+        response = client.post(
+            f"/agents/{agent_id}/bind_policy",
+            json={"workspace_id": workspace_id, "policy_id": policy_id},
+            headers={"X-Workspace-Id": workspace_id},
+        )
+        assert response.status_code == 201
+
+    agent = db_session.get(Agent, UUID(agent_id))
+    assert agent is not None
+    assert str(agent.effective_policy_id) == second_policy_id
+    snapshot = get_agent_snapshot(
+        db_session, workspace_id=UUID(workspace_id), agent_id=UUID(agent_id)
+    )
+    assert snapshot is not None and snapshot.policy is not None
+    assert str(snapshot.policy.id) == second_policy_id
+    assert snapshot.policy.version == 2
+
+    db_session.add(
+        AgentPolicyBinding(
+            workspace_id=UUID(workspace_id),
+            agent_id=UUID(agent_id),
+            policy_id=UUID(first_policy_id),
+            status="active",
+        )
+    )
+    with pytest.raises(exc.IntegrityError):
+        db_session.flush()
+    db_session.rollback()
+
+
 def test_bind_policy_on_revoked_agent_returns_conflict(
     client: TestClient, workspace_id: str
 ) -> None:
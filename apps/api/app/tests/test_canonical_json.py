@@ -0,0 +1,96 @@
+import json
+import random
+from collections.abc import Iterator
+from uuid import uuid4
+
+import pytest
+
+from app.modules.verify_engine import canonical_json
+from app.modules.verify_engine.canonical_json import (
+    CANONICAL_JSON_BACKENDS,
+    canonical_json_bytes,
+    get_canonical_json_backend,
+    set_canonical_json_backend,
+)
+
+_KEY_ALPHABET = "abcXYZ_-09éüß中文キー\U0001f600 \x7f\t\"\\"
+_TEXT_ALPHABET = _KEY_ALPHABET + " /\n\r\b\f\x00\x1fЖщ"
+
+
+def _reference(payload: object) -> bytes:
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode(
+        "utf-8"
+    )
+
+
+def _random_text(rng: random.Random, max_len: int) -> str:
+    return "".join(rng.choice(_TEXT_ALPHABET) for _ in range(rng.randint(0, max_len)))
+
+
+def _random_scalar(rng: random.Random) -> object:
+    kind = rng.randrange(7)
+    if kind == 0:
+        return rng.randint(-(2**70), 2**70)
+    if kind == 1:
+        return rng.randint(-1000, 1000)
+    if kind == 2:
+        return rng.uniform(-1000, 1000) * 10 ** rng.randint(-12, 24)
+    if kind == 3:
+        return rng.choice([True, False, None, 0.0, -0.0, 1e16, 1e-4, 9999999999999998.0])
+    return _random_text(rng, 12)
+
+
+def _random_value(rng: random.Random, depth: int) -> object:
+    if depth <= 0 or rng.random() < 0.4:
+        return _random_scalar(rng)
+    if rng.random() < 0.5:
+        return [_random_value(rng, depth - 1) for _ in range(rng.randint(0, 4))]
+    return {
+        "".join(rng.choice(_KEY_ALPHABET) for _ in range(rng.randint(0, 6))): _random_value(
+            rng, depth - 1
+        )
+        for _ in range(rng.randint(0, 5))
+    }
+
+
+def _corpus(size: int) -> Iterator[dict[str, object]]:
+    rng = random.Random(20260301)
+    for _ in range(size):
+        yield {
+            "agent_id": str(uuid4()),
+            "action_type": _random_text(rng, 8),
+            "payload": {str(index): _random_value(rng, 5) for index in range(rng.randint(0, 6))},
+        }
+
+
+@pytest.fixture(params=sorted(CANONICAL_JSON_BACKENDS))
+def backend(request: pytest.FixtureRequest) -> Iterator[str]:
+    previous = get_canonical_json_backend()
+    set_canonical_json_backend(request.param)
+    yield request.param
+    set_canonical_json_backend(previous)
+
+
+def test_backends_match_reference_on_generated_corpus(backend: str) -> None:
+    for payload in _corpus(3000):
+        assert canonical_json_bytes(payload) == _reference(payload)
+
+
+def test_backends_reject_unserializable_values_like_reference(backend: str) -> None:
+    with pytest.raises(TypeError):
+        canonical_json_bytes({"id": uuid4()})
+    with pytest.raises(UnicodeEncodeError):
+        canonical_json_bytes({"text": "\ud800"})
+
+
+def test_orjson_guard_falls_back_for_divergent_floats() -> None:
+    assert canonical_json._orjson_compatible({"amount": 18.5, "qty": [1, 2]})
+    assert not canonical_json._orjson_compatible({"amount": 1e16})
+    assert not canonical_json._orjson_compatible({"amount": 1e-5})
+    assert not canonical_json._orjson_compatible({1: "non-str key"})
+    assert not canonical_json._orjson_compatible({"big": 2**64})
+
+
+def test_unknown_backend_is_rejected() -> None:
+    with pytest.raises(RuntimeError):
+        set_canonical_json_backend("simdjson")
@@ -149,3 +149,37 @@ def test_issue_capability_workspace_mismatch_denied(client: TestClient, workspac
 
     assert response.status_code == 403
     assert response.json()["detail"]["code"] == "WORKSPACE_MISMATCH"
+
+
+def test_revoke_capability(client: TestClient, workspace_id: str) -> None:
+    agent_id = _create_agent(client, workspace_id, 14)
+    policy_id = _create_policy(client, workspace_id)
+    _bind_policy(client, workspace_id, agent_id, policy_id)
+    issued = client.post(
+        "/capabilities/request",
+        json={
+            "workspace_id": workspace_id,
+            "agent_id": agent_id,
+            "action": "purchase",
+            "target_service": "stripe_proxy",
+            "requested_scopes": ["purchase"],
+        },
+    ).json()
+    body = {"workspace_id": workspace_id, "reason": "leaked"}
+
+    response = client.post(f"/capabilities/{issued['jti']}/revoke", json=body)
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["capability_id"] == issued["capability_id"]
+    assert payload["jti"] == issued["jti"]
+    assert payload["status"] == "revoked"
+    assert payload["revoked_at"]
+
+    again = client.post(f"/capabilities/{issued['jti']}/revoke", json=body)
+    assert again.status_code == 409
+    assert again.json()["detail"]["code"] == "CAPABILITY_ALREADY_REVOKED"
+
+    missing = client.post("/capabilities/unknown-jti/revoke", json=body)
+    assert missing.status_code == 404
+    assert missing.json()["detail"]["code"] == "CAPABILITY_NOT_FOUND"
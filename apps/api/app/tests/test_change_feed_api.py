@@ -0,0 +1,197 @@
+import base64
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+
+from fastapi.testclient import TestClient
+from nacl.signing import SigningKey
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.capability import Capability
+from app.models.state_change import StateChange
+from app.modules.change_feed.pruning import prune_expired_state_changes
+from app.modules.revocation.service import is_jti_revoked
+
+
+def _create_agent(client: TestClient, workspace_id: str, name: str = "feed-agent") -> str:
+    public_key = base64.b64encode(bytes(SigningKey.generate().verify_key)).decode()
+    response = client.post(
+        "/agents",
+        json={"workspace_id": workspace_id, "name": name, "public_key": public_key},
+    )
+    assert response.status_code == 201
+    return str(response.json()["id"])
+
+
+def _create_policy(client: TestClient, workspace_id: str, version: int) -> str:
+    response = client.post(
+        "/policies",
+        json={
+            "workspace_id": workspace_id,
+            "name": "feed_policy",
+            "version": version,
+            "schema_version": 1,
+            "policy_json": {"allowed_tools": ["purchase"]},
+        },
+    )
+    assert response.status_code == 201
+    return str(response.json()["id"])
+
+
+def _bind(client: TestClient, workspace_id: str, agent_id: str, policy_id: str) -> None:
+    response = client.post(
+        f"/agents/{agent_id}/bind_policy",
+        json={"workspace_id": workspace_id, "policy_id": policy_id},
+    )
+    assert response.status_code == 201
+
+
+def test_change_feed_lists_changes_in_commit_order(
+    client: TestClient, db_session: Session, workspace_id: str
+) -> None:
+    agent_id = _create_agent(client, workspace_id)
+    first_policy = _create_policy(client, workspace_id, version=1)
+    second_policy = _create_policy(client, workspace_id, version=2)
+    _bind(client, workspace_id, agent_id, first_policy)
+    _bind(client, workspace_id, agent_id, second_policy)
+    capability = client.post(
+        "/capabilities/request",
+        json={
+            "workspace_id": workspace_id,
+            "agent_id": agent_id,
+            "action": "purchase",
+            "target_service": "stripe_proxy",
+            "requested_scopes": ["purchase"],
+        },
+    )
+    jti = str(capability.json()["jti"])
+    revoked = client.post(
+        f"/capabilities/{jti}/revoke", json={"workspace_id": workspace_id, "reason": "leaked"}
+    )
+    assert revoked.status_code == 200
+    revoke = client.post(
+        f"/agents/{agent_id}/revoke",
+        json={"workspace_id": workspace_id, "reason": "compromised"},
+    )
+    assert revoke.status_code == 200
+
+    response = client.get(f"/changes?workspace_id={workspace_id}")
+
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["change_type"] for item in items] == [
+        "agent.created",
+        "policy.created",
+        "policy.created",
+        "binding.created",
+        "binding.deactivated",
+        "binding.created",
+        "capability.issued",
+        "capability.revoked",
+        "agent.revoked",
+    ]
+    cursors = [item["cursor"] for item in items]
+    assert cursors == sorted(cursors)
+    assert response.json()["next_cursor"] == cursors[-1]
+    assert items[4]["data"] == {
+        "agent_id": agent_id,
+        "policy_id": first_policy,
+        "status": "inactive",
+    }
+    assert items[5]["data"] == {
+        "agent_id": agent_id,
+        "policy_id": second_policy,
+        "status": "active",
+    }
+    assert items[6]["entity_type"] == "capability"
+    assert items[6]["data"] == {"jti": jti, "status": "active"}
+    assert items[7]["entity_type"] == "revocation"
+    assert items[7]["data"] == {"jti": jti}
+    assert items[8]["data"]["status"] == "revoked"
+    assert is_jti_revoked(db_session, jti=jti)
+
+    page = client.get(f"/changes?workspace_id={workspace_id}&cursor={cursors[2]}&limit=2")
+    assert [item["cursor"] for item in page.json()["items"]] == cursors[3:5]
+
+    state = client.get(f"/verifier/state?workspace_id={workspace_id}")
+    assert state.json()["cursor"] == cursors[-1]
+    assert state.json()["revoked_jtis"] == [jti]
+
+
+def test_change_feed_long_poll_returns_when_a_change_lands(
+    client: TestClient, workspace_id: str
+) -> None:
+    cursor = client.get(f"/changes?workspace_id={workspace_id}").json()["next_cursor"]
+    writer = TestClient(app, headers={"X-Workspace-Id": workspace_id})
+    timer = threading.Timer(0.3, _create_agent, args=(writer, workspace_id))
+    timer.start()
+
+    started = time.monotonic()
+    response = client.get(f"/changes?workspace_id={workspace_id}&cursor={cursor}&wait_seconds=10")
+    elapsed = time.monotonic() - started
+    timer.join()
+
+    assert response.status_code == 200
+    assert [item["change_type"] for item in response.json()["items"]] == ["agent.created"]
+    assert 0.2 < elapsed < 5
+
+
+def test_change_feed_wait_times_out_empty(client: TestClient, workspace_id: str) -> None:
+    response = client.get(f"/changes?workspace_id={workspace_id}&cursor=0&wait_seconds=0.3")
+
+    assert response.status_code == 200
+    assert response.json() == {"items": [], "next_cursor": 0}
+
+
+def test_change_feed_is_scoped_to_workspace(client: TestClient, workspace_id: str) -> None:
+    response = client.get(
+        f"/changes?workspace_id={workspace_id}",
+        headers={"X-Workspace-Id": "aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"},
+    )
+
+    assert response.status_code == 403
+    assert response.json()["detail"]["code"] == "WORKSPACE_MISMATCH"
+
+
+def test_pruning_compacts_superseded_changes_and_expired_revocations(
+    client: TestClient, db_session: Session, workspace_id: str
+) -> None:
+    agent_id = _create_agent(client, workspace_id)
+    policy_id = _create_policy(client, workspace_id, version=1)
+    _bind(client, workspace_id, agent_id, policy_id)
+    jti = client.post(
+        "/capabilities/request",
+        json={
+            "workspace_id": workspace_id,
+            "agent_id": agent_id,
+            "action": "purchase",
+            "target_service": "stripe_proxy",
+            "requested_scopes": ["purchase"],
+        },
+    ).json()["jti"]
+    client.post(f"/capabilities/{jti}/revoke", json={"workspace_id": workspace_id, "reason": "x"})
+    client.post(f"/agents/{agent_id}/revoke", json={"workspace_id": workspace_id, "reason": "x"})
+    db_session.execute(
+        update(StateChange).values(created_at=StateChange.created_at - timedelta(hours=2))
+    )
+    db_session.commit()
+
+    assert prune_expired_state_changes(SessionLocal, retention_seconds=3600) == 1
+    db_session.execute(
+        update(Capability)
+        .where(Capability.jti == jti)
+        .values(expires_at=datetime.now(tz=UTC) - timedelta(minutes=1))
+    )
+    db_session.commit()
+    # The token's issuance and its revocation both go once it has expired.
+    assert prune_expired_state_changes(SessionLocal, retention_seconds=3600) == 2
+
+    items = client.get(f"/changes?workspace_id={workspace_id}").json()["items"]
+    assert [item["change_type"] for item in items] == [
+        "policy.created",
+        "binding.created",
+        "agent.revoked",
+    ]
@@ -0,0 +1,90 @@
+from collections.abc import Iterator
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.db.pool import InstrumentedQueuePool, validate_idle_connections, warm_up_pool
+
+
+@pytest.fixture
+def pool_engine() -> Iterator[Engine]:
+    engine = create_engine(
+        settings.database_url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=3,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    yield engine
+    engine.dispose()
+
+
+def _sample(name: str) -> float:
+    return REGISTRY.get_sample_value(name) or 0.0
+
+
+def test_warm_up_opens_pool_size_connections_and_reports_gauges(pool_engine: Engine) -> None:
+    waits_before = _sample("kya_db_pool_wait_seconds_count")
+
+    assert warm_up_pool(pool_engine, 3) == 3
+
+    assert pool_engine.pool.checkedin() == 3  # type: ignore[attr-defined]
+    assert _sample("kya_db_pool_idle") == 3
+    assert _sample("kya_db_pool_checked_out") == 0
+    assert _sample("kya_db_pool_wait_seconds_count") - waits_before == 3
+
+    with pool_engine.connect():
+        assert _sample("kya_db_pool_checked_out") == 1
+        assert _sample("kya_db_pool_idle") == 2
+
+
+def test_validation_replaces_dead_idle_connections(pool_engine: Engine) -> None:
+    warm_up_pool(pool_engine, 2)
+    with pool_engine.connect() as connection:
+        victim = connection.execute(text("SELECT pg_backend_pid()")).scalar_one()
+
+    with pool_engine.connect() as admin:
+        admin.execute(text("SELECT pg_terminate_backend(:pid)"), {"pid": victim})
+    invalidated_before = _sample("kya_db_pool_invalidated_total")
+
+    assert validate_idle_connections(pool_engine) == 1
+    assert _sample("kya_db_pool_invalidated_total") - invalidated_before == 1
+
+    for _ in range(2):
+        with pool_engine.connect() as connection:
+            assert connection.execute(text("SELECT 1")).scalar_one() == 1
+
+
+def test_validation_bypasses_checkout_metrics_and_never_opens_connections(
+    pool_engine: Engine,
+) -> None:
+    warm_up_pool(pool_engine, 3)
+    waits_before = _sample("kya_db_pool_wait_seconds_count")
+
+    assert validate_idle_connections(pool_engine) == 0
+    assert pool_engine.pool.checkedin() == 3  # type: ignore[attr-defined]
+    assert _sample("kya_db_pool_wait_seconds_count") == waits_before
+
+    # Nothing idle: returns at once instead of waiting out the pool timeout.
+    held = [pool_engine.connect() for _ in range(3)]
+    waits_before = _sample("kya_db_pool_wait_seconds_count")
+    assert validate_idle_connections(pool_engine) == 0
+    assert pool_engine.pool.checkedout() == 3  # type: ignore[attr-defined]
+    assert _sample("kya_db_pool_wait_seconds_count") == waits_before
+    for connection in held:
+        connection.close()
+
+
+def test_pool_timeouts_are_counted(pool_engine: Engine) -> None:
+    timeouts_before = _sample("kya_db_pool_timeouts_total")
+    held = [pool_engine.connect() for _ in range(3)]
+
+    with pytest.raises(exc.TimeoutError):
+        pool_engine.connect()
+
+    for connection in held:
+        connection.close()
+    assert _sample("kya_db_pool_timeouts_total") - timeouts_before == 1
@@ -0,0 +1,98 @@
+import base64
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.jwt_keys import load_jwt_public_key
+from app.core.jwt_tokens import decode_capability_token
+from app.main import app
+
+
+def _raw_public_key_b64url() -> str:
+    raw = load_jwt_public_key().public_bytes(
+        encoding=serialization.Encoding.Raw,
+        format=serialization.PublicFormat.Raw,
+    )
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _claims() -> dict[str, object]:
+    return {
+        "sub": "agent",
+        "workspace_id": "workspace",
+        "iat": 1_700_000_000,
+        "exp": 4_100_000_000,
+        "jti": "jti-1",
+    }
+
+
+def test_jwks_serves_signing_key_with_cache_headers() -> None:
+    # Public: no X-Workspace-Id header needed.
+    client = TestClient(app)
+
+    response = client.get("/.well-known/jwks.json")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "keys": [
+            {
+                "kty": "OKP",
+                "crv": "Ed25519",
+                "alg": "EdDSA",
+                "use": "sig",
+                "kid": settings.kya_jwt_kid,
+                "x": _raw_public_key_b64url(),
+            }
+        ]
+    }
+    assert response.headers["Cache-Control"] == "public, max-age=300"
+    etag = response.headers["ETag"]
+    assert etag.startswith('"') and etag.endswith('"')
+
+    revalidated = client.get("/.well-known/jwks.json", headers={"If-None-Match": f"W/{etag}"})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["ETag"] == etag
+
+    stale = client.get("/.well-known/jwks.json", headers={"If-None-Match": '"other"'})
+    assert stale.status_code == 200
+
+
+def test_jwks_publishes_previous_keys_and_tokens_verify_by_kid(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = TestClient(app)
+    etag_before = client.get("/.well-known/jwks.json").headers["ETag"]
+    old_key = Ed25519PrivateKey.generate()
+    old_pem = (
+        old_key.public_key()
+        .public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode("ascii")
+    )
+    monkeypatch.setattr(settings, "kya_jwt_previous_public_keys", {"retired-key": old_pem})
+
+    response = client.get("/.well-known/jwks.json")
+
+    assert [key["kid"] for key in response.json()["keys"]] == [settings.kya_jwt_kid, "retired-key"]
+    assert response.headers["ETag"] != etag_before
+
+    old_token = jwt.encode(_claims(), old_key, algorithm="EdDSA", headers={"kid": "retired-key"})
+    assert decode_capability_token(old_token)["jti"] == "jti-1"
+
+    unknown_kid = jwt.encode(_claims(), old_key, algorithm="EdDSA", headers={"kid": "nope"})
+    with pytest.raises(jwt.InvalidTokenError):
+        decode_capability_token(unknown_kid)
+
+    # A retired key cannot impersonate the current kid.
+    wrong_key = jwt.encode(
+        _claims(), old_key, algorithm="EdDSA", headers={"kid": settings.kya_jwt_kid}
+    )
+    with pytest.raises(jwt.InvalidSignatureError):
+        decode_capability_token(wrong_key)
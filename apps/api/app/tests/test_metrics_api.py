@@ -1,11 +1,18 @@
 import base64
+import os
+import subprocess
+import sys
 from hashlib import sha256
+from pathlib import Path
 from typing import cast
 
 from fastapi.testclient import TestClient
 from nacl.signing import SigningKey
 
 from app.modules.verify_engine.canonical_json import canonical_json_bytes
+from app.serve import prepare_multiprocess_dir
+
+API_DIR = Path(__file__).resolve().parents[2]
 
 
 def _create_agent(client: TestClient, workspace_id: str, public_key_b64: str) -> str:
@@ -110,6 +117,46 @@ def test_metrics_exposed_and_updated(client: TestClient, workspace_id: str) -> N
     assert metrics.status_code == 200
     assert "kya_verify_total" in metrics.text
     assert "kya_verify_latency_seconds" in metrics.text
+    assert 'kya_verify_stage_latency_seconds_count{decision="ALLOW",stage="signature_verify"}' in (
+        metrics.text
+    )
     assert "kya_audit_integrity_total" in metrics.text
+    assert 'kya_http_db_queries_count{route="/verify"}' in metrics.text
+    assert "kya_db_slow_queries_total" in metrics.text
     assert 'decision="ALLOW"' in metrics.text
     assert 'status="OK"' in metrics.text
+
+
+def _run_python(code: str, env: dict[str, str]) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=API_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout
+
+
+def test_multiprocess_metrics_are_summed_across_workers(tmp_path: Path) -> None:
+    (tmp_path / "counter_999.db").write_bytes(b"stale")
+    directory, created = prepare_multiprocess_dir(str(tmp_path))
+    assert (directory, created) == (tmp_path, False)
+    assert list(tmp_path.iterdir()) == []
+
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    for _ in range(2):
+        _run_python(
+            "from app.observability.metrics import observe_verify, mark_worker_dead\n"
+            "observe_verify('ALLOW', None, 0.01)\n"
+            "mark_worker_dead()",
+            env,
+        )
+
+    output = _run_python(
+        "from app.observability.metrics import export_metrics_text\nprint(export_metrics_text())",
+        env,
+    )
+    assert 'kya_verify_total{decision="ALLOW",reason_code="NONE"} 2.0' in output
+    assert "kya_verify_latency_seconds_count 2.0" in output
@@ -1,4 +1,6 @@
 import base64
+import io
+import json
 import logging
 from hashlib import sha256
 from typing import cast
@@ -7,7 +9,10 @@ import pytest
 from fastapi.testclient import TestClient
 from nacl.signing import SigningKey
 
+from app.core.config import settings
 from app.modules.verify_engine.canonical_json import canonical_json_bytes
+from app.observability.logging import JsonLogFormatter, build_log_handler
+from app.observability.query_tracking import normalize_sql
 
 
 def _setup_agent_policy_capability(
@@ -122,6 +127,9 @@ def test_observability_logs_include_correlation_fields(
     assert getattr(verify_record, "agent_id", None) == agent_id
     assert getattr(verify_record, "decision", None) == "ALLOW"
     assert getattr(verify_record, "audit_event_id", None) is not None
+    stage_ms = getattr(verify_record, "stage_ms", None)
+    assert isinstance(stage_ms, dict)
+    assert {"agent_lookup", "jwt_decode", "signature_verify", "db_commit"} <= set(stage_ms)
 
     integrity_logs = [
         record
@@ -141,3 +149,134 @@ def test_observability_logs_include_correlation_fields(
     assert any(getattr(record, "path", None) == "/verify" for record in http_logs)
     assert all(getattr(record, "status", None) is not None for record in http_logs)
     assert all(getattr(record, "latency_ms", None) is not None for record in http_logs)
+    verify_http_record = next(
+        record for record in http_logs if getattr(record, "path", None) == "/verify"
+    )
+    assert cast(int, getattr(verify_http_record, "db_query_count", 0)) > 0
+    assert getattr(verify_http_record, "db_time_ms", None) is not None
+
+
+def test_slow_queries_are_logged_with_normalized_sql_and_call_site(
+    client: TestClient,
+    workspace_id: str,
+    caplog: pytest.LogCaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    caplog.set_level(logging.INFO)
+    monkeypatch.setattr(settings, "db_slow_query_threshold_ms", 0.0)
+
+    response = client.get(f"/workspaces/{workspace_id}")
+    assert response.status_code == 200
+
+    slow_logs = [
+        record
+        for record in caplog.records
+        if getattr(record, "event_name", None) == "db_slow_query"
+    ]
+    assert slow_logs
+    statements = [str(getattr(record, "statement", "")) for record in slow_logs]
+    assert any(statement.startswith("SELECT workspaces.id") for statement in statements)
+    assert all("%(" not in statement for statement in statements)
+    call_sites = [str(getattr(record, "call_site", "")) for record in slow_logs]
+    assert any(site.startswith("app/") for site in call_sites)
+
+
+def test_normalize_sql_replaces_literals_and_collapses_whitespace() -> None:
+    statement = (
+        "SELECT agents.id FROM agents\n  WHERE agents.name = 'o''brien' AND agents.id IN "
+        "(%(id_1_1)s, %(id_1_2)s) LIMIT 10"
+    )
+    assert normalize_sql(statement) == (
+        "SELECT agents.id FROM agents WHERE agents.name = ? AND agents.id IN (...) LIMIT ?"
+    )
+
+
+def test_http_requests_are_timed_per_route_including_streamed_responses(
+    client: TestClient, workspace_id: str, caplog: pytest.LogCaptureFixture
+) -> None:
+    caplog.set_level(logging.INFO)
+
+    assert client.get(f"/workspaces/{workspace_id}").status_code == 200
+    export = client.get(f"/audit/export.ndjson?workspace_id={workspace_id}")
+    assert export.status_code == 200
+    assert client.get("/no-such-route").status_code == 404
+
+    http_logs = {
+        getattr(record, "path", None): record
+        for record in caplog.records
+        if getattr(record, "event_name", None) == "http_request"
+    }
+    assert getattr(http_logs["/audit/export.ndjson"], "status", None) == 200
+    assert getattr(http_logs["/no-such-route"], "status", None) == 404
+
+    metrics = client.get("/metrics").text
+    assert (
+        'kya_http_request_latency_seconds_count{method="GET",'
+        'route="/workspaces/{workspace_id}",status_class="2xx"}'
+    ) in metrics
+    assert 'route="/audit/export.ndjson"' in metrics
+    assert "no-such-route" not in metrics
+
+
+class _RecordingHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+def _isolated_logger(name: str, handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def test_queue_log_handler_writes_same_json_off_thread_and_counts_overflow() -> None:
+    stream = io.StringIO()
+    stream_handler = logging.StreamHandler(stream)
+    stream_handler.setFormatter(JsonLogFormatter())
+    handler, writer = build_log_handler(stream_handler, queue_size=2, sample_rates={})
+    assert writer is not None
+    logger = _isolated_logger("kya.test.queue", handler)
+
+    # Writer not started yet: the queue fills up and the rest are dropped, not blocked on.
+    for index in range(5):
+        logger.info("http_request", extra={"event_name": "http_request", "status": 200 + index})
+    assert stream.getvalue() == ""
+
+    writer.start()
+    writer.stop()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line.get("status") for line in lines[:2]] == [200, 201]
+    assert set(lines[0]) == {"timestamp", "level", "logger", "message", "event_name", "status"}
+    assert lines[-1]["event_name"] == "log_records_dropped"
+    assert lines[-1]["dropped_count"] == 3
+
+
+def test_event_sampler_keeps_denies_and_warnings() -> None:
+    sink = _RecordingHandler()
+    handler, writer = build_log_handler(
+        sink, queue_size=0, sample_rates={"verify_decision:ALLOW": 0.0, "http_request": 1.0}
+    )
+    assert writer is None
+    logger = _isolated_logger("kya.test.sampling", handler)
+
+    for decision in ("ALLOW", "DENY", "ALLOW"):
+        logger.info(
+            "verify_decision", extra={"event_name": "verify_decision", "decision": decision}
+        )
+    logger.warning("verify_decision", extra={"event_name": "verify_decision", "decision": "ALLOW"})
+    logger.info("http_request", extra={"event_name": "http_request"})
+    logger.info("audit_integrity_checked", extra={"event_name": "audit_integrity_checked"})
+
+    assert [(record.levelname, getattr(record, "decision", None)) for record in sink.records] == [
+        ("INFO", "DENY"),
+        ("WARNING", "ALLOW"),
+        ("INFO", None),
+        ("INFO", None),
+    ]
@@ -0,0 +1,67 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from prometheus_client import REGISTRY
+
+from app.core.singleflight import SingleFlight
+
+
+def _count(group: str, outcome: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "kya_singleflight_total", {"group": group, "outcome": outcome}
+    )
+    return value or 0.0
+
+
+def test_concurrent_loads_of_one_key_share_a_single_call() -> None:
+    flight = SingleFlight("test_shared")
+    started = threading.Event()
+    release = threading.Event()
+    calls = 0
+
+    def load() -> dict[str, int]:
+        nonlocal calls
+        calls += 1
+        started.set()
+        release.wait(5)
+        return {"version": 3}
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        leader = pool.submit(flight.do, "agent-1", load)
+        assert started.wait(5)
+        followers = [pool.submit(flight.do, "agent-1", load) for _ in range(7)]
+        other_key = flight.do("agent-2", lambda: {"version": 1})
+        time.sleep(0.2)
+        release.set()
+        results = [leader.result(5)] + [future.result(5) for future in followers]
+
+    assert calls == 1
+    assert other_key == {"version": 1}
+    assert all(result is results[0] for result in results)
+    assert _count("test_shared", "load") == 2
+    assert _count("test_shared", "coalesced") == 7
+
+
+def test_followers_load_for_themselves_when_the_leader_fails() -> None:
+    flight = SingleFlight("test_failure")
+    started = threading.Event()
+    release = threading.Event()
+
+    def failing_load() -> int:
+        started.set()
+        release.wait(5)
+        raise RuntimeError("leader session aborted")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flight.do, "key", failing_load)
+        assert started.wait(5)
+        follower = pool.submit(flight.do, "key", lambda: 42)
+        time.sleep(0.2)
+        release.set()
+
+        assert follower.result(5) == 42
+        exception = leader.exception(5)
+    assert isinstance(exception, RuntimeError)
+    assert _count("test_failure", "coalesced") == 0
+    assert _count("test_failure", "load") == 2
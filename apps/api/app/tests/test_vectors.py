@@ -2,10 +2,14 @@ import json
 from hashlib import sha256
 from pathlib import Path
 
-from app.modules.verify_engine.canonical_json import canonical_json_bytes
+import pytest
 
+from app.modules.verify_engine.canonical_json import CANONICAL_JSON_BACKENDS
 
-def test_shared_verify_vectors_match_backend_canonicalization() -> None:
+
+@pytest.mark.parametrize("backend", sorted(CANONICAL_JSON_BACKENDS))
+def test_shared_verify_vectors_match_backend_canonicalization(backend: str) -> None:
+    encode = CANONICAL_JSON_BACKENDS[backend]
     vectors_dir = Path(__file__).resolve().parents[4] / "shared-test-vectors" / "verify"
     vector_files = sorted(vectors_dir.glob("*.json"))
     assert vector_files
@@ -15,7 +19,7 @@ def test_shared_verify_vectors_match_backend_canonicalization() -> None:
         envelope = data["input"]
         expected = data["expected"]
 
-        canonical = canonical_json_bytes(envelope).decode("utf-8")
+        canonical = encode(envelope).decode("utf-8")
         digest = sha256(canonical.encode("utf-8")).hexdigest()
 
         assert canonical == expected["canonical_json"]
@@ -0,0 +1,176 @@
+import base64
+from datetime import UTC, datetime
+from uuid import UUID
+
+from fastapi.testclient import TestClient
+from nacl.signing import SigningKey
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.jwt_keys import load_jwt_public_key
+from app.models.audit_event import AuditEvent
+from app.models.capability import Capability
+from app.models.policy import Policy
+
+
+def _bootstrap_agent(client: TestClient, workspace_id: str) -> tuple[str, str, str]:
+    public_key = base64.b64encode(bytes(SigningKey.generate().verify_key)).decode()
+    agent = client.post(
+        "/agents",
+        json={"workspace_id": workspace_id, "name": "edge-agent", "public_key": public_key},
+    )
+    assert agent.status_code == 201
+    agent_id = str(agent.json()["id"])
+
+    policy = client.post(
+        "/policies",
+        json={
+            "workspace_id": workspace_id,
+            "name": "edge_policy",
+            "version": 1,
+            "schema_version": 1,
+            "policy_json": {
+                "allowed_tools": ["purchase"],
+                "spend": {"currency": "EUR", "max_per_tx": 50},
+                "rate_limits": {"max_actions_per_min": 10},
+            },
+        },
+    )
+    assert policy.status_code == 201
+    policy_id = str(policy.json()["id"])
+
+    bind = client.post(
+        f"/agents/{agent_id}/bind_policy",
+        json={"workspace_id": workspace_id, "policy_id": policy_id},
+    )
+    assert bind.status_code == 201
+
+    capability = client.post(
+        "/capabilities/request",
+        json={
+            "workspace_id": workspace_id,
+            "agent_id": agent_id,
+            "action": "purchase",
+            "target_service": "stripe_proxy",
+            "requested_scopes": ["purchase"],
+            "requested_limits": {"amount": 20, "currency": "EUR"},
+        },
+    )
+    assert capability.status_code == 201
+    return agent_id, policy_id, str(capability.json()["jti"])
+
+
+def test_verifier_state_full_snapshot(
+    client: TestClient, db_session: Session, workspace_id: str
+) -> None:
+    agent_id, policy_id, jti = _bootstrap_agent(client, workspace_id)
+    capability = db_session.scalar(select(Capability).where(Capability.jti == jti))
+    assert capability is not None
+    capability.status = "revoked"
+    capability.revoked_at = datetime.now(tz=UTC)
+    db_session.commit()
+
+    response = client.get(f"/verifier/state?workspace_id={workspace_id}")
+
+    assert response.status_code == 200
+    state = response.json()
+    assert [agent["id"] for agent in state["agents"]] == [agent_id]
+    assert state["agents"][0]["status"] == "active"
+    assert [policy["id"] for policy in state["policies"]] == [policy_id]
+    assert state["policies"][0]["policy_json"]["spend"]["max_per_tx"] == 50
+    assert state["bindings"] == [{"agent_id": agent_id, "policy_id": policy_id, "status": "active"}]
+    assert state["capabilities"] == [{"jti": jti, "status": "revoked"}]
+    assert state["revoked_jtis"] == [jti]
+
+    (jwk,) = state["jwt_keys"]
+    assert jwk["kid"] == "test-ed25519-key-1"
+    assert jwk["crv"] == "Ed25519"
+    raw = base64.urlsafe_b64decode(jwk["x"] + "=" * (-len(jwk["x"]) % 4))
+    assert raw == load_jwt_public_key().public_bytes_raw()
+
+
+def test_verifier_state_reflects_revoked_agents_and_deactivated_policies(
+    client: TestClient, db_session: Session, workspace_id: str
+) -> None:
+    agent_id, policy_id, _ = _bootstrap_agent(client, workspace_id)
+    revoke = client.post(
+        f"/agents/{agent_id}/revoke",
+        json={"workspace_id": workspace_id, "reason": "compromised"},
+    )
+    assert revoke.status_code == 200
+    policy = db_session.get(Policy, UUID(policy_id))
+    assert policy is not None
+    policy.is_active = False
+    db_session.commit()
+
+    state = client.get(f"/verifier/state?workspace_id={workspace_id}").json()
+
+    assert [(agent["id"], agent["status"]) for agent in state["agents"]] == [
+        (agent_id, "revoked")
+    ]
+    assert [(policy["id"], policy["is_active"]) for policy in state["policies"]] == [
+        (policy_id, False)
+    ]
+
+
+def test_verifier_decisions_are_appended_to_audit_chain(
+    client: TestClient, db_session: Session, workspace_id: str
+) -> None:
+    agent_id, _, jti = _bootstrap_agent(client, workspace_id)
+    decided_at = datetime.now(tz=UTC).isoformat()
+
+    response = client.post(
+        "/verifier/decisions",
+        json={
+            "workspace_id": workspace_id,
+            "verifier_id": "edge-1",
+            "decisions": [
+                {
+                    "agent_id": agent_id,
+                    "action_type": "purchase",
+                    "target_service": "stripe_proxy",
+                    "decision": "ALLOW",
+                    "jti": jti,
+                    "decided_at": decided_at,
+                },
+                {
+                    "agent_id": agent_id,
+                    "action_type": "purchase",
+                    "target_service": "stripe_proxy",
+                    "decision": "DENY",
+                    "reason_code": "SPEND_LIMIT_EXCEEDED",
+                    "decided_at": decided_at,
+                },
+            ],
+        },
+    )
+
+    assert response.status_code == 201
+    assert response.json() == {"accepted": 2}
+
+    events = db_session.scalars(
+        select(AuditEvent)
+        .where(AuditEvent.event_type.like("action.verification.%"))
+        .order_by(AuditEvent.event_time)
+    ).all()
+    assert [event.event_type for event in events] == [
+        "action.verification.allowed",
+        "action.verification.denied",
+    ]
+    assert events[0].event_data["source"] == "local"
+    assert events[0].event_data["verifier_id"] == "edge-1"
+    assert events[0].event_data["jti"] == jti
+    assert events[1].event_data["reason_code"] == "SPEND_LIMIT_EXCEEDED"
+
+    integrity = client.get(f"/audit/integrity/check?workspace_id={workspace_id}")
+    assert integrity.json()["status"] == "OK"
+
+
+def test_verifier_state_workspace_mismatch_denied(client: TestClient, workspace_id: str) -> None:
+    response = client.get(
+        f"/verifier/state?workspace_id={workspace_id}",
+        headers={"X-Workspace-Id": "aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"},
+    )
+
+    assert response.status_code == 403
+    assert response.json()["detail"]["code"] == "WORKSPACE_MISMATCH"
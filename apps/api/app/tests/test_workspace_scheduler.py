@@ -0,0 +1,169 @@
+import asyncio
+from collections.abc import Iterator, Sequence
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy.orm import Session
+
+from app.api.routes import audit as audit_routes
+from app.core import workspace_scheduler
+from app.core.config import Settings, settings
+from app.core.workspace_scheduler import FairScheduler, WorkspaceBusyError
+from app.models.audit_event import AuditEvent
+from app.modules.audit_log.query_service import iter_audit_event_batches_for_chain_export
+from app.schemas.audit_integrity import AuditIntegrityQueryParams
+
+
+def _rejected(workspace_id: str, reason: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "kya_workspace_rejected_total", {"workspace_id": workspace_id, "reason": reason}
+    )
+    return value or 0.0
+
+
+def test_workspace_at_quota_queues_without_blocking_other_workspaces() -> None:
+    async def scenario() -> None:
+        scheduler = FairScheduler(capacity=2, max_concurrency=1, max_queued=10)
+        await scheduler.acquire("noisy", timeout_seconds=1)
+        queued = asyncio.create_task(scheduler.acquire("noisy", timeout_seconds=1))
+        await asyncio.sleep(0)
+
+        await scheduler.acquire("quiet", timeout_seconds=1)
+        assert scheduler.queued("noisy") == 1
+        assert scheduler.workspace_in_flight("noisy") == 1
+
+        scheduler.release("noisy")
+        await queued
+        scheduler.release("noisy")
+        scheduler.release("quiet")
+        assert scheduler.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_queued_requests_are_released_by_weight_not_arrival() -> None:
+    async def scenario() -> list[str]:
+        scheduler = FairScheduler(
+            capacity=1, max_concurrency=10, max_queued=10, weights={"heavy": 3.0}
+        )
+        granted: list[str] = []
+
+        async def run(workspace: str) -> None:
+            await scheduler.acquire(workspace, timeout_seconds=1)
+            granted.append(workspace)
+
+        await scheduler.acquire("holder", timeout_seconds=1)
+        tasks = [asyncio.create_task(run(name)) for name in ("noisy", "noisy", "heavy", "heavy")]
+        await asyncio.sleep(0)
+
+        scheduler.release("holder")
+        for _ in range(4):
+            await asyncio.sleep(0)
+            scheduler.release(granted[-1])
+        await asyncio.gather(*tasks)
+        assert scheduler.in_flight == 0
+        return granted
+
+    # Each queued "heavy" request costs a third of the virtual time of a "noisy" one.
+    assert asyncio.run(scenario()) == ["heavy", "heavy", "noisy", "noisy"]
+
+
+def test_queue_timeout_and_full_queue_are_rejected() -> None:
+    async def scenario() -> None:
+        scheduler = FairScheduler(capacity=1, max_concurrency=1, max_queued=1)
+        await scheduler.acquire("a", timeout_seconds=1)
+
+        with pytest.raises(WorkspaceBusyError) as timed_out:
+            await scheduler.acquire("a", timeout_seconds=0.01)
+        assert timed_out.value.reason == "queue_timeout"
+        assert scheduler.queued("a") == 0
+
+        waiting = asyncio.create_task(scheduler.acquire("a", timeout_seconds=1))
+        await asyncio.sleep(0)
+        with pytest.raises(WorkspaceBusyError) as full:
+            await scheduler.acquire("a", timeout_seconds=1)
+        assert full.value.reason == "queue_full"
+
+        scheduler.release("a")
+        await waiting
+        scheduler.release("a")
+        assert scheduler.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_total_queue_is_bounded_across_workspaces() -> None:
+    async def scenario() -> None:
+        scheduler = FairScheduler(capacity=1, max_concurrency=1, max_queued=10, max_queued_total=1)
+        await scheduler.acquire("a", timeout_seconds=1)
+        waiting = asyncio.create_task(scheduler.acquire("b", timeout_seconds=1))
+        await asyncio.sleep(0)
+
+        with pytest.raises(WorkspaceBusyError) as full:
+            await scheduler.acquire("c", timeout_seconds=1)
+        assert full.value.reason == "queue_full"
+        assert scheduler.queued("c") == 0
+
+        scheduler.release("a")
+        await waiting
+        scheduler.release("b")
+        assert scheduler.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_workspace_over_quota_gets_429_with_retry_after(
+    client: TestClient, workspace_id: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    scheduler = FairScheduler(capacity=4, max_concurrency=1, max_queued=0)
+    asyncio.run(scheduler.acquire(workspace_id, timeout_seconds=1))
+    monkeypatch.setattr(workspace_scheduler, "workspace_scheduler", scheduler)
+    monkeypatch.setattr(settings, "workspace_scheduler_enabled", True)
+    before = _rejected("other", "queue_full")
+
+    response = client.get(f"/audit/events?workspace_id={workspace_id}")
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+    assert response.json()["detail"]["code"] == "WORKSPACE_BUSY"
+    # Workspaces without a configured quota or weight share one metric label.
+    assert _rejected("other", "queue_full") - before == 1
+    assert _rejected(workspace_id, "queue_full") == 0
+
+    monkeypatch.setattr(settings, "workspace_weights", {workspace_id: 2.0})
+    assert client.get(f"/audit/events?workspace_id={workspace_id}").status_code == 429
+    assert _rejected(workspace_id, "queue_full") == 1
+
+    scheduler.release(workspace_id)
+    assert client.get(f"/audit/events?workspace_id={workspace_id}").status_code == 200
+    assert scheduler.in_flight == 0
+
+
+def test_streamed_chain_export_holds_its_workspace_slot_until_the_body_is_sent(
+    client: TestClient, workspace_id: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    scheduler = FairScheduler(capacity=4, max_concurrency=1, max_queued=0)
+    monkeypatch.setattr(workspace_scheduler, "workspace_scheduler", scheduler)
+    monkeypatch.setattr(settings, "workspace_scheduler_enabled", True)
+    held_while_streaming: list[int] = []
+
+    def spy(db: Session, query: AuditIntegrityQueryParams) -> Iterator[Sequence[AuditEvent]]:
+        held_while_streaming.append(scheduler.workspace_in_flight(workspace_id))
+        yield from iter_audit_event_batches_for_chain_export(db, query)
+
+    monkeypatch.setattr(audit_routes, "iter_audit_event_batches_for_chain_export", spy)
+
+    response = client.get(f"/audit/export.ndjson?workspace_id={workspace_id}")
+
+    assert response.status_code == 200
+    assert held_while_streaming == [1]
+    assert scheduler.in_flight == 0
+
+
+def test_scheduler_is_off_by_default_and_a_lone_workspace_gets_the_whole_capacity() -> None:
+    assert Settings.model_fields["workspace_scheduler_enabled"].default is False
+    assert Settings.model_fields["workspace_max_concurrency"].default is None
+    assert workspace_scheduler.workspace_scheduler.quota("any") == (
+        settings.workspace_max_concurrency or settings.workspace_scheduler_capacity
+    )
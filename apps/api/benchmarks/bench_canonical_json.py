@@ -0,0 +1,81 @@
+"""Compare canonical JSON backends on realistic /verify and audit payload sizes.
+
+Run from apps/api: python -m benchmarks.bench_canonical_json
+"""
+
+import json
+import timeit
+from uuid import uuid4
+
+from app.modules.verify_engine.canonical_json import CANONICAL_JSON_BACKENDS, CanonicalEncoder
+
+
+def _envelope(item_count: int) -> dict[str, object]:
+    return {
+        "agent_id": str(uuid4()),
+        "workspace_id": str(uuid4()),
+        "action_type": "purchase",
+        "target_service": "stripe_proxy",
+        "payload": {
+            "amount": 18.5,
+            "currency": "EUR",
+            "tool": "purchase",
+            "items": [
+                {"sku": f"sku-{index}", "qty": index % 5 + 1, "price": 9.25, "name": "Café crème"}
+                for index in range(item_count)
+            ],
+        },
+        "capability_jti": str(uuid4()),
+    }
+
+
+def _audit_payload() -> dict[str, object]:
+    return {
+        "id": str(uuid4()),
+        "workspace_id": str(uuid4()),
+        "event_time": "2026-03-01T10:00:00.123456+00:00",
+        "event_type": "action.verification.allowed",
+        "actor_type": "system",
+        "actor_id": None,
+        "subject_type": "agent",
+        "subject_id": str(uuid4()),
+        "event_data": {"decision": "ALLOW", "reason_code": None, "jti": str(uuid4())},
+        "payload_hash": None,
+        "prev_hash": "sha256:" + "a" * 64,
+    }
+
+
+PAYLOADS: dict[str, dict[str, object]] = {
+    "audit_event_hash": _audit_payload(),
+    "verify_envelope_small": _envelope(0),
+    "verify_envelope_medium": _envelope(20),
+    "verify_envelope_large": _envelope(200),
+}
+
+
+def _best_microseconds(
+    encode: CanonicalEncoder, payload: dict[str, object], number: int
+) -> float:
+    timer = timeit.Timer(lambda: encode(payload))
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e6
+
+
+def main() -> None:
+    results: dict[str, dict[str, object]] = {}
+    for name, payload in PAYLOADS.items():
+        size = len(CANONICAL_JSON_BACKENDS["stdlib"](payload))
+        number = max(200, 200_000 // max(size, 1))
+        timings = {
+            backend: round(_best_microseconds(encode, payload, number), 3)
+            for backend, encode in sorted(CANONICAL_JSON_BACKENDS.items())
+        }
+        row: dict[str, object] = {"bytes": size, "us_per_call": timings}
+        if "orjson" in timings:
+            row["speedup"] = round(timings["stdlib"] / timings["orjson"], 2)
+        results[name] = row
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
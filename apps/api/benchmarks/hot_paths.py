@@ -0,0 +1,350 @@
+"""Micro-benchmarks for the /verify and audit hot paths, with regression baselines.
+
+Needs no Postgres or Redis. Run from apps/api:
+
+    python -m benchmarks.hot_paths                # print timings
+    python -m benchmarks.hot_paths --save         # write baselines/<machine>.json
+    python -m benchmarks.hot_paths --compare      # fail (exit 1) on regressions
+
+SDK benchmarks run when limiq_sdk is importable (`make bench` puts it on the path).
+Baselines are only comparable on the machine that produced them, so each file is
+named after a machine tag (OS, arch, CPU model, core count, Python version).
+"""
+
+import argparse
+import base64
+import json
+import os
+import platform
+import re
+import sys
+import timeit
+from collections.abc import Callable, Mapping
+from datetime import UTC, datetime, timedelta
+from hashlib import sha256
+from pathlib import Path
+from typing import Any
+from uuid import UUID, uuid4
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from nacl.signing import SigningKey
+
+# decode_capability_token needs a JWT key pair; generate one when none is configured.
+if not os.environ.get("KYA_JWT_PRIVATE_KEY_PEM"):
+    _jwt_key = Ed25519PrivateKey.generate()
+    os.environ["KYA_JWT_KID"] = os.environ.get("KYA_JWT_KID") or "bench-ed25519-key"
+    os.environ["KYA_JWT_PRIVATE_KEY_PEM"] = _jwt_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    os.environ["KYA_JWT_PUBLIC_KEY_PEM"] = (
+        _jwt_key.public_key()
+        .public_bytes(serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo)
+        .decode()
+    )
+
+from app.core.ed25519_verify import verify_ed25519_signature  # noqa: E402
+from app.core.jwt_tokens import (  # noqa: E402
+    build_capability_claims,
+    decode_capability_token,
+    encode_capability_token,
+)
+from app.core.responses import serialized_response  # noqa: E402
+from app.models.audit_event import AuditEvent  # noqa: E402
+from app.modules.audit_log.export_service import build_audit_csv  # noqa: E402
+from app.modules.audit_log.hash_chain import compute_audit_event_hash  # noqa: E402
+from app.modules.verify_engine.canonical_json import (  # noqa: E402
+    canonical_json_bytes,
+    get_canonical_json_backend,
+)
+from app.modules.verify_engine.policy_eval import (  # noqa: E402
+    policy_allows_payload_spend,
+    policy_allows_scope,
+    policy_allows_spend_request,
+    scopes_allow_action,
+)
+from app.schemas.audit import (  # noqa: E402
+    AUDIT_EVENT_LIST_ADAPTER,
+    AUDIT_EVENTS_PAGE_ADAPTER,
+    AuditEventsListResponse,
+)
+from benchmarks.bench_canonical_json import PAYLOADS  # noqa: E402
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+DEFAULT_TOLERANCE = 0.25
+
+# Target wall time per timing repeat; the best of REPEATS repeats is reported.
+_TARGET_REPEAT_SECONDS = 0.05
+_REPEATS = 7
+
+Benchmark = Callable[[], object]
+
+
+def _machine_tag() -> str:
+    cpu_model = platform.processor() or platform.machine()
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as handle:
+            for line in handle:
+                if line.startswith("model name"):
+                    cpu_model = line.split(":", 1)[1]
+                    break
+    except OSError:
+        pass
+
+    parts = [
+        platform.system(),
+        platform.machine(),
+        cpu_model,
+        f"{os.cpu_count() or 1}cpu",
+        f"{platform.python_implementation()}{sys.version_info.major}.{sys.version_info.minor}",
+    ]
+    return re.sub(r"[^a-z0-9.]+", "-", "-".join(parts).lower()).strip("-")
+
+
+def _audit_events(count: int) -> list[AuditEvent]:
+    workspace_id = uuid4()
+    start = datetime(2026, 3, 1, 10, 0, tzinfo=UTC)
+    return [
+        AuditEvent(
+            id=uuid4(),
+            workspace_id=workspace_id,
+            event_type="action.verification.allowed" if index % 3 else "action.verification.denied",
+            actor_type="system",
+            actor_id=None,
+            subject_type="agent",
+            subject_id=uuid4(),
+            event_time=start + timedelta(seconds=index),
+            event_data={"decision": "DENY", "reason_code": "SIGNATURE_INVALID"}
+            if index % 3 == 0
+            else {"decision": "ALLOW", "reason_code": None},
+            payload_hash=None,
+            prev_hash="sha256:" + "a" * 64,
+            event_hash="sha256:" + "b" * 64,
+        )
+        for index in range(count)
+    ]
+
+
+def _api_benchmarks() -> dict[str, Benchmark]:
+    envelope = PAYLOADS["verify_envelope_medium"]
+    audit_payload = PAYLOADS["audit_event_hash"]
+
+    signing_key = SigningKey.generate()
+    public_key_b64 = base64.b64encode(bytes(signing_key.verify_key)).decode()
+    message = sha256(canonical_json_bytes(envelope)).digest()
+    signature_b64 = base64.b64encode(signing_key.sign(message).signature).decode()
+
+    token = encode_capability_token(
+        build_capability_claims(
+            agent_id=uuid4(),
+            workspace_id=uuid4(),
+            scopes=["purchase"],
+            limits={"amount": 20, "currency": "EUR"},
+            policy_id=uuid4(),
+            policy_version=1,
+            jti=str(uuid4()),
+            ttl_minutes=30,
+        )
+    )
+
+    policy_json: dict[str, object] = {
+        "allowed_tools": ["purchase", "refund", "search"],
+        "spend": {"currency": "EUR", "max_per_tx": 50},
+        "rate_limits": {"max_actions_per_min": 10},
+    }
+    payload: dict[str, object] = {"amount": 18, "currency": "EUR", "tool": "purchase"}
+    audit_events = _audit_events(200)
+
+    event_id = UUID(str(audit_payload["id"]))
+    workspace_id = UUID(str(audit_payload["workspace_id"]))
+    subject_id = UUID(str(audit_payload["subject_id"]))
+    event_data = dict(audit_payload["event_data"])  # type: ignore[call-overload]
+    prev_hash = str(audit_payload["prev_hash"])
+
+    return {
+        "canonical_json_bytes.verify_envelope": lambda: canonical_json_bytes(envelope),
+        "compute_audit_event_hash": lambda: compute_audit_event_hash(
+            event_id=event_id,
+            workspace_id=workspace_id,
+            event_time="2026-03-01T10:00:00.123456+00:00",
+            event_type="action.verification.allowed",
+            actor_type="system",
+            actor_id=None,
+            subject_type="agent",
+            subject_id=subject_id,
+            event_data=event_data,
+            payload_hash=None,
+            prev_hash=prev_hash,
+        ),
+        "verify_ed25519_signature": lambda: verify_ed25519_signature(
+            public_key_b64=public_key_b64, message=message, signature_b64=signature_b64
+        ),
+        "decode_capability_token": lambda: decode_capability_token(token),
+        "policy_eval.scopes_allow_action": lambda: scopes_allow_action(
+            scopes=["purchase"], action_type="purchase", tool="purchase"
+        ),
+        "policy_eval.policy_allows_scope": lambda: policy_allows_scope(
+            policy_json=policy_json, requested_scopes=["purchase"]
+        ),
+        "policy_eval.policy_allows_spend_request": lambda: policy_allows_spend_request(
+            policy_json=policy_json, requested_limits={"amount": 20, "currency": "EUR"}
+        ),
+        "policy_eval.policy_allows_payload_spend": lambda: policy_allows_payload_spend(
+            policy_json=policy_json, payload=payload
+        ),
+        "build_audit_csv.200_events": lambda: build_audit_csv(audit_events),
+        "audit_events_response.200_events": lambda: serialized_response(
+            AUDIT_EVENTS_PAGE_ADAPTER,
+            AuditEventsListResponse(
+                items=AUDIT_EVENT_LIST_ADAPTER.validate_python(audit_events, from_attributes=True),
+                count=len(audit_events),
+                limit=200,
+                offset=0,
+            ),
+        ),
+    }
+
+
+def _sdk_benchmarks() -> dict[str, Benchmark]:
+    try:
+        from limiq_sdk import AgentSigner, build_signed_request, generate_keys, sign_action
+    except ImportError:
+        return {}
+
+    keys = generate_keys()
+    private_key = keys["private_key_base64"]
+    envelope = PAYLOADS["verify_envelope_medium"]
+    payload = dict(envelope["payload"])  # type: ignore[call-overload]
+    jti = str(uuid4())
+    claims = base64.urlsafe_b64encode(json.dumps({"jti": jti}).encode()).decode().rstrip("=")
+    capability_token = f"eyJhbGciOiJFZERTQSJ9.{claims}.c2ln"
+    signer = AgentSigner(private_key_base64=private_key)
+
+    return {
+        "sdk.sign_action": lambda: sign_action(
+            agent_id=str(envelope["agent_id"]),
+            workspace_id=str(envelope["workspace_id"]),
+            action_type="purchase",
+            target_service="stripe_proxy",
+            payload=payload,
+            capability_jti=jti,
+            private_key_base64=private_key,
+        ),
+        "sdk.AgentSigner.sign": lambda: signer.sign(
+            agent_id=str(envelope["agent_id"]),
+            workspace_id=str(envelope["workspace_id"]),
+            action_type="purchase",
+            target_service="stripe_proxy",
+            payload=payload,
+            capability_jti=jti,
+        ),
+        "sdk.build_signed_request": lambda: build_signed_request(
+            workspace_id=str(envelope["workspace_id"]),
+            agent_id=str(envelope["agent_id"]),
+            action_type="purchase",
+            target_service="stripe_proxy",
+            payload=payload,
+            capability_token=capability_token,
+            private_key_base64=private_key,
+        ),
+    }
+
+
+def benchmarks() -> dict[str, Benchmark]:
+    return {**_api_benchmarks(), **_sdk_benchmarks()}
+
+
+def measure(benchmark: Benchmark) -> float:
+    timer = timeit.Timer(benchmark)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * _TARGET_REPEAT_SECONDS / max(elapsed, 1e-9)))
+    return min(timer.repeat(repeat=_REPEATS, number=number)) / number * 1e6
+
+
+def run(selected: Mapping[str, Benchmark]) -> dict[str, float]:
+    return {name: round(measure(benchmark), 3) for name, benchmark in selected.items()}
+
+
+def compare(
+    baseline: Mapping[str, float], current: Mapping[str, float], tolerance: float
+) -> dict[str, dict[str, Any]]:
+    report: dict[str, dict[str, Any]] = {}
+    for name, us_per_call in current.items():
+        reference = baseline.get(name)
+        if reference is None:
+            report[name] = {"us_per_call": us_per_call, "status": "new"}
+            continue
+
+        ratio = us_per_call / reference if reference > 0 else 1.0
+        if ratio > 1 + tolerance:
+            status = "regressed"
+        elif ratio < 1 - tolerance:
+            status = "improved"
+        else:
+            status = "ok"
+        report[name] = {
+            "us_per_call": us_per_call,
+            "baseline_us_per_call": reference,
+            "ratio": round(ratio, 3),
+            "status": status,
+        }
+
+    for name in baseline.keys() - current.keys():
+        report[name] = {"baseline_us_per_call": baseline[name], "status": "missing"}
+    return report
+
+
+def _baseline_path(baseline_dir: Path, machine: str) -> Path:
+    return baseline_dir / f"{machine}.json"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.hot_paths")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--save", action="store_true", help="Write the baseline for this machine")
+    mode.add_argument("--compare", action="store_true", help="Compare against this machine")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--baseline-dir", type=Path, default=BASELINE_DIR)
+    parser.add_argument("--filter", default="", help="Only run benchmarks containing this text")
+    args = parser.parse_args(argv)
+
+    machine = _machine_tag()
+    selected = {name: fn for name, fn in benchmarks().items() if args.filter in name}
+    results = run(selected)
+    baseline_path = _baseline_path(args.baseline_dir, machine)
+
+    if args.save:
+        args.baseline_dir.mkdir(parents=True, exist_ok=True)
+        document = {
+            "machine": machine,
+            "python": platform.python_version(),
+            "canonical_json_backend": get_canonical_json_backend(),
+            "created_at": datetime.now(tz=UTC).isoformat(),
+            "us_per_call": results,
+        }
+        baseline_path.write_text(json.dumps(document, indent=2, sort_keys=True) + "\n")
+        print(json.dumps({"machine": machine, "saved": str(baseline_path)}, indent=2))
+        return 0
+
+    if args.compare:
+        if not baseline_path.exists():
+            print(f"No baseline for machine {machine} at {baseline_path}", file=sys.stderr)
+            return 2
+        baseline = json.loads(baseline_path.read_text())
+        reference = {
+            name: value for name, value in baseline["us_per_call"].items() if args.filter in name
+        }
+        report = compare(reference, results, args.tolerance)
+        summary = {"machine": machine, "tolerance": args.tolerance, "results": report}
+        print(json.dumps(summary, indent=2))
+        regressed = [name for name, row in report.items() if row["status"] == "regressed"]
+        return 1 if regressed else 0
+
+    print(json.dumps({"machine": machine, "us_per_call": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
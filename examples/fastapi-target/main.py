@@ -1,9 +1,18 @@
+import asyncio
 import os
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Annotated
 
-import httpx
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Request
+from limiq_sdk import ActionGuard, AsyncLimiqClient, CircuitBreakerPolicy
+from limiq_sdk.fastapi import VerifiedAction, verified_action
 from pydantic import BaseModel, Field
 
+KYA_BASE_URL = os.getenv("KYA_BASE_URL", "http://localhost:8000")
+KYA_VERIFY_TIMEOUT_SECONDS = float(os.getenv("KYA_VERIFY_TIMEOUT_SECONDS", "1.0"))
+KYA_FAIL_OPEN = os.getenv("KYA_FAIL_OPEN", "false").lower() == "true"
+
 
 class VerifyPayload(BaseModel):
     workspace_id: str
@@ -16,58 +25,83 @@ class VerifyPayload(BaseModel):
     request_context: dict[str, object] = Field(default_factory=dict)
 
 
-app = FastAPI(title="Limiq.io FastAPI Target Example")
-KYA_BASE_URL = os.getenv("KYA_BASE_URL", "http://localhost:8000")
+# One pooled client and guard per workspace, created on first use and kept for the
+# process: connections to Limiq.io stay open between purchases instead of being set
+# up for each one. Verify calls are sent as the action's own workspace, and a
+# throttled or failing workspace does not affect the guard of another.
+_guards: dict[str, ActionGuard] = {}
+_clients: list[AsyncLimiqClient] = []
+_dependencies: dict[str, Callable[[Request], Awaitable[VerifiedAction]]] = {}
+
+
+def _verifier_for(workspace_id: str) -> Callable[[Request], Awaitable[VerifiedAction]]:
+    dependency = _dependencies.get(workspace_id)
+    if dependency is None:
+        client = AsyncLimiqClient(base_url=KYA_BASE_URL, workspace_id=workspace_id)
+        guard = ActionGuard(
+            client,
+            timeout_seconds=KYA_VERIFY_TIMEOUT_SECONDS,
+            fail_open=KYA_FAIL_OPEN,
+            circuit_breaker=CircuitBreakerPolicy(failure_threshold=5, reset_timeout_seconds=10),
+        )
+        _clients.append(client)
+        _guards[workspace_id] = guard
+        dependency = _dependencies[workspace_id] = verified_action(guard)
+    return dependency
 
 
-def _safe_json(resp: httpx.Response) -> dict[str, object]:
+async def verified(request: Request) -> VerifiedAction:
     try:
-        payload = resp.json()
+        body = await request.json()
     except ValueError:
-        return {"raw": resp.text}
+        raise HTTPException(
+            status_code=400,
+            detail={"code": "INVALID_JSON", "message": "Request body must be JSON"},
+        ) from None
+    workspace_id = body.get("workspace_id") if isinstance(body, dict) else None
+    if not isinstance(workspace_id, str) or not workspace_id:
+        raise HTTPException(
+            status_code=422,
+            detail={"code": "VALIDATION_ERROR", "message": "workspace_id is required"},
+        )
+    return await _verifier_for(workspace_id)(request)
+
+
+Verified = Annotated[VerifiedAction, Depends(verified)]
+
 
-    if isinstance(payload, dict):
-        return payload
-    return {"raw": payload}
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    yield
+    await asyncio.gather(*(client.aclose() for client in _clients))
+
+
+app = FastAPI(title="Limiq.io FastAPI Target Example", lifespan=lifespan)
 
 
 @app.get("/health")
 async def health() -> dict[str, object]:
-    return {"ok": True, "service": "fastapi-target", "kya_base_url": KYA_BASE_URL}
+    return {
+        "ok": True,
+        "service": "fastapi-target",
+        "kya_base_url": KYA_BASE_URL,
+        "verify_circuits": {
+            workspace_id: guard.circuit_state for workspace_id, guard in _guards.items()
+        },
+    }
 
 
-@app.post("/purchase")
-async def purchase(data: VerifyPayload) -> dict[str, object]:
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            verify_resp = await client.post(
-                f"{KYA_BASE_URL}/verify",
-                headers={"X-Workspace-Id": data.workspace_id},
-                json=data.model_dump(),
-            )
-    except httpx.TimeoutException as exc:
-        raise HTTPException(status_code=504, detail={"error": "Limiq.io verify timeout"}) from exc
-    except httpx.RequestError as exc:
-        raise HTTPException(status_code=502, detail={"error": "Limiq.io verify unreachable"}) from exc
-
-    verify_payload = _safe_json(verify_resp)
-    if verify_resp.status_code >= 500:
-        raise HTTPException(
-            status_code=502,
-            detail={"error": "Limiq.io verify upstream error", "upstream": verify_payload},
-        )
-    if verify_resp.status_code >= 400:
-        raise HTTPException(
-            status_code=verify_resp.status_code,
-            detail={"error": "Limiq.io verify request rejected", "upstream": verify_payload},
-        )
+@app.get("/metrics/verify")
+async def verify_metrics() -> dict[str, object]:
+    return {workspace_id: dict(vars(guard.stats())) for workspace_id, guard in _guards.items()}
 
-    decision = verify_payload.get("decision")
-    if decision != "ALLOW":
-        raise HTTPException(status_code=403, detail=verify_payload)
 
+@app.post("/purchase")
+async def purchase(data: VerifyPayload, verified: Verified) -> dict[str, object]:
+    # Only reached on ALLOW: DENY is answered with 403, an unavailable verifier with 503.
     return {
         "ok": True,
         "executed": True,
-        "audit_event_id": verify_payload.get("audit_event_id"),
+        "amount": data.payload.get("amount"),
+        "audit_event_id": verified.outcome.audit_event_id,
     }
@@ -1,25 +1,49 @@
+from limiq_sdk.audit_verify import verify_audit_chain
+from limiq_sdk.batching import VerifyBatcher
 from limiq_sdk.canonical import canonicalize
+from limiq_sdk.capabilities import AsyncCapabilityManager, CapabilityManager
 from limiq_sdk.client import (
     AsyncLimiqClient,
     LimiqClient,
     build_signed_request,
 )
 from limiq_sdk.crypto import (
+    AgentSigner,
     extract_capability_jti,
     generate_keys,
     sha256_hex,
     sign_action,
     verify_signature,
 )
+from limiq_sdk.guard import ActionGuard, CircuitBreakerPolicy, GuardOutcome, GuardStats
+from limiq_sdk.local import LocalVerifier, StaleStateError
+from limiq_sdk.resilience import DeadlineExceeded, HedgePolicy, RetryPolicy
+from limiq_sdk.tokens import CapabilityTokenError, CapabilityTokenVerifier
 
 __all__ = [
     "canonicalize",
     "generate_keys",
     "sha256_hex",
     "sign_action",
+    "AgentSigner",
     "verify_signature",
     "extract_capability_jti",
     "build_signed_request",
     "LimiqClient",
     "AsyncLimiqClient",
+    "VerifyBatcher",
+    "RetryPolicy",
+    "HedgePolicy",
+    "DeadlineExceeded",
+    "ActionGuard",
+    "CircuitBreakerPolicy",
+    "GuardOutcome",
+    "GuardStats",
+    "LocalVerifier",
+    "StaleStateError",
+    "CapabilityTokenVerifier",
+    "CapabilityTokenError",
+    "CapabilityManager",
+    "AsyncCapabilityManager",
+    "verify_audit_chain",
 ]
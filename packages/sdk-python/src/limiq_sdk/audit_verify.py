@@ -0,0 +1,322 @@
+import argparse
+import gzip
+import hashlib
+import json
+import mmap
+import os
+import sys
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal
+
+from limiq_sdk.canonical import canonicalize
+from limiq_sdk.types import AuditIntegrityResult
+
+ChainStatus = Literal["OK", "BROKEN", "PARTIAL"]
+
+# Minimum number of bytes per worker chunk when splitting a single NDJSON file.
+_MIN_CHUNK_BYTES = 1 << 20
+
+_EXIT_CODES: dict[str, int] = {"OK": 0, "BROKEN": 1, "PARTIAL": 3}
+
+
+@dataclass(frozen=True)
+class _ChunkTask:
+    path: str
+    start: int | None = None
+    end: int | None = None
+
+
+@dataclass(frozen=True)
+class _ChunkFailure:
+    index: int
+    status: ChainStatus
+    event_id: str | None
+    message: str
+
+
+@dataclass(frozen=True)
+class _ChunkResult:
+    count: int
+    workspace_id: str | None
+    first_event_id: str | None
+    first_prev_hash: str | None
+    last_event_hash: str | None
+    failure: _ChunkFailure | None
+
+
+def compute_audit_event_hash(record: dict[str, Any]) -> str:
+    # Mirrors app.modules.audit_log.hash_chain.compute_audit_event_hash.
+    payload = {
+        "id": record["id"],
+        "workspace_id": record["workspace_id"],
+        "event_time": record["event_time"],
+        "event_type": record["event_type"],
+        "actor_type": record["actor_type"],
+        "actor_id": record.get("actor_id"),
+        "subject_type": record["subject_type"],
+        "subject_id": record.get("subject_id"),
+        "event_data": record["event_data"],
+        "payload_hash": record.get("payload_hash"),
+        "prev_hash": record.get("prev_hash"),
+    }
+    digest = hashlib.sha256(canonicalize(payload).encode("utf-8")).hexdigest()
+    return f"sha256:{digest}"
+
+
+def _verify_records(lines: Iterable[bytes]) -> _ChunkResult:
+    count = 0
+    workspace_id: str | None = None
+    first_event_id: str | None = None
+    first_prev_hash: str | None = None
+    previous_hash: str | None = None
+
+    for line in lines:
+        if not line.strip():
+            continue
+
+        record = json.loads(line)
+        event_id = str(record["id"])
+        prev_hash = record.get("prev_hash")
+        event_hash = record.get("event_hash")
+
+        if count == 0:
+            workspace_id = str(record["workspace_id"])
+            first_event_id = event_id
+            first_prev_hash = prev_hash
+        elif prev_hash != previous_hash:
+            return _ChunkResult(
+                count=count,
+                workspace_id=workspace_id,
+                first_event_id=first_event_id,
+                first_prev_hash=first_prev_hash,
+                last_event_hash=previous_hash,
+                failure=_ChunkFailure(count, "BROKEN", event_id, "Chain mismatch"),
+            )
+
+        if event_hash is None:
+            return _ChunkResult(
+                count=count,
+                workspace_id=workspace_id,
+                first_event_id=first_event_id,
+                first_prev_hash=first_prev_hash,
+                last_event_hash=previous_hash,
+                failure=_ChunkFailure(
+                    count,
+                    "PARTIAL",
+                    None,
+                    "Missing event_hash in selected range; full continuity not proven",
+                ),
+            )
+
+        if event_hash != compute_audit_event_hash(record):
+            return _ChunkResult(
+                count=count,
+                workspace_id=workspace_id,
+                first_event_id=first_event_id,
+                first_prev_hash=first_prev_hash,
+                last_event_hash=previous_hash,
+                failure=_ChunkFailure(count, "BROKEN", event_id, "Chain mismatch"),
+            )
+
+        previous_hash = event_hash
+        count += 1
+
+    return _ChunkResult(
+        count=count,
+        workspace_id=workspace_id,
+        first_event_id=first_event_id,
+        first_prev_hash=first_prev_hash,
+        last_event_hash=previous_hash,
+        failure=None,
+    )
+
+
+def _iter_lines(mapped: mmap.mmap, start: int, end: int) -> Iterator[bytes]:
+    position = start
+    while position < end:
+        newline = mapped.find(b"\n", position, end)
+        stop = end if newline == -1 else newline
+        yield mapped[position:stop]
+        position = stop + 1
+
+
+def _verify_chunk(task: _ChunkTask) -> _ChunkResult:
+    if task.path.endswith(".gz"):
+        with gzip.open(task.path, "rb") as handle:
+            return _verify_records(handle)
+
+    with open(task.path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return _verify_records([])
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            start = task.start or 0
+            end = task.end if task.end is not None else len(mapped)
+            return _verify_records(_iter_lines(mapped, start, end))
+
+
+def _split_file(path: Path, parts: int) -> list[_ChunkTask]:
+    size = path.stat().st_size
+    parts = max(1, min(parts, size // _MIN_CHUNK_BYTES))
+    if parts == 1:
+        return [_ChunkTask(str(path))]
+
+    tasks: list[_ChunkTask] = []
+    with open(path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        for part in range(1, parts):
+            boundary = mm.find(b"\n", max(start, size * part // parts))
+            if boundary == -1:
+                break
+            tasks.append(_ChunkTask(str(path), start, boundary + 1))
+            start = boundary + 1
+        if start < size:
+            tasks.append(_ChunkTask(str(path), start, size))
+    return tasks
+
+
+def _collect_tasks(source: Path, workers: int) -> list[_ChunkTask]:
+    if source.is_dir():
+        shards = sorted(
+            path
+            for path in source.iterdir()
+            if path.is_file() and path.name.endswith((".ndjson", ".ndjson.gz"))
+        )
+        return [_ChunkTask(str(shard)) for shard in shards]
+
+    if source.name.endswith(".gz"):
+        return [_ChunkTask(str(source))]
+
+    return _split_file(source, workers)
+
+
+def _result(
+    *,
+    workspace_id: str | None,
+    status: ChainStatus,
+    checked_count: int,
+    broken_at_event_id: str | None,
+    message: str,
+) -> AuditIntegrityResult:
+    return {
+        "workspace_id": workspace_id,
+        "status": status,
+        "checked_count": checked_count,
+        "broken_at_event_id": broken_at_event_id,
+        "message": message,
+    }
+
+
+def _stitch(chunks: Sequence[_ChunkResult], *, windowed: bool) -> AuditIntegrityResult:
+    non_empty = [chunk for chunk in chunks if chunk.first_event_id is not None]
+    if not non_empty:
+        return _result(
+            workspace_id=None,
+            status="OK",
+            checked_count=0,
+            broken_at_event_id=None,
+            message="No events in selected range",
+        )
+
+    workspace_id = non_empty[0].workspace_id
+    # Same rule as /audit/integrity/check: only an export requested with a `from`
+    # bound may start mid-chain, and then continuity is checked but cannot be proven.
+    # Otherwise the first event must be the genesis event.
+    is_partial_window = windowed and non_empty[0].first_prev_hash is not None
+    expected_prev_hash = non_empty[0].first_prev_hash if is_partial_window else None
+    checked = 0
+
+    for chunk in non_empty:
+        if chunk.first_prev_hash != expected_prev_hash:
+            return _result(
+                workspace_id=workspace_id,
+                status="BROKEN",
+                checked_count=checked + 1,
+                broken_at_event_id=chunk.first_event_id,
+                message="Chain mismatch",
+            )
+
+        if chunk.failure is not None:
+            return _result(
+                workspace_id=workspace_id,
+                status=chunk.failure.status,
+                checked_count=checked + chunk.failure.index + 1,
+                broken_at_event_id=chunk.failure.event_id,
+                message=chunk.failure.message,
+            )
+
+        checked += chunk.count
+        expected_prev_hash = chunk.last_event_hash
+
+    if is_partial_window:
+        return _result(
+            workspace_id=workspace_id,
+            status="PARTIAL",
+            checked_count=checked,
+            broken_at_event_id=None,
+            message="Window starts mid-chain; full continuity not proven",
+        )
+
+    return _result(
+        workspace_id=workspace_id,
+        status="OK",
+        checked_count=checked,
+        broken_at_event_id=None,
+        message="Hash chain valid",
+    )
+
+
+def verify_audit_chain(
+    source: str | Path, *, workers: int | None = None, windowed: bool = False
+) -> AuditIntegrityResult:
+    worker_count = workers or os.cpu_count() or 1
+    tasks = _collect_tasks(Path(source), worker_count)
+
+    if worker_count == 1 or len(tasks) <= 1:
+        chunks = [_verify_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(worker_count, len(tasks))) as pool:
+            chunks = list(pool.map(_verify_chunk, tasks))
+
+    return _stitch(chunks, windowed=windowed)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="limiq-audit-verify",
+        description=(
+            "Verify a Limiq.io audit hash chain exported from /audit/export.ndjson. "
+            "Accepts a single NDJSON file or a directory of NDJSON/gzip shards "
+            "(verified in lexicographic filename order)."
+        ),
+    )
+    parser.add_argument("source", help="NDJSON export file or directory of shards")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: all cores)",
+    )
+    parser.add_argument(
+        "--windowed",
+        action="store_true",
+        help=(
+            "The export was requested with a `from` bound: report PARTIAL instead of "
+            "BROKEN when it starts mid-chain"
+        ),
+    )
+    args = parser.parse_args(argv)
+
+    source = Path(args.source)
+    if not source.exists():
+        parser.error(f"source not found: {source}")
+
+    result = verify_audit_chain(source, workers=args.workers, windowed=args.windowed)
+    sys.stdout.write(json.dumps(result) + "\n")
+    return _EXIT_CODES[result["status"]]
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
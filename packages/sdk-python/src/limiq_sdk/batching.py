@@ -0,0 +1,91 @@
+import asyncio
+
+from limiq_sdk.client import MAX_VERIFY_BATCH_SIZE, AsyncLimiqClient
+from limiq_sdk.types import VerifyRequestBody, VerifyResponse
+
+_Pending = tuple[VerifyRequestBody, "asyncio.Future[VerifyResponse]"]
+
+
+# Opt-in micro-batching for AsyncLimiqClient.verify_action. Calls are collected
+# for up to max_delay_seconds (or until max_batch_size is reached) and each batch
+# is sent as one POST /verify/batch, so it costs the API one request, one
+# admission slot and one database session instead of one per call. At most
+# max_in_flight batches are outstanding. A failed batch fails each of its callers.
+class VerifyBatcher:
+    def __init__(
+        self,
+        client: AsyncLimiqClient,
+        *,
+        max_batch_size: int = 32,
+        max_delay_seconds: float = 0.002,
+        max_in_flight: int = 4,
+    ) -> None:
+        if not 1 <= max_batch_size <= MAX_VERIFY_BATCH_SIZE:
+            raise ValueError(f"max_batch_size must be between 1 and {MAX_VERIFY_BATCH_SIZE}")
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be >= 1")
+
+        self._client = client
+        self._max_batch_size = max_batch_size
+        self._max_delay_seconds = max_delay_seconds
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._pending: list[_Pending] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._batches: set[asyncio.Task[None]] = set()
+        self._closed = False
+
+    async def __aenter__(self) -> "VerifyBatcher":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        self._closed = True
+        self.flush()
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+
+    async def verify_action(self, payload: VerifyRequestBody) -> VerifyResponse:
+        if self._closed:
+            raise RuntimeError("VerifyBatcher is closed")
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[VerifyResponse] = loop.create_future()
+        self._pending.append((payload, future))
+        if len(self._pending) >= self._max_batch_size:
+            self.flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._max_delay_seconds, self.flush)
+        return await future
+
+    def flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        task = asyncio.get_running_loop().create_task(self._send_batch(batch))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _send_batch(self, batch: list[_Pending]) -> None:
+        async with self._in_flight:
+            # Callers cancelled while the batch waited are not sent.
+            batch = [(payload, future) for payload, future in batch if not future.done()]
+            if not batch:
+                return
+            try:
+                results = await self._client.verify_batch([payload for payload, _ in batch])
+                if len(results) != len(batch):
+                    raise ValueError("verify batch returned a different number of results")
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                return
+        for (_, future), result in zip(batch, results, strict=True):
+            if not future.done():
+                future.set_result(result)
@@ -1,7 +1,86 @@
 import json
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None  # type: ignore[assignment]
+
+# Reference form shared with the API: json.dumps(sort_keys=True,
+# separators=(",", ":"), ensure_ascii=False). Every backend must match it exactly.
+_STDLIB_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+_ORJSON_MAX_DEPTH = 254
+_ORJSON_MIN_INT = -(1 << 63)
+_ORJSON_MAX_INT = (1 << 64) - 1
+
+
+def _stdlib_canonicalize(payload: Mapping[str, Any]) -> str:
+    return _STDLIB_ENCODER.encode(payload)
+
+
+def _orjson_compatible(value: Any, depth: int = 0) -> bool:
+    # Same guard as the API: orjson differs from json.dumps on float exponents,
+    # non-str keys, big integers and natively supported types such as UUID.
+    kind = type(value)
+    if kind is str or kind is bool or value is None:
+        return True
+    if kind is dict:
+        if depth >= _ORJSON_MAX_DEPTH:
+            return False
+        for key, item in value.items():
+            if type(key) is not str:
+                return False
+            if type(item) is not str and not _orjson_compatible(item, depth + 1):
+                return False
+        return True
+    if kind is list or kind is tuple:
+        if depth >= _ORJSON_MAX_DEPTH:
+            return False
+        for item in value:
+            if type(item) is not str and not _orjson_compatible(item, depth + 1):
+                return False
+        return True
+    if kind is int:
+        return bool(_ORJSON_MIN_INT <= value <= _ORJSON_MAX_INT)
+    if kind is float:
+        return bool(value == 0.0 or 1e-4 <= abs(value) < 1e16)
+    if isinstance(value, str):
+        return True
+    if isinstance(value, int):
+        return _ORJSON_MIN_INT <= value <= _ORJSON_MAX_INT
+    return False
+
+
+def _orjson_canonicalize(payload: Mapping[str, Any]) -> str:
+    if orjson is None or not _orjson_compatible(payload):
+        return _stdlib_canonicalize(payload)
+    try:
+        return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS).decode("utf-8")
+    except orjson.JSONEncodeError:
+        return _stdlib_canonicalize(payload)
+
+
+CANONICAL_BACKENDS: dict[str, Callable[[Mapping[str, Any]], str]] = {
+    "stdlib": _stdlib_canonicalize,
+}
+if orjson is not None:
+    CANONICAL_BACKENDS["orjson"] = _orjson_canonicalize
+
+_active_backend = "orjson" if "orjson" in CANONICAL_BACKENDS else "stdlib"
+
+
+def get_canonical_backend() -> str:
+    return _active_backend
+
+
+def set_canonical_backend(name: str) -> None:
+    global _active_backend
+    if name not in CANONICAL_BACKENDS:
+        raise ValueError(f"Unavailable canonical backend: {name}")
+    _active_backend = name
+
 
 def canonicalize(payload: Mapping[str, Any]) -> str:
-    return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return CANONICAL_BACKENDS[_active_backend](payload)
@@ -0,0 +1,435 @@
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import Future
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from limiq_sdk.canonical import canonicalize
+from limiq_sdk.client import AsyncLimiqClient, LimiqClient, build_signed_request
+from limiq_sdk.types import CapabilityRequestBody, CapabilityResponse, VerifyRequestBody
+
+logger = logging.getLogger("limiq_sdk.capabilities")
+
+
+@dataclass(frozen=True)
+class CapabilityKey:
+    agent_id: str
+    action: str
+    target_service: str
+    scopes: tuple[str, ...]
+    limits: str
+
+
+@dataclass(frozen=True)
+class _CachedCapability:
+    capability: CapabilityResponse
+    # Monotonic-clock deadlines, derived from the server lifetime (expires_at -
+    # issued_at) so client/server clock skew does not matter.
+    expires_at: float
+    refresh_at: float
+
+
+def capability_key(
+    *,
+    agent_id: str,
+    action: str,
+    target_service: str,
+    scopes: Sequence[str] | None = None,
+    limits: Mapping[str, Any] | None = None,
+) -> CapabilityKey:
+    return CapabilityKey(
+        agent_id=agent_id,
+        action=action,
+        target_service=target_service,
+        scopes=tuple(sorted(set(scopes if scopes is not None else [action]))),
+        limits=canonicalize(dict(limits or {})),
+    )
+
+
+def _parse_timestamp(value: str) -> float:
+    return datetime.fromisoformat(value).timestamp()
+
+
+class _CapabilityCache:
+    # State and timing rules shared by the sync and async managers.
+    def __init__(
+        self,
+        *,
+        workspace_id: str,
+        ttl_minutes: int,
+        refresh_before_ratio: float,
+        jitter_ratio: float,
+        min_remaining_seconds: float,
+        clock: Callable[[], float],
+    ) -> None:
+        if not 0.0 <= refresh_before_ratio < 1.0:
+            raise ValueError("refresh_before_ratio must be in [0, 1)")
+        if not 0.0 <= jitter_ratio < 1.0 - refresh_before_ratio:
+            raise ValueError("jitter_ratio must be in [0, 1 - refresh_before_ratio)")
+
+        self._workspace_id = workspace_id
+        self._ttl_minutes = ttl_minutes
+        self._refresh_before_ratio = refresh_before_ratio
+        self._jitter_ratio = jitter_ratio
+        self._min_remaining_seconds = min_remaining_seconds
+        self._clock = clock
+        self._random = random.Random()
+        self._entries: dict[CapabilityKey, _CachedCapability] = {}
+        # Keys read since their last issuance; idle keys are left to expire
+        # instead of being refreshed forever.
+        self._used: set[CapabilityKey] = set()
+
+    def _request_body(self, key: CapabilityKey) -> CapabilityRequestBody:
+        return {
+            "workspace_id": self._workspace_id,
+            "agent_id": key.agent_id,
+            "action": key.action,
+            "target_service": key.target_service,
+            "requested_scopes": list(key.scopes),
+            "requested_limits": json.loads(key.limits),
+            "ttl_minutes": self._ttl_minutes,
+        }
+
+    def _lookup(self, key: CapabilityKey) -> CapabilityResponse | None:
+        entry = self._entries.get(key)
+        if entry is None or self._clock() >= entry.expires_at - self._min_remaining_seconds:
+            return None
+        self._used.add(key)
+        return entry.capability
+
+    def _store(self, key: CapabilityKey, capability: CapabilityResponse) -> _CachedCapability:
+        now = self._clock()
+        lifetime = max(
+            0.0,
+            _parse_timestamp(capability["expires_at"]) - _parse_timestamp(capability["issued_at"]),
+        )
+        refresh_in = lifetime * (1.0 - self._refresh_before_ratio)
+        refresh_in -= self._random.uniform(0.0, lifetime * self._jitter_ratio)
+        entry = _CachedCapability(
+            capability=capability,
+            expires_at=now + lifetime,
+            refresh_at=now + max(0.0, refresh_in),
+        )
+        self._entries[key] = entry
+        self._used.discard(key)
+        return entry
+
+    def _retry_delay(self, key: CapabilityKey) -> float | None:
+        # After a failed background refresh, retry halfway to expiry while the
+        # current token is still usable; otherwise the next caller reissues.
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        remaining = entry.expires_at - self._min_remaining_seconds - self._clock()
+        if remaining <= 1.0:
+            return None
+        return remaining / 2
+
+
+# Caches capability tokens per (agent, action, target service, scopes, limits).
+# Tokens in use are refreshed on a background timer before they expire, with
+# jitter so a fleet of agents does not stampede the issuer, and concurrent misses
+# for the same key share a single issuance.
+class CapabilityManager(_CapabilityCache):
+    def __init__(
+        self,
+        client: LimiqClient,
+        *,
+        ttl_minutes: int = 15,
+        refresh_before_ratio: float = 0.2,
+        jitter_ratio: float = 0.1,
+        min_remaining_seconds: float = 5.0,
+        background_refresh: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(
+            workspace_id=client.workspace_id,
+            ttl_minutes=ttl_minutes,
+            refresh_before_ratio=refresh_before_ratio,
+            jitter_ratio=jitter_ratio,
+            min_remaining_seconds=min_remaining_seconds,
+            clock=clock,
+        )
+        self._client = client
+        self._background_refresh = background_refresh
+        self._lock = threading.Lock()
+        self._inflight: dict[CapabilityKey, Future[CapabilityResponse]] = {}
+        self._timers: dict[CapabilityKey, threading.Timer] = {}
+        self._closed = False
+
+    def __enter__(self) -> "CapabilityManager":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            timers = list(self._timers.values())
+            self._timers.clear()
+        for timer in timers:
+            timer.cancel()
+
+    def get_capability(
+        self,
+        *,
+        agent_id: str,
+        action: str,
+        target_service: str,
+        scopes: Sequence[str] | None = None,
+        limits: Mapping[str, Any] | None = None,
+    ) -> CapabilityResponse:
+        key = capability_key(
+            agent_id=agent_id,
+            action=action,
+            target_service=target_service,
+            scopes=scopes,
+            limits=limits,
+        )
+        with self._lock:
+            cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        return self._issue(key)
+
+    def invalidate(self, key: CapabilityKey) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._used.discard(key)
+            timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+    def build_signed_request(
+        self,
+        *,
+        agent_id: str,
+        action_type: str,
+        target_service: str,
+        payload: dict[str, Any],
+        private_key_base64: str,
+        scopes: Sequence[str] | None = None,
+        limits: Mapping[str, Any] | None = None,
+        request_context: dict[str, Any] | None = None,
+    ) -> VerifyRequestBody:
+        capability = self.get_capability(
+            agent_id=agent_id,
+            action=action_type,
+            target_service=target_service,
+            scopes=scopes,
+            limits=limits,
+        )
+        return build_signed_request(
+            workspace_id=self._workspace_id,
+            agent_id=agent_id,
+            action_type=action_type,
+            target_service=target_service,
+            payload=payload,
+            capability_token=capability["token"],
+            private_key_base64=private_key_base64,
+            request_context=request_context,
+        )
+
+    def _issue(self, key: CapabilityKey) -> CapabilityResponse:
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if future is None:
+                future = Future()
+                self._inflight[key] = future
+        if not owner:
+            return future.result()
+
+        try:
+            capability = self._client.request_capability(self._request_body(key))
+        except BaseException as exc:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(exc)
+            raise
+
+        with self._lock:
+            entry = self._store(key, capability)
+            self._inflight.pop(key, None)
+            self._schedule_locked(key, entry.refresh_at - self._clock())
+        future.set_result(capability)
+        return capability
+
+    def _schedule_locked(self, key: CapabilityKey, delay: float) -> None:
+        if not self._background_refresh or self._closed:
+            return
+        previous = self._timers.pop(key, None)
+        if previous is not None:
+            previous.cancel()
+        timer = threading.Timer(max(0.0, delay), self._refresh, args=(key,))
+        timer.daemon = True
+        self._timers[key] = timer
+        timer.start()
+
+    def _refresh(self, key: CapabilityKey) -> None:
+        with self._lock:
+            self._timers.pop(key, None)
+            if self._closed or key not in self._used:
+                return
+        try:
+            self._issue(key)
+        except Exception:
+            logger.warning("capability_refresh_failed", exc_info=True)
+            with self._lock:
+                delay = self._retry_delay(key)
+                if delay is not None:
+                    self._schedule_locked(key, delay)
+
+
+class AsyncCapabilityManager(_CapabilityCache):
+    def __init__(
+        self,
+        client: AsyncLimiqClient,
+        *,
+        ttl_minutes: int = 15,
+        refresh_before_ratio: float = 0.2,
+        jitter_ratio: float = 0.1,
+        min_remaining_seconds: float = 5.0,
+        background_refresh: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(
+            workspace_id=client.workspace_id,
+            ttl_minutes=ttl_minutes,
+            refresh_before_ratio=refresh_before_ratio,
+            jitter_ratio=jitter_ratio,
+            min_remaining_seconds=min_remaining_seconds,
+            clock=clock,
+        )
+        self._client = client
+        self._background_refresh = background_refresh
+        self._inflight: dict[CapabilityKey, asyncio.Task[CapabilityResponse]] = {}
+        self._refresh_tasks: dict[CapabilityKey, asyncio.Task[None]] = {}
+        self._closed = False
+
+    async def __aenter__(self) -> "AsyncCapabilityManager":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        self._closed = True
+        tasks = [*self._refresh_tasks.values(), *self._inflight.values()]
+        self._refresh_tasks.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def get_capability(
+        self,
+        *,
+        agent_id: str,
+        action: str,
+        target_service: str,
+        scopes: Sequence[str] | None = None,
+        limits: Mapping[str, Any] | None = None,
+    ) -> CapabilityResponse:
+        key = capability_key(
+            agent_id=agent_id,
+            action=action,
+            target_service=target_service,
+            scopes=scopes,
+            limits=limits,
+        )
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        return await self._issue(key)
+
+    def invalidate(self, key: CapabilityKey) -> None:
+        self._entries.pop(key, None)
+        self._used.discard(key)
+        task = self._refresh_tasks.pop(key, None)
+        if task is not None:
+            task.cancel()
+
+    async def build_signed_request(
+        self,
+        *,
+        agent_id: str,
+        action_type: str,
+        target_service: str,
+        payload: dict[str, Any],
+        private_key_base64: str,
+        scopes: Sequence[str] | None = None,
+        limits: Mapping[str, Any] | None = None,
+        request_context: dict[str, Any] | None = None,
+    ) -> VerifyRequestBody:
+        capability = await self.get_capability(
+            agent_id=agent_id,
+            action=action_type,
+            target_service=target_service,
+            scopes=scopes,
+            limits=limits,
+        )
+        return build_signed_request(
+            workspace_id=self._workspace_id,
+            agent_id=agent_id,
+            action_type=action_type,
+            target_service=target_service,
+            payload=payload,
+            capability_token=capability["token"],
+            private_key_base64=private_key_base64,
+            request_context=request_context,
+        )
+
+    async def _issue(self, key: CapabilityKey) -> CapabilityResponse:
+        task = self._inflight.get(key)
+        if task is None:
+            # The issuance runs in its own task, so cancelling any caller, including
+            # the one that started it, never cancels the request others wait on.
+            task = asyncio.create_task(self._request(key))
+            task.add_done_callback(_retrieve_exception)
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _request(self, key: CapabilityKey) -> CapabilityResponse:
+        try:
+            capability = await self._client.request_capability(self._request_body(key))
+        finally:
+            self._inflight.pop(key, None)
+        entry = self._store(key, capability)
+        self._schedule(key, entry.refresh_at - self._clock())
+        return capability
+
+    def _schedule(self, key: CapabilityKey, delay: float) -> None:
+        if not self._background_refresh or self._closed:
+            return
+        previous = self._refresh_tasks.pop(key, None)
+        if previous is not None and previous is not asyncio.current_task():
+            previous.cancel()
+        self._refresh_tasks[key] = asyncio.create_task(self._refresh_later(key, delay))
+
+    async def _refresh_later(self, key: CapabilityKey, delay: float) -> None:
+        await asyncio.sleep(max(0.0, delay))
+        if self._refresh_tasks.get(key) is asyncio.current_task():
+            del self._refresh_tasks[key]
+        if self._closed or key not in self._used:
+            return
+        try:
+            await self._issue(key)
+        except Exception:
+            logger.warning("capability_refresh_failed", exc_info=True)
+            retry_delay = self._retry_delay(key)
+            if retry_delay is not None:
+                self._schedule(key, retry_delay)
+
+
+def _retrieve_exception(task: asyncio.Task[CapabilityResponse]) -> None:
+    # An issuance whose callers were all cancelled must not warn about an
+    # unretrieved exception.
+    if not task.cancelled():
+        task.exception()
@@ -1,9 +1,58 @@
+import asyncio
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from typing import Any
 
 import httpx
 
 from limiq_sdk.crypto import extract_capability_jti, sign_action
-from limiq_sdk.types import CapabilityRequestBody, CapabilityResponse, VerifyRequestBody, VerifyResponse
+from limiq_sdk.resilience import (
+    RETRYABLE_EXCEPTIONS,
+    HedgePolicy,
+    LatencyTracker,
+    RetryPolicy,
+    deadline_at,
+    remaining_seconds,
+    retry_delay,
+    timeout_header,
+)
+from limiq_sdk.types import (
+    CapabilityRequestBody,
+    CapabilityResponse,
+    JwksFetchResult,
+    LocalDecisionRecord,
+    StateChangesPage,
+    VerifierState,
+    VerifyRequestBody,
+    VerifyResponse,
+)
+
+# One pooled client per SDK client: connections (and TLS sessions) are kept alive
+# between calls instead of being re-established for every verification.
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=30.0,
+)
+JWKS_PATH = "/.well-known/jwks.json"
+# Mirrors the API's limit on items per POST /verify/batch.
+MAX_VERIFY_BATCH_SIZE = 100
+
+
+def _jwks_result(response: httpx.Response, etag: str | None) -> JwksFetchResult:
+    max_age: float | None = None
+    for directive in response.headers.get("Cache-Control", "").split(","):
+        name, _, value = directive.strip().partition("=")
+        if name.lower() == "max-age" and value.isdigit():
+            max_age = float(value)
+    if response.status_code == 304:
+        return {"keys": None, "etag": response.headers.get("ETag", etag), "max_age": max_age}
+    response.raise_for_status()
+    return {
+        "keys": response.json()["keys"],
+        "etag": response.headers.get("ETag"),
+        "max_age": max_age,
+    }
 
 
 class LimiqClient:
@@ -14,31 +63,171 @@ class LimiqClient:
         workspace_id: str,
         timeout: float = 10.0,
         transport: httpx.BaseTransport | None = None,
+        limits: httpx.Limits | None = None,
+        http2: bool = False,
+        retry: RetryPolicy | None = None,
+        hedge: HedgePolicy | None = None,
+        deadline: float | None = None,
     ) -> None:
         self._base_url = base_url.rstrip("/")
         self._workspace_id = workspace_id
         self._timeout = timeout
-        self._transport = transport
-
-    def request_capability(self, payload: CapabilityRequestBody) -> CapabilityResponse:
-        with httpx.Client(timeout=self._timeout, transport=self._transport) as client:
-            response = client.post(
-                f"{self._base_url}/capabilities/request",
-                headers={"X-Workspace-Id": self._workspace_id},
-                json=payload,
-            )
-            response.raise_for_status()
-            return response.json()
-
-    def verify_action(self, payload: VerifyRequestBody) -> VerifyResponse:
-        with httpx.Client(timeout=self._timeout, transport=self._transport) as client:
-            response = client.post(
-                f"{self._base_url}/verify",
-                headers={"X-Workspace-Id": self._workspace_id},
-                json=payload,
+        self._retry = retry
+        self._hedge = hedge
+        self._default_deadline = deadline
+        self._latency = LatencyTracker(hedge) if hedge is not None else None
+        self._hedge_pool: ThreadPoolExecutor | None = None
+        # http2=True requires the `h2` package: pip install "limiq-sdk[http2]".
+        self._client = httpx.Client(
+            base_url=self._base_url,
+            headers={"X-Workspace-Id": workspace_id},
+            timeout=timeout,
+            limits=limits or DEFAULT_LIMITS,
+            http2=http2,
+            transport=transport,
+        )
+
+    def __enter__(self) -> "LimiqClient":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def workspace_id(self) -> str:
+        return self._workspace_id
+
+    @property
+    def is_closed(self) -> bool:
+        return self._client.is_closed
+
+    def close(self) -> None:
+        if self._hedge_pool is not None:
+            self._hedge_pool.shutdown(wait=False)
+        self._client.close()
+
+    def request_capability(
+        self, payload: CapabilityRequestBody, *, deadline: float | None = None
+    ) -> CapabilityResponse:
+        response = self._post("/capabilities/request", payload, deadline, hedged=False)
+        response.raise_for_status()
+        return response.json()
+
+    def verify_action(
+        self, payload: VerifyRequestBody, *, deadline: float | None = None
+    ) -> VerifyResponse:
+        response = self._post("/verify", payload, deadline, hedged=True)
+        response.raise_for_status()
+        return response.json()
+
+    def verify_batch(
+        self, payloads: list[VerifyRequestBody], *, deadline: float | None = None
+    ) -> list[VerifyResponse]:
+        body = {"items": payloads}
+        response = self._post("/verify/batch", body, deadline, hedged=False)
+        response.raise_for_status()
+        return list(response.json()["results"])
+
+    def get_jwks(self, *, etag: str | None = None) -> JwksFetchResult:
+        headers = {"If-None-Match": etag} if etag is not None else None
+        return _jwks_result(self._client.get(JWKS_PATH, headers=headers), etag)
+
+    def get_verifier_state(self) -> VerifierState:
+        params = {"workspace_id": self._workspace_id}
+        response = self._client.get("/verifier/state", params=params)
+        response.raise_for_status()
+        return response.json()
+
+    def get_state_changes(
+        self, *, cursor: int, limit: int = 100, wait_seconds: float = 0.0
+    ) -> StateChangesPage:
+        params: dict[str, str | int | float] = {
+            "workspace_id": self._workspace_id,
+            "cursor": cursor,
+            "limit": limit,
+            "wait_seconds": wait_seconds,
+        }
+        # The server may hold the request for wait_seconds before answering.
+        response = self._client.get("/changes", params=params, timeout=self._timeout + wait_seconds)
+        response.raise_for_status()
+        return response.json()
+
+    def record_local_decisions(
+        self, *, verifier_id: str, decisions: list[LocalDecisionRecord]
+    ) -> int:
+        body = {
+            "workspace_id": self._workspace_id,
+            "verifier_id": verifier_id,
+            "decisions": decisions,
+        }
+        response = self._post("/verifier/decisions", body, None, hedged=False)
+        response.raise_for_status()
+        return int(response.json()["accepted"])
+
+    def _post(
+        self, path: str, payload: Any, deadline: float | None, *, hedged: bool
+    ) -> httpx.Response:
+        # deadline is a budget in seconds for the whole call, retries included.
+        call_deadline = deadline_at(deadline if deadline is not None else self._default_deadline)
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = self._send(path, payload, call_deadline, hedged=hedged)
+            except RETRYABLE_EXCEPTIONS:
+                delay = retry_delay(self._retry, attempt=attempt, deadline=call_deadline)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+
+            delay = retry_delay(
+                self._retry, attempt=attempt, deadline=call_deadline, response=response
             )
-            response.raise_for_status()
-            return response.json()
+            if delay is None:
+                return response
+            time.sleep(delay)
+
+    def _send(
+        self, path: str, payload: Any, call_deadline: float | None, *, hedged: bool
+    ) -> httpx.Response:
+        hedge_delay = self._latency.hedge_delay() if hedged and self._latency else None
+        if hedge_delay is None:
+            return self._send_once(path, payload, call_deadline)
+
+        if self._hedge_pool is None:
+            self._hedge_pool = ThreadPoolExecutor(thread_name_prefix="limiq-hedge")
+        primary = self._hedge_pool.submit(self._send_once, path, payload, call_deadline)
+        done, _ = wait([primary], timeout=hedge_delay)
+        if done:
+            return primary.result()
+
+        pending: set[Future[httpx.Response]] = {
+            primary,
+            self._hedge_pool.submit(self._send_once, path, payload, call_deadline),
+        }
+        # First response wins; an exception only counts once both copies failed.
+        error: BaseException | None = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                exc = future.exception()
+                if exc is None:
+                    return future.result()
+                error = exc
+        assert error is not None
+        raise error
+
+    def _send_once(self, path: str, payload: Any, call_deadline: float | None) -> httpx.Response:
+        remaining = remaining_seconds(call_deadline)
+        timeout = self._timeout if remaining is None else min(self._timeout, remaining)
+        start = time.monotonic()
+        response = self._client.post(
+            path, json=payload, headers=timeout_header(remaining), timeout=timeout
+        )
+        if self._latency is not None:
+            self._latency.record(time.monotonic() - start)
+        return response
 
 
 class AsyncLimiqClient:
@@ -49,31 +238,167 @@ class AsyncLimiqClient:
         workspace_id: str,
         timeout: float = 10.0,
         transport: httpx.AsyncBaseTransport | None = None,
+        limits: httpx.Limits | None = None,
+        http2: bool = False,
+        retry: RetryPolicy | None = None,
+        hedge: HedgePolicy | None = None,
+        deadline: float | None = None,
     ) -> None:
         self._base_url = base_url.rstrip("/")
         self._workspace_id = workspace_id
         self._timeout = timeout
-        self._transport = transport
-
-    async def request_capability(self, payload: CapabilityRequestBody) -> CapabilityResponse:
-        async with httpx.AsyncClient(timeout=self._timeout, transport=self._transport) as client:
-            response = await client.post(
-                f"{self._base_url}/capabilities/request",
-                headers={"X-Workspace-Id": self._workspace_id},
-                json=payload,
-            )
-            response.raise_for_status()
-            return response.json()
-
-    async def verify_action(self, payload: VerifyRequestBody) -> VerifyResponse:
-        async with httpx.AsyncClient(timeout=self._timeout, transport=self._transport) as client:
-            response = await client.post(
-                f"{self._base_url}/verify",
-                headers={"X-Workspace-Id": self._workspace_id},
-                json=payload,
+        self._retry = retry
+        self._hedge = hedge
+        self._default_deadline = deadline
+        self._latency = LatencyTracker(hedge) if hedge is not None else None
+        self._client = httpx.AsyncClient(
+            base_url=self._base_url,
+            headers={"X-Workspace-Id": workspace_id},
+            timeout=timeout,
+            limits=limits or DEFAULT_LIMITS,
+            http2=http2,
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> "AsyncLimiqClient":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    @property
+    def workspace_id(self) -> str:
+        return self._workspace_id
+
+    @property
+    def is_closed(self) -> bool:
+        return self._client.is_closed
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def request_capability(
+        self, payload: CapabilityRequestBody, *, deadline: float | None = None
+    ) -> CapabilityResponse:
+        response = await self._post("/capabilities/request", payload, deadline, hedged=False)
+        response.raise_for_status()
+        return response.json()
+
+    async def verify_action(
+        self, payload: VerifyRequestBody, *, deadline: float | None = None
+    ) -> VerifyResponse:
+        response = await self._post("/verify", payload, deadline, hedged=True)
+        response.raise_for_status()
+        return response.json()
+
+    async def verify_batch(
+        self, payloads: list[VerifyRequestBody], *, deadline: float | None = None
+    ) -> list[VerifyResponse]:
+        body = {"items": payloads}
+        response = await self._post("/verify/batch", body, deadline, hedged=False)
+        response.raise_for_status()
+        return list(response.json()["results"])
+
+    async def get_jwks(self, *, etag: str | None = None) -> JwksFetchResult:
+        headers = {"If-None-Match": etag} if etag is not None else None
+        return _jwks_result(await self._client.get(JWKS_PATH, headers=headers), etag)
+
+    async def get_verifier_state(self) -> VerifierState:
+        params = {"workspace_id": self._workspace_id}
+        response = await self._client.get("/verifier/state", params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def get_state_changes(
+        self, *, cursor: int, limit: int = 100, wait_seconds: float = 0.0
+    ) -> StateChangesPage:
+        params: dict[str, str | int | float] = {
+            "workspace_id": self._workspace_id,
+            "cursor": cursor,
+            "limit": limit,
+            "wait_seconds": wait_seconds,
+        }
+        response = await self._client.get(
+            "/changes", params=params, timeout=self._timeout + wait_seconds
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def record_local_decisions(
+        self, *, verifier_id: str, decisions: list[LocalDecisionRecord]
+    ) -> int:
+        body = {
+            "workspace_id": self._workspace_id,
+            "verifier_id": verifier_id,
+            "decisions": decisions,
+        }
+        response = await self._post("/verifier/decisions", body, None, hedged=False)
+        response.raise_for_status()
+        return int(response.json()["accepted"])
+
+    async def _post(
+        self, path: str, payload: Any, deadline: float | None, *, hedged: bool
+    ) -> httpx.Response:
+        call_deadline = deadline_at(deadline if deadline is not None else self._default_deadline)
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = await self._send(path, payload, call_deadline, hedged=hedged)
+            except RETRYABLE_EXCEPTIONS:
+                delay = retry_delay(self._retry, attempt=attempt, deadline=call_deadline)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+
+            delay = retry_delay(
+                self._retry, attempt=attempt, deadline=call_deadline, response=response
             )
-            response.raise_for_status()
-            return response.json()
+            if delay is None:
+                return response
+            await asyncio.sleep(delay)
+
+    async def _send(
+        self, path: str, payload: Any, call_deadline: float | None, *, hedged: bool
+    ) -> httpx.Response:
+        hedge_delay = self._latency.hedge_delay() if hedged and self._latency else None
+        if hedge_delay is None:
+            return await self._send_once(path, payload, call_deadline)
+
+        primary = asyncio.ensure_future(self._send_once(path, payload, call_deadline))
+        done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+        if done:
+            return primary.result()
+
+        pending = {primary, asyncio.ensure_future(self._send_once(path, payload, call_deadline))}
+        error: BaseException | None = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    exc = task.exception()
+                    if exc is None:
+                        return task.result()
+                    error = exc
+        finally:
+            for task in pending:
+                task.cancel()
+        assert error is not None
+        raise error
+
+    async def _send_once(
+        self, path: str, payload: Any, call_deadline: float | None
+    ) -> httpx.Response:
+        remaining = remaining_seconds(call_deadline)
+        timeout = self._timeout if remaining is None else min(self._timeout, remaining)
+        start = time.monotonic()
+        response = await self._client.post(
+            path, json=payload, headers=timeout_header(remaining), timeout=timeout
+        )
+        if self._latency is not None:
+            self._latency.record(time.monotonic() - start)
+        return response
 
 
 def build_signed_request(
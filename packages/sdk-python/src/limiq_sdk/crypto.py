@@ -1,13 +1,19 @@
 import base64
 import hashlib
 import json
-from collections.abc import Mapping
+import os
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any
 
+from nacl.bindings import crypto_sign, crypto_sign_seed_keypair
 from nacl.signing import SigningKey, VerifyKey
 
 from limiq_sdk.canonical import canonicalize
-from limiq_sdk.types import SignActionResult
+from limiq_sdk.types import SignActionResult, VerifyEnvelope
+
+# Below this many actions a process pool costs more (spawn + pickling) than it saves.
+SIGN_MANY_MIN_PARALLEL_BATCH = 2048
 
 
 def _b64_decode(value: str) -> bytes:
@@ -36,15 +42,16 @@ def sha256_hex(message: bytes) -> str:
     return hashlib.sha256(message).hexdigest()
 
 
-def _signing_key_from_private64(private_key_base64: str) -> SigningKey:
+def _secret_key_from_private64(private_key_base64: str) -> tuple[bytes, bytes]:
     private_key = _b64_decode(private_key_base64)
     if len(private_key) != 64:
         raise ValueError("private_key_base64 must decode to 64 bytes")
-    seed32 = private_key[:32]
-    return SigningKey(seed32)
+    # Re-derive from the seed rather than trusting the stored public half.
+    public32, secret64 = crypto_sign_seed_keypair(private_key[:32])
+    return public32, secret64
 
 
-def sign_action(
+def _envelope(
     *,
     agent_id: str,
     workspace_id: str,
@@ -52,9 +59,8 @@ def sign_action(
     target_service: str,
     payload: Mapping[str, Any],
     capability_jti: str,
-    private_key_base64: str,
-) -> SignActionResult:
-    envelope: dict[str, Any] = {
+) -> dict[str, Any]:
+    return {
         "agent_id": agent_id,
         "workspace_id": workspace_id,
         "action_type": action_type,
@@ -62,11 +68,13 @@ def sign_action(
         "payload": dict(payload),
         "capability_jti": capability_jti,
     }
+
+
+def _sign_envelope(secret_key: bytes, envelope: Mapping[str, Any]) -> SignActionResult:
     canonical_json = canonicalize(envelope)
     digest = hashlib.sha256(canonical_json.encode("utf-8")).digest()
-
-    signing_key = _signing_key_from_private64(private_key_base64)
-    signature = signing_key.sign(digest).signature
+    # crypto_sign returns signature || message; the detached signature is the prefix.
+    signature = crypto_sign(digest, secret_key)[:64]
 
     return {
         "signature_base64": _b64_encode(signature),
@@ -75,6 +83,110 @@ def sign_action(
     }
 
 
+def sign_action(
+    *,
+    agent_id: str,
+    workspace_id: str,
+    action_type: str,
+    target_service: str,
+    payload: Mapping[str, Any],
+    capability_jti: str,
+    private_key_base64: str,
+) -> SignActionResult:
+    _, secret_key = _secret_key_from_private64(private_key_base64)
+    envelope = _envelope(
+        agent_id=agent_id,
+        workspace_id=workspace_id,
+        action_type=action_type,
+        target_service=target_service,
+        payload=payload,
+        capability_jti=capability_jti,
+    )
+    return _sign_envelope(secret_key, envelope)
+
+
+_worker_secret_key: bytes | None = None
+
+
+def _init_sign_worker(secret_key: bytes) -> None:
+    global _worker_secret_key
+    _worker_secret_key = secret_key
+
+
+def _sign_in_worker(actions: Sequence[VerifyEnvelope]) -> list[SignActionResult]:
+    assert _worker_secret_key is not None
+    return [_sign_envelope(_worker_secret_key, _envelope(**action)) for action in actions]
+
+
+class AgentSigner:
+    # Holds one agent's decoded key so repeated signing skips base64 decoding and
+    # key expansion. Output is byte-identical to sign_action.
+    def __init__(self, *, private_key_base64: str, processes: int | None = None) -> None:
+        public_key, self._secret_key = _secret_key_from_private64(private_key_base64)
+        self.public_key_base64 = _b64_encode(public_key)
+        self._processes = processes or os.cpu_count() or 1
+        self._pool: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> "AgentSigner":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def sign(
+        self,
+        *,
+        agent_id: str,
+        workspace_id: str,
+        action_type: str,
+        target_service: str,
+        payload: Mapping[str, Any],
+        capability_jti: str,
+    ) -> SignActionResult:
+        envelope = _envelope(
+            agent_id=agent_id,
+            workspace_id=workspace_id,
+            action_type=action_type,
+            target_service=target_service,
+            payload=payload,
+            capability_jti=capability_jti,
+        )
+        return _sign_envelope(self._secret_key, envelope)
+
+    def sign_many(
+        self,
+        actions: Sequence[VerifyEnvelope],
+        *,
+        parallel: bool | None = None,
+    ) -> list[SignActionResult]:
+        # parallel=None fans out over the process pool only for large batches.
+        if parallel is None:
+            parallel = self._processes > 1 and len(actions) >= SIGN_MANY_MIN_PARALLEL_BATCH
+        if not parallel or not actions:
+            return [_sign_envelope(self._secret_key, _envelope(**action)) for action in actions]
+
+        if self._pool is None:
+            # The pool is kept for the signer's lifetime; close() shuts it down.
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._processes,
+                initializer=_init_sign_worker,
+                initargs=(self._secret_key,),
+            )
+        chunk_size = max(1, -(-len(actions) // (self._processes * 4)))
+        chunks = [
+            actions[start : start + chunk_size] for start in range(0, len(actions), chunk_size)
+        ]
+        results: list[SignActionResult] = []
+        for signed in self._pool.map(_sign_in_worker, chunks):
+            results.extend(signed)
+        return results
+
+
 def verify_signature(*, public_key_base64: str, signature_base64: str, canonical_json: str) -> bool:
     try:
         public_key = _b64_decode(public_key_base64)
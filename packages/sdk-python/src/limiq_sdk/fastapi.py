@@ -0,0 +1,79 @@
+import math
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import cast
+
+from fastapi import HTTPException, Request
+
+from limiq_sdk.guard import VERIFIER_UNAVAILABLE, ActionGuard, GuardOutcome
+from limiq_sdk.types import VerifyRequestBody
+
+# Requires FastAPI: pip install "limiq-sdk[fastapi]".
+
+_STRING_FIELDS = (
+    "workspace_id",
+    "agent_id",
+    "action_type",
+    "target_service",
+    "signature",
+    "capability_token",
+)
+
+
+@dataclass(frozen=True)
+class VerifiedAction:
+    body: VerifyRequestBody
+    outcome: GuardOutcome
+
+
+def verified_action(guard: ActionGuard) -> Callable[[Request], Awaitable[VerifiedAction]]:
+    # Route dependency: the body must be a signed action (the POST /verify payload).
+    # The route only runs on ALLOW; DENY becomes 403 (or the API's own 4xx, and its
+    # 429 or 503 with Retry-After when it shed the request) and an unavailable
+    # verifier with fail_open=False becomes 503. Starlette caches the body, so the
+    # route can still declare its own body model.
+    async def dependency(request: Request) -> VerifiedAction:
+        try:
+            body = await request.json()
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail={"code": "INVALID_JSON", "message": "Request body must be JSON"},
+            ) from None
+        if (
+            not isinstance(body, dict)
+            or not isinstance(body.get("payload"), dict)
+            or any(not isinstance(body.get(name), str) for name in _STRING_FIELDS)
+        ):
+            raise HTTPException(
+                status_code=422,
+                detail={
+                    "code": "VALIDATION_ERROR",
+                    "message": "Request body must be a signed Limiq.io action",
+                },
+            )
+        body.setdefault("request_context", {})
+
+        action = cast(VerifyRequestBody, body)
+        outcome = await guard.verify(action)
+        if outcome.decision == "ALLOW":
+            return VerifiedAction(body=action, outcome=outcome)
+        if outcome.source == "fail_closed":
+            raise HTTPException(
+                status_code=503,
+                detail={"code": VERIFIER_UNAVAILABLE, "message": "Limiq.io verify unavailable"},
+            )
+        headers = None
+        if outcome.retry_after_seconds is not None:
+            headers = {"Retry-After": str(math.ceil(outcome.retry_after_seconds))}
+        raise HTTPException(
+            status_code=outcome.status_code or 403,
+            headers=headers,
+            detail={
+                "decision": outcome.decision,
+                "reason_code": outcome.reason_code,
+                "audit_event_id": outcome.audit_event_id,
+            },
+        )
+
+    return dependency
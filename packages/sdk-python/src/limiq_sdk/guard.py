@@ -0,0 +1,301 @@
+import asyncio
+import hashlib
+import math
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Literal
+
+import httpx
+
+from limiq_sdk.client import AsyncLimiqClient
+from limiq_sdk.resilience import _retry_after_seconds
+from limiq_sdk.types import VerifyRequestBody
+
+VERIFIER_UNAVAILABLE = "VERIFIER_UNAVAILABLE"
+
+# Denials that depend only on the token, agent and workspace, never on the signed
+# payload, so sending the same token again cannot succeed within a short TTL.
+NEGATIVE_CACHE_REASONS = frozenset(
+    {
+        "AGENT_NOT_FOUND",
+        "AGENT_REVOKED",
+        "CAPABILITY_INVALID",
+        "CAPABILITY_EXPIRED",
+        "CAPABILITY_REVOKED",
+        "WORKSPACE_MISMATCH",
+    }
+)
+
+# Load-shedding replies: the API is up and refused the request before doing any
+# work, with 429 (WORKSPACE_BUSY, rate limits) or 503 (OVERLOADED,
+# DEADLINE_EXCEEDED). Any other 5xx is an upstream failure.
+SHED_ERROR_CODES = frozenset({"OVERLOADED", "DEADLINE_EXCEEDED", "WORKSPACE_BUSY"})
+
+OutcomeSource = Literal["api", "negative_cache", "throttled", "fail_open", "fail_closed"]
+CircuitState = Literal["closed", "open", "half_open"]
+
+
+@dataclass(frozen=True)
+class CircuitBreakerPolicy:
+    # Consecutive upstream failures (timeouts, transport errors, 5xx) that open the
+    # circuit, and how long it stays open before a single trial call.
+    failure_threshold: int = 5
+    reset_timeout_seconds: float = 10.0
+
+
+@dataclass(frozen=True)
+class GuardOutcome:
+    decision: Literal["ALLOW", "DENY"]
+    reason_code: str | None
+    audit_event_id: str | None
+    source: OutcomeSource
+    # Set when the API refused the request itself (4xx).
+    status_code: int | None = None
+    # Set when a shed reply carried Retry-After.
+    retry_after_seconds: float | None = None
+
+
+@dataclass(frozen=True)
+class GuardStats:
+    calls: int
+    allowed: int
+    denied: int
+    negative_cache_hits: int
+    upstream_failures: int
+    fail_open: int
+    fail_closed: int
+    throttled: int
+    circuit_state: CircuitState
+    latency_p50_ms: float | None
+    latency_p95_ms: float | None
+    latency_p99_ms: float | None
+
+
+class _CircuitBreaker:
+    def __init__(self, policy: CircuitBreakerPolicy, clock: Callable[[], float]) -> None:
+        self._policy = policy
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> CircuitState:
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at < self._policy.reset_timeout_seconds:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "open" or self._trial_in_flight:
+            return False
+        self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._trial_in_flight or self._failures >= self._policy.failure_threshold:
+            self._opened_at = self._clock()
+        self._trial_in_flight = False
+
+    def abandon(self) -> None:
+        # A cancelled trial proves nothing either way; let the next call try.
+        self._trial_in_flight = False
+
+
+def _error_code(response: httpx.Response) -> str:
+    try:
+        detail = response.json().get("detail")
+    except (ValueError, AttributeError):
+        detail = None
+    if isinstance(detail, dict) and isinstance(detail.get("code"), str):
+        return str(detail["code"])
+    return f"HTTP_{response.status_code}"
+
+
+def _negative_cache_key(body: VerifyRequestBody) -> bytes:
+    key = "\0".join((body["workspace_id"], body["agent_id"], body["capability_token"]))
+    return hashlib.sha256(key.encode("utf-8")).digest()
+
+
+# Verifies incoming signed actions for a target service over one shared pooled
+# AsyncLimiqClient. Each call is bounded by timeout_seconds (propagated to the API
+# as its deadline). Upstream failures feed a circuit breaker, and while the API is
+# failing or the circuit is open, fail_open decides between ALLOW and DENY with
+# reason VERIFIER_UNAVAILABLE. Token-level denials are remembered for
+# negative_cache_ttl_seconds so a client retrying a dead token does not cost a
+# /verify call (or an audit event) each time. A 429, or a 503 with a load-shedding
+# code (SHED_ERROR_CODES), means the API is up and shedding load, so it is not an
+# outage: it never trips the breaker or fails open, and calls are denied without
+# reaching the API until its Retry-After has passed. Meant for one event loop.
+class ActionGuard:
+    def __init__(
+        self,
+        client: AsyncLimiqClient,
+        *,
+        timeout_seconds: float = 1.0,
+        fail_open: bool = False,
+        circuit_breaker: CircuitBreakerPolicy | None = None,
+        negative_cache_ttl_seconds: float = 5.0,
+        negative_cache_size: int = 10_000,
+        latency_window: int = 1024,
+        on_outcome: Callable[[GuardOutcome, float], None] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._client = client
+        self._timeout = timeout_seconds
+        self._fail_open = fail_open
+        self._breaker = _CircuitBreaker(circuit_breaker or CircuitBreakerPolicy(), clock)
+        self._negative_ttl = negative_cache_ttl_seconds
+        self._negative_size = negative_cache_size
+        self._negative: OrderedDict[bytes, tuple[float, str]] = OrderedDict()
+        self._latencies: deque[float] = deque(maxlen=latency_window)
+        self._throttled_until = 0.0
+        self._throttle_reason = ""
+        self._throttle_status = 429
+        self._on_outcome = on_outcome
+        self._clock = clock
+        self._counts = {
+            "calls": 0,
+            "allowed": 0,
+            "denied": 0,
+            "negative_cache_hits": 0,
+            "upstream_failures": 0,
+            "fail_open": 0,
+            "fail_closed": 0,
+            "throttled": 0,
+        }
+
+    @property
+    def circuit_state(self) -> CircuitState:
+        return self._breaker.state
+
+    async def verify(self, body: VerifyRequestBody) -> GuardOutcome:
+        started = self._clock()
+        outcome = await self._decide(body)
+        elapsed = self._clock() - started
+
+        self._latencies.append(elapsed)
+        self._counts["calls"] += 1
+        self._counts["allowed" if outcome.decision == "ALLOW" else "denied"] += 1
+        if outcome.source == "negative_cache":
+            self._counts["negative_cache_hits"] += 1
+        elif outcome.source != "api":
+            self._counts[outcome.source] += 1
+        if self._on_outcome is not None:
+            self._on_outcome(outcome, elapsed)
+        return outcome
+
+    def stats(self) -> GuardStats:
+        ordered = sorted(self._latencies)
+
+        def percentile(value: float) -> float | None:
+            if not ordered:
+                return None
+            rank = math.ceil(len(ordered) * value / 100)
+            return ordered[max(0, rank - 1)] * 1000
+
+        return GuardStats(
+            calls=self._counts["calls"],
+            allowed=self._counts["allowed"],
+            denied=self._counts["denied"],
+            negative_cache_hits=self._counts["negative_cache_hits"],
+            upstream_failures=self._counts["upstream_failures"],
+            fail_open=self._counts["fail_open"],
+            fail_closed=self._counts["fail_closed"],
+            throttled=self._counts["throttled"],
+            circuit_state=self._breaker.state,
+            latency_p50_ms=percentile(50),
+            latency_p95_ms=percentile(95),
+            latency_p99_ms=percentile(99),
+        )
+
+    async def _decide(self, body: VerifyRequestBody) -> GuardOutcome:
+        cache_key = _negative_cache_key(body)
+        cached_reason = self._negative_get(cache_key)
+        if cached_reason is not None:
+            return GuardOutcome("DENY", cached_reason, None, "negative_cache")
+
+        remaining = self._throttled_until - self._clock()
+        if remaining > 0:
+            return GuardOutcome(
+                "DENY", self._throttle_reason, None, "throttled", self._throttle_status, remaining
+            )
+
+        if not self._breaker.allow():
+            return self._unavailable()
+
+        try:
+            async with asyncio.timeout(self._timeout):
+                response = await self._client.verify_action(body, deadline=self._timeout)
+        except asyncio.CancelledError:
+            self._breaker.abandon()
+            raise
+        except httpx.HTTPStatusError as exc:
+            status = exc.response.status_code
+            if status == 429 or _error_code(exc.response) in SHED_ERROR_CODES:
+                return self._throttled(exc.response)
+            if status >= 500:
+                return self._upstream_failed()
+            # The API is up and answered; the request itself was refused.
+            self._breaker.record_success()
+            return GuardOutcome("DENY", _error_code(exc.response), None, "api", status)
+        except (httpx.HTTPError, TimeoutError):
+            return self._upstream_failed()
+
+        self._breaker.record_success()
+        reason_code = response["reason_code"]
+        if response["decision"] != "ALLOW" and reason_code in NEGATIVE_CACHE_REASONS:
+            self._negative_put(cache_key, reason_code)
+        return GuardOutcome(response["decision"], reason_code, response["audit_event_id"], "api")
+
+    def _throttled(self, response: httpx.Response) -> GuardOutcome:
+        # Releases a half-open trial without counting for or against the API.
+        self._breaker.abandon()
+        retry_after = _retry_after_seconds(response)
+        self._throttle_reason = _error_code(response)
+        self._throttle_status = response.status_code
+        if retry_after is not None:
+            self._throttled_until = self._clock() + retry_after
+        return GuardOutcome(
+            "DENY", self._throttle_reason, None, "throttled", response.status_code, retry_after
+        )
+
+    def _upstream_failed(self) -> GuardOutcome:
+        self._counts["upstream_failures"] += 1
+        self._breaker.record_failure()
+        return self._unavailable()
+
+    def _unavailable(self) -> GuardOutcome:
+        if self._fail_open:
+            return GuardOutcome("ALLOW", VERIFIER_UNAVAILABLE, None, "fail_open")
+        return GuardOutcome("DENY", VERIFIER_UNAVAILABLE, None, "fail_closed")
+
+    def _negative_get(self, key: bytes) -> str | None:
+        entry = self._negative.get(key)
+        if entry is None:
+            return None
+        expires_at, reason_code = entry
+        if self._clock() >= expires_at:
+            del self._negative[key]
+            return None
+        return reason_code
+
+    def _negative_put(self, key: bytes, reason_code: str) -> None:
+        if self._negative_ttl <= 0:
+            return
+        self._negative[key] = (self._clock() + self._negative_ttl, reason_code)
+        self._negative.move_to_end(key)
+        while len(self._negative) > self._negative_size:
+            self._negative.popitem(last=False)
@@ -0,0 +1,441 @@
+import base64
+import binascii
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any, Literal
+
+from nacl.exceptions import BadSignatureError
+from nacl.signing import VerifyKey
+
+from limiq_sdk.canonical import canonicalize
+from limiq_sdk.client import LimiqClient
+from limiq_sdk.crypto import _envelope
+from limiq_sdk.tokens import (
+    CapabilityTokenError,
+    _b64url_decode,
+    _check_token_times,
+    _verify_capability_token,
+    _verify_key,
+)
+from limiq_sdk.types import (
+    LocalDecisionRecord,
+    LocalVerifyResponse,
+    StateChange,
+    VerifierState,
+    VerifyRequestBody,
+)
+
+logger = logging.getLogger("limiq_sdk.local")
+
+# Keep well under the API's per-request limit of 500 decisions.
+MAX_AUDIT_BATCH_SIZE = 500
+FEED_PAGE_SIZE = 500
+_MAX_CACHED_TOKENS = 4096
+
+
+class StaleStateError(RuntimeError):
+    # Raised instead of deciding when the local state has not been synced recently
+    # enough; callers should fall back to LimiqClient.verify_action.
+    pass
+
+
+def _scopes_allow_action(*, scopes: list[str], action_type: str, tool: str | None) -> bool:
+    return action_type in scopes or bool(tool and tool in scopes)
+
+
+def _policy_allows_payload_spend(
+    *, policy_json: Mapping[str, Any], payload: Mapping[str, Any]
+) -> bool:
+    spend = policy_json.get("spend")
+    if not isinstance(spend, dict):
+        return True
+
+    max_per_tx = spend.get("max_per_tx")
+    amount = payload.get("amount")
+    if max_per_tx is None or amount is None:
+        return True
+
+    try:
+        return float(str(amount)) <= float(str(max_per_tx))
+    except (TypeError, ValueError):
+        return False
+
+
+def _rate_limit(policy_json: Mapping[str, Any]) -> int | None:
+    rate_limits = policy_json.get("rate_limits")
+    if not isinstance(rate_limits, dict):
+        return None
+
+    max_actions_per_min = rate_limits.get("max_actions_per_min")
+    if max_actions_per_min is None:
+        return None
+
+    try:
+        return int(max_actions_per_min)
+    except (TypeError, ValueError):
+        # The API denies on an unparseable limit; so do we.
+        return 0
+
+
+@dataclass(frozen=True)
+class _AgentState:
+    status: str
+    verify_key: VerifyKey | None
+
+
+@dataclass(frozen=True)
+class _PolicyState:
+    is_active: bool
+    policy_json: dict[str, Any]
+
+
+@dataclass
+class _LocalState:
+    keys: dict[str, VerifyKey] = field(default_factory=dict)
+    agents: dict[str, _AgentState] = field(default_factory=dict)
+    policies: dict[str, _PolicyState] = field(default_factory=dict)
+    bindings: dict[str, str] = field(default_factory=dict)
+    # Status of each issued, unexpired capability by jti.
+    capabilities: dict[str, str] = field(default_factory=dict)
+    revoked_jtis: set[str] = field(default_factory=set)
+
+    # Each update is a single dict/set operation, so concurrent readers see either
+    # the old or the new value for any one entity.
+    def apply(self, state: VerifierState) -> None:
+        for jwk in state["jwt_keys"]:
+            key = _verify_key(_b64url_decode(jwk["x"]))
+            if key is not None:
+                self.keys[jwk["kid"]] = key
+        for agent in state["agents"]:
+            self._set_agent(agent)
+        for policy in state["policies"]:
+            self._set_policy(policy)
+        # Ordered by bound_at: a rebind lists the old (now inactive) binding first.
+        for binding in state["bindings"]:
+            self._set_binding(binding)
+        for capability in state["capabilities"]:
+            self.capabilities[capability["jti"]] = capability["status"]
+        self.revoked_jtis.update(state["revoked_jtis"])
+
+    def apply_change(self, change: StateChange) -> None:
+        data = change["data"]
+        entity_type = change["entity_type"]
+        if entity_type == "agent":
+            self._set_agent(data)
+        elif entity_type == "policy":
+            self._set_policy(data)
+        elif entity_type == "binding":
+            self._set_binding(data)
+        elif entity_type == "capability":
+            self.capabilities[data["jti"]] = data["status"]
+        elif entity_type == "revocation":
+            self.revoked_jtis.add(data["jti"])
+
+    def _set_agent(self, agent: Mapping[str, Any]) -> None:
+        try:
+            raw = base64.b64decode(agent["public_key"], validate=True)
+        except (ValueError, binascii.Error):
+            raw = b""
+        self.agents[agent["id"]] = _AgentState(agent["status"], _verify_key(raw))
+
+    def _set_policy(self, policy: Mapping[str, Any]) -> None:
+        self.policies[policy["id"]] = _PolicyState(policy["is_active"], policy["policy_json"])
+
+    def _set_binding(self, binding: Mapping[str, Any]) -> None:
+        agent_id, policy_id = binding["agent_id"], binding["policy_id"]
+        if binding["status"] == "active":
+            self.bindings[agent_id] = policy_id
+        elif self.bindings.get(agent_id) == policy_id:
+            del self.bindings[agent_id]
+
+
+class _RateCounter:
+    # Fixed windows aligned like the API's Redis counters. Counts are per process:
+    # they are not shared with /verify or with other verifier instances.
+    def __init__(self, window_seconds: int) -> None:
+        self._window_seconds = window_seconds
+        self._counts: dict[tuple[str, str], tuple[int, int]] = {}
+        self._lock = threading.Lock()
+
+    def hit(self, *, agent_id: str, action_type: str, limit: int) -> bool:
+        bucket = int(time.time()) // self._window_seconds
+        key = (agent_id, action_type)
+        with self._lock:
+            current_bucket, count = self._counts.get(key, (bucket, 0))
+            count = count + 1 if current_bucket == bucket else 1
+            self._counts[key] = (bucket, count)
+        return count <= limit
+
+
+# In-process verifier running the same checks as POST /verify (agent status,
+# capability token, revocation, scopes, signature, binding, spend and rate) against
+# a local copy of the workspace state: a GET /verifier/state snapshot, then the
+# GET /changes feed, long-polled in the background.
+# Decisions are queued and shipped to the audit log in batches off the hot path.
+class LocalVerifier:
+    def __init__(
+        self,
+        client: LimiqClient,
+        *,
+        verifier_id: str | None = None,
+        sync_interval_seconds: float = 2.0,
+        full_sync_interval_seconds: float = 300.0,
+        max_staleness_seconds: float = 30.0,
+        leeway_seconds: float = 5.0,
+        rate_limit_window_seconds: int = 60,
+        audit_batch_size: int = 200,
+        audit_flush_interval_seconds: float = 1.0,
+        audit_queue_size: int = 10_000,
+        background: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not 1 <= audit_batch_size <= MAX_AUDIT_BATCH_SIZE:
+            raise ValueError(f"audit_batch_size must be between 1 and {MAX_AUDIT_BATCH_SIZE}")
+
+        self._client = client
+        self.verifier_id = verifier_id or f"local-{uuid.uuid4().hex[:12]}"
+        self._sync_interval = sync_interval_seconds
+        self._full_sync_interval = full_sync_interval_seconds
+        self._max_staleness = max_staleness_seconds
+        self._leeway = leeway_seconds
+        self._audit_batch_size = audit_batch_size
+        self._audit_flush_interval = audit_flush_interval_seconds
+        self._audit_queue_size = audit_queue_size
+        self._background = background
+        self._clock = clock
+
+        self._state = _LocalState()
+        self._rates = _RateCounter(rate_limit_window_seconds)
+        self._token_claims: dict[str, dict[str, Any]] = {}
+        self._cursor: int | None = None
+        self._synced_at: float | None = None
+        self._full_synced_at: float | None = None
+        self._sync_lock = threading.Lock()
+
+        self._audit_queue: deque[LocalDecisionRecord] = deque()
+        self._audit_lock = threading.Lock()
+        self.dropped_audit_events = 0
+
+        self._stop = threading.Event()
+        self._audit_ready = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def __enter__(self) -> "LocalVerifier":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def pending_audit_events(self) -> int:
+        return len(self._audit_queue)
+
+    def start(self) -> None:
+        # The first sync is synchronous so verify_action works as soon as this returns.
+        self.sync()
+        if self._background and not self._threads:
+            self._threads = [
+                threading.Thread(target=self._sync_loop, name="limiq-local-sync", daemon=True),
+                threading.Thread(target=self._audit_loop, name="limiq-local-audit", daemon=True),
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        self._audit_ready.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        while self._audit_queue and self.flush_audit():
+            pass
+
+    def sync(self, *, wait_seconds: float = 0.0) -> int:
+        # Returns how many feed changes were applied; wait_seconds long-polls the feed.
+        with self._sync_lock:
+            now = self._clock()
+            if (
+                self._cursor is None
+                or self._full_synced_at is None
+                or now - self._full_synced_at >= self._full_sync_interval
+            ):
+                state = self._client.get_verifier_state()
+                # Rebuilt and swapped in whole, which also drops revocations of
+                # long-expired tokens.
+                fresh = _LocalState()
+                fresh.apply(state)
+                if fresh.keys != self._state.keys:
+                    self._token_claims = {}
+                self._state = fresh
+                self._cursor = state["cursor"]
+                self._full_synced_at = self._synced_at = now
+                return 0
+
+            page = self._client.get_state_changes(
+                cursor=self._cursor, limit=FEED_PAGE_SIZE, wait_seconds=wait_seconds
+            )
+            for change in page["items"]:
+                self._state.apply_change(change)
+            self._cursor = page["next_cursor"]
+            self._synced_at = self._clock()
+            return len(page["items"])
+
+    def verify_action(self, body: VerifyRequestBody) -> LocalVerifyResponse:
+        if self._synced_at is None or self._clock() - self._synced_at > self._max_staleness:
+            raise StaleStateError("Local verifier state is stale; verify through the API")
+
+        reason_code, jti = self._evaluate(body)
+        decision: Literal["ALLOW", "DENY"] = "ALLOW" if reason_code is None else "DENY"
+        self._enqueue_audit(
+            {
+                "agent_id": body["agent_id"],
+                "action_type": body["action_type"],
+                "target_service": body["target_service"],
+                "decision": decision,
+                "reason_code": reason_code,
+                "jti": jti,
+                "decided_at": datetime.now(tz=UTC).isoformat(),
+            }
+        )
+        return {"decision": decision, "reason_code": reason_code}
+
+    def flush_audit(self) -> int:
+        with self._audit_lock:
+            batch = [
+                self._audit_queue.popleft()
+                for _ in range(min(self._audit_batch_size, len(self._audit_queue)))
+            ]
+        if not batch:
+            return 0
+
+        try:
+            self._client.record_local_decisions(verifier_id=self.verifier_id, decisions=batch)
+        except Exception:
+            logger.warning("local_audit_ship_failed", extra={"count": len(batch)}, exc_info=True)
+            with self._audit_lock:
+                # Put the batch back in front; the queue bound still applies.
+                self._audit_queue.extendleft(reversed(batch))
+                self._trim_audit_queue_locked()
+            return 0
+        return len(batch)
+
+    def _evaluate(self, body: VerifyRequestBody) -> tuple[str | None, str | None]:
+        state = self._state
+        workspace_id = body["workspace_id"]
+        agent_id = body["agent_id"]
+        if workspace_id != self._client.workspace_id:
+            return "WORKSPACE_MISMATCH", None
+
+        agent = state.agents.get(agent_id)
+        if agent is None:
+            return "AGENT_NOT_FOUND", None
+        if agent.status != "active":
+            return "AGENT_REVOKED", None
+
+        token = body["capability_token"]
+        try:
+            claims = self._token_claims.get(token)
+            if claims is None:
+                claims = _verify_capability_token(token, state.keys)
+                if len(self._token_claims) >= _MAX_CACHED_TOKENS:
+                    self._token_claims.clear()
+                self._token_claims[token] = claims
+            _check_token_times(claims, now=time.time(), leeway=self._leeway)
+        except CapabilityTokenError as exc:
+            return exc.reason_code, None
+
+        jti = str(claims["jti"])
+        if str(claims["sub"]) != agent_id or str(claims["workspace_id"]) != workspace_id:
+            return "WORKSPACE_MISMATCH", None
+        # Like /verify, a token needs an active capability row in this workspace: one
+        # that was never issued here, or was deactivated, counts as revoked.
+        if jti in state.revoked_jtis or state.capabilities.get(jti) != "active":
+            return "CAPABILITY_REVOKED", jti
+
+        scopes_raw = claims.get("scopes", [])
+        scopes = [str(scope) for scope in scopes_raw] if isinstance(scopes_raw, list) else []
+        tool = body["payload"].get("tool")
+        if not _scopes_allow_action(
+            scopes=scopes,
+            action_type=body["action_type"],
+            tool=str(tool) if tool is not None else None,
+        ):
+            return "CAPABILITY_SCOPE_MISMATCH", jti
+
+        envelope = _envelope(
+            agent_id=agent_id,
+            workspace_id=workspace_id,
+            action_type=body["action_type"],
+            target_service=body["target_service"],
+            payload=body["payload"],
+            capability_jti=jti,
+        )
+        digest = hashlib.sha256(canonicalize(envelope).encode("utf-8")).digest()
+        try:
+            signature = base64.b64decode(body["signature"], validate=True)
+            if agent.verify_key is None or len(signature) != 64:
+                return "SIGNATURE_INVALID", None
+            agent.verify_key.verify(digest, signature)
+        except (BadSignatureError, ValueError, binascii.Error):
+            return "SIGNATURE_INVALID", None
+
+        policy_id = state.bindings.get(agent_id)
+        policy = state.policies.get(policy_id) if policy_id is not None else None
+        if policy is None or not policy.is_active:
+            return "POLICY_NOT_BOUND", None
+
+        if not _policy_allows_payload_spend(
+            policy_json=policy.policy_json, payload=body["payload"]
+        ):
+            return "SPEND_LIMIT_EXCEEDED", None
+
+        limit = _rate_limit(policy.policy_json)
+        if limit is not None and not self._rates.hit(
+            agent_id=agent_id, action_type=body["action_type"], limit=limit
+        ):
+            return "RATE_LIMIT_EXCEEDED", None
+
+        return None, jti
+
+    def _enqueue_audit(self, record: LocalDecisionRecord) -> None:
+        with self._audit_lock:
+            self._audit_queue.append(record)
+            self._trim_audit_queue_locked()
+            ready = len(self._audit_queue) >= self._audit_batch_size
+        if ready:
+            self._audit_ready.set()
+
+    def _trim_audit_queue_locked(self) -> None:
+        # Oldest decisions are dropped first when the API cannot keep up.
+        while len(self._audit_queue) > self._audit_queue_size:
+            self._audit_queue.popleft()
+            self.dropped_audit_events += 1
+
+    def _sync_loop(self) -> None:
+        # The feed is long-polled, so changes are applied as soon as they commit.
+        while not self._stop.is_set():
+            started = self._clock()
+            try:
+                applied = self.sync(wait_seconds=self._sync_interval)
+            except Exception:
+                logger.warning("local_state_sync_failed", exc_info=True)
+                applied = 0
+            if not applied:
+                # An early empty answer or an error must not turn into a busy loop.
+                self._stop.wait(max(0.0, self._sync_interval - (self._clock() - started)))
+
+    def _audit_loop(self) -> None:
+        # Separate from the sync loop so a slow audit backlog never delays revocations.
+        while not self._stop.is_set():
+            self._audit_ready.wait(self._audit_flush_interval)
+            self._audit_ready.clear()
+            while self._audit_queue and self.flush_audit():
+                pass
@@ -0,0 +1,133 @@
+import math
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+# Remaining call budget in milliseconds, relative so client/server clock skew does
+# not matter. The API sheds requests that are already past it.
+REQUEST_TIMEOUT_HEADER = "X-Request-Timeout-Ms"
+
+# Failures where the request provably never reached the API, so resending cannot
+# double-apply a verify (audit event, rate-limit hit) or a capability issuance.
+RETRYABLE_EXCEPTIONS: tuple[type[Exception], ...] = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.PoolTimeout,
+)
+
+
+class DeadlineExceeded(httpx.TimeoutException):
+    pass
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 3
+    backoff_base_seconds: float = 0.05
+    backoff_max_seconds: float = 1.0
+    # 429 and 503 are returned before any work is done (rate limiting, load
+    # shedding); other 5xx may have been partially applied and are not retried.
+    retry_statuses: frozenset[int] = frozenset({429, 503})
+    respect_retry_after: bool = True
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    # Send a second copy when the first has not answered within this percentile of
+    # recently observed latencies. Each hedge is a real /verify call on the server
+    # (its own audit event and rate-limit hit), so keep the percentile high.
+    percentile: float = 95.0
+    min_samples: int = 20
+    window: int = 512
+    min_delay_seconds: float = 0.005
+
+
+class LatencyTracker:
+    def __init__(self, policy: HedgePolicy) -> None:
+        self._policy = policy
+        self._samples: deque[float] = deque(maxlen=policy.window)
+        self._lock = threading.Lock()
+        self._threshold: float | None = None
+        self._dirty = 0
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self._dirty += 1
+
+    def hedge_delay(self) -> float | None:
+        with self._lock:
+            if len(self._samples) < self._policy.min_samples:
+                return None
+            # Re-sorting on every call is wasteful; refresh every few samples.
+            if self._threshold is None or self._dirty >= 16:
+                ordered = sorted(self._samples)
+                rank = math.ceil(len(ordered) * self._policy.percentile / 100)
+                self._threshold = ordered[max(0, rank - 1)]
+                self._dirty = 0
+            return max(self._threshold, self._policy.min_delay_seconds)
+
+
+def deadline_at(budget_seconds: float | None) -> float | None:
+    return None if budget_seconds is None else time.monotonic() + budget_seconds
+
+
+def remaining_seconds(deadline: float | None, request: httpx.Request | None = None) -> float | None:
+    if deadline is None:
+        return None
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise DeadlineExceeded("Limiq.io call deadline exceeded", request=request)
+    return remaining
+
+
+def timeout_header(remaining: float | None) -> dict[str, str]:
+    if remaining is None:
+        return {}
+    return {REQUEST_TIMEOUT_HEADER: str(max(1, int(remaining * 1000)))}
+
+
+def _retry_after_seconds(response: httpx.Response) -> float | None:
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_delay(
+    policy: RetryPolicy | None,
+    *,
+    attempt: int,
+    deadline: float | None,
+    response: httpx.Response | None = None,
+) -> float | None:
+    # Returns how long to sleep before the next attempt, or None to give up.
+    if policy is None or attempt >= policy.max_attempts:
+        return None
+    if response is not None and response.status_code not in policy.retry_statuses:
+        return None
+
+    # Full jitter: uniform over [0, capped exponential backoff].
+    delay = random.uniform(
+        0.0, min(policy.backoff_max_seconds, policy.backoff_base_seconds * 2 ** (attempt - 1))
+    )
+    if response is not None and policy.respect_retry_after:
+        retry_after = _retry_after_seconds(response)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+
+    if deadline is not None and time.monotonic() + delay >= deadline:
+        return None
+    return delay
@@ -0,0 +1,184 @@
+import base64
+import binascii
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable, Mapping
+from typing import Any
+
+from nacl.exceptions import BadSignatureError
+from nacl.signing import VerifyKey
+
+from limiq_sdk.client import LimiqClient
+
+logger = logging.getLogger("limiq_sdk.tokens")
+
+_REQUIRED_CLAIMS = ("sub", "workspace_id", "exp", "iat", "jti")
+_MAX_CACHED_TOKENS = 4096
+
+
+class CapabilityTokenError(ValueError):
+    # reason_code is the one /verify would return for the same token.
+    def __init__(self, reason_code: str) -> None:
+        super().__init__(reason_code)
+        self.reason_code = reason_code
+
+
+def _b64url_decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+def _verify_key(raw: bytes) -> VerifyKey | None:
+    return VerifyKey(raw) if len(raw) == 32 else None
+
+
+def _verify_capability_token(token: str, keys: Mapping[str, VerifyKey]) -> dict[str, Any]:
+    # Same checks as the API's decode_capability_token minus the time-based ones,
+    # which _check_token_times applies on every call so the result can be cached.
+    try:
+        header_raw, claims_raw, signature_raw = token.split(".")
+        header = json.loads(_b64url_decode(header_raw))
+        claims = json.loads(_b64url_decode(claims_raw))
+        signature = _b64url_decode(signature_raw)
+    except (ValueError, binascii.Error):
+        raise CapabilityTokenError("CAPABILITY_INVALID") from None
+
+    if not isinstance(header, dict) or header.get("alg") != "EdDSA":
+        raise CapabilityTokenError("CAPABILITY_INVALID")
+    kid = header.get("kid")
+    key = keys.get(kid) if isinstance(kid, str) else None
+    if key is None and kid is None and len(keys) == 1:
+        key = next(iter(keys.values()))
+    if key is None:
+        raise CapabilityTokenError("CAPABILITY_INVALID")
+
+    try:
+        key.verify(f"{header_raw}.{claims_raw}".encode("ascii"), signature)
+    except (BadSignatureError, ValueError):
+        raise CapabilityTokenError("CAPABILITY_INVALID") from None
+
+    if not isinstance(claims, dict) or any(name not in claims for name in _REQUIRED_CLAIMS):
+        raise CapabilityTokenError("CAPABILITY_INVALID")
+    for name in ("exp", "iat", "nbf"):
+        if name in claims and (
+            isinstance(claims[name], bool) or not isinstance(claims[name], int | float)
+        ):
+            raise CapabilityTokenError("CAPABILITY_INVALID")
+    return claims
+
+
+def _check_token_times(claims: Mapping[str, Any], *, now: float, leeway: float) -> None:
+    if now - leeway >= claims["exp"]:
+        raise CapabilityTokenError("CAPABILITY_EXPIRED")
+    if now + leeway < claims["iat"] or now + leeway < claims.get("nbf", now):
+        raise CapabilityTokenError("CAPABILITY_INVALID")
+
+
+def _token_kid(token: str) -> str | None:
+    try:
+        header = json.loads(_b64url_decode(token.split(".", 1)[0]))
+    except (ValueError, binascii.Error):
+        return None
+    kid = header.get("kid") if isinstance(header, dict) else None
+    return kid if isinstance(kid, str) else None
+
+
+# Checks capability tokens without calling the API, against the keys published on
+# /.well-known/jwks.json. A gateway can turn away expired, forged or foreign tokens
+# before they reach /verify; revocation, policy and signature checks stay with /verify.
+class CapabilityTokenVerifier:
+    def __init__(
+        self,
+        client: LimiqClient,
+        *,
+        leeway_seconds: float = 5.0,
+        default_max_age_seconds: float = 300.0,
+        min_refresh_interval_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._client = client
+        self._leeway = leeway_seconds
+        self._default_max_age = default_max_age_seconds
+        self._min_refresh_interval = min_refresh_interval_seconds
+        self._clock = clock
+        self._refresh_lock = threading.Lock()
+        self._keys: dict[str, VerifyKey] = {}
+        self._etag: str | None = None
+        self._fresh_until: float | None = None
+        self._fetched_at: float | None = None
+        self._token_claims: dict[str, dict[str, Any]] = {}
+
+    def verify(self, token: str, *, agent_id: str | None = None) -> dict[str, Any]:
+        # Returns the token claims, or raises CapabilityTokenError.
+        keys = self._current_keys()
+        claims = self._token_claims.get(token)
+        if claims is None:
+            kid = _token_kid(token)
+            if kid is not None and kid not in keys and self._refresh_due_to_unknown_kid():
+                # Possibly a key published after our last fetch.
+                keys = self._keys
+            claims = _verify_capability_token(token, keys)
+            if len(self._token_claims) >= _MAX_CACHED_TOKENS:
+                self._token_claims.clear()
+            self._token_claims[token] = claims
+
+        _check_token_times(claims, now=time.time(), leeway=self._leeway)
+        if str(claims["workspace_id"]) != self._client.workspace_id or (
+            agent_id is not None and str(claims["sub"]) != agent_id
+        ):
+            raise CapabilityTokenError("WORKSPACE_MISMATCH")
+        return claims
+
+    def refresh(self) -> None:
+        with self._refresh_lock:
+            self._fetch_locked()
+
+    def _current_keys(self) -> dict[str, VerifyKey]:
+        fresh_until = self._fresh_until
+        if fresh_until is None or self._clock() >= fresh_until:
+            with self._refresh_lock:
+                # Another thread may have refreshed while we waited for the lock.
+                if self._fresh_until is None or self._clock() >= self._fresh_until:
+                    self._refresh_or_keep_stale_locked()
+        return self._keys
+
+    def _refresh_due_to_unknown_kid(self) -> bool:
+        # Rate-limited, so tokens with made-up kids cannot make every call a fetch.
+        with self._refresh_lock:
+            if (
+                self._fetched_at is not None
+                and self._clock() - self._fetched_at < self._min_refresh_interval
+            ):
+                return False
+            self._refresh_or_keep_stale_locked()
+            return True
+
+    def _refresh_or_keep_stale_locked(self) -> None:
+        try:
+            self._fetch_locked()
+        except Exception:
+            if not self._keys:
+                raise
+            # Keys rotate with an overlap, so the last known set stays usable for a while.
+            logger.warning("jwks_refresh_failed", exc_info=True)
+            self._fresh_until = self._clock() + self._min_refresh_interval
+
+    def _fetch_locked(self) -> None:
+        result = self._client.get_jwks(etag=self._etag)
+        now = self._clock()
+        if result["keys"] is not None:
+            keys: dict[str, VerifyKey] = {}
+            for jwk in result["keys"]:
+                if jwk.get("kty") != "OKP" or jwk.get("crv") != "Ed25519":
+                    continue
+                key = _verify_key(_b64url_decode(jwk["x"]))
+                if key is not None:
+                    keys[jwk["kid"]] = key
+            if keys != self._keys:
+                self._token_claims = {}
+            self._keys = keys
+        self._etag = result["etag"]
+        max_age = result["max_age"]
+        self._fetched_at = now
+        self._fresh_until = now + (self._default_max_age if max_age is None else max_age)
@@ -48,3 +48,58 @@ class CapabilityResponse(TypedDict):
     jti: str
     issued_at: str
     expires_at: str
+
+
+class AuditIntegrityResult(TypedDict):
+    workspace_id: str | None
+    status: Literal["OK", "BROKEN", "PARTIAL"]
+    checked_count: int
+    broken_at_event_id: str | None
+    message: str
+
+
+class VerifierState(TypedDict):
+    workspace_id: str
+    as_of: str
+    cursor: int
+    jwt_keys: list[dict[str, str]]
+    agents: list[dict[str, Any]]
+    policies: list[dict[str, Any]]
+    bindings: list[dict[str, Any]]
+    capabilities: list[dict[str, Any]]
+    revoked_jtis: list[str]
+
+
+class JwksFetchResult(TypedDict):
+    keys: list[dict[str, str]] | None  # None when the server answered 304 Not Modified
+    etag: str | None
+    max_age: float | None
+
+
+class StateChange(TypedDict):
+    cursor: int
+    change_type: str
+    entity_type: Literal["agent", "policy", "binding", "revocation"]
+    entity_id: str
+    data: dict[str, Any]
+    created_at: str
+
+
+class StateChangesPage(TypedDict):
+    items: list[StateChange]
+    next_cursor: int
+
+
+class LocalDecisionRecord(TypedDict):
+    agent_id: str
+    action_type: str
+    target_service: str
+    decision: Literal["ALLOW", "DENY"]
+    reason_code: str | None
+    jti: str | None
+    decided_at: str
+
+
+class LocalVerifyResponse(TypedDict):
+    decision: Literal["ALLOW", "DENY"]
+    reason_code: str | None
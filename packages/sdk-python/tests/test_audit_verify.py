@@ -0,0 +1,128 @@
+import gzip
+import json
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+from limiq_sdk import audit_verify
+from limiq_sdk.audit_verify import compute_audit_event_hash, main, verify_audit_chain
+
+WORKSPACE_ID = "22222222-2222-2222-2222-222222222222"
+
+
+def _build_chain(count: int) -> list[dict[str, object]]:
+    records: list[dict[str, object]] = []
+    prev_hash: str | None = None
+    for index in range(count):
+        record: dict[str, object] = {
+            "id": str(uuid4()),
+            "workspace_id": WORKSPACE_ID,
+            "event_time": f"2026-03-01T10:00:{index % 60:02d}.{index:06d}+00:00",
+            "event_type": "action.verification.allowed",
+            "actor_type": "system",
+            "actor_id": None,
+            "subject_type": "agent",
+            "subject_id": str(uuid4()),
+            "event_data": {"decision": "ALLOW", "montant": index, "note": "café"},
+            "payload_hash": None,
+            "prev_hash": prev_hash,
+        }
+        record["event_hash"] = compute_audit_event_hash(record)
+        prev_hash = str(record["event_hash"])
+        records.append(record)
+    return records
+
+
+def _write_ndjson(path: Path, records: list[dict[str, object]]) -> Path:
+    path.write_text(
+        "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records),
+        encoding="utf-8",
+    )
+    return path
+
+
+def test_verify_audit_chain_ok(tmp_path: Path) -> None:
+    source = _write_ndjson(tmp_path / "chain.ndjson", _build_chain(5))
+
+    result = verify_audit_chain(source, workers=1)
+
+    assert result["status"] == "OK"
+    assert result["checked_count"] == 5
+    assert result["workspace_id"] == WORKSPACE_ID
+
+
+def test_verify_audit_chain_broken_after_tamper(tmp_path: Path) -> None:
+    records = _build_chain(4)
+    records[2]["event_data"] = {"decision": "DENY", "reason_code": "TAMPERED"}
+    source = _write_ndjson(tmp_path / "chain.ndjson", records)
+
+    result = verify_audit_chain(source, workers=1)
+
+    assert result["status"] == "BROKEN"
+    assert result["broken_at_event_id"] == records[2]["id"]
+    assert result["checked_count"] == 3
+
+
+def test_verify_audit_chain_mid_chain_start_matches_server_window_rule(tmp_path: Path) -> None:
+    records = _build_chain(4)[1:]
+    source = _write_ndjson(tmp_path / "chain.ndjson", records)
+
+    windowed = verify_audit_chain(source, workers=1, windowed=True)
+    assert windowed["status"] == "PARTIAL"
+    assert windowed["broken_at_event_id"] is None
+
+    # Without a `from` bound the server expects the genesis event first.
+    unbounded = verify_audit_chain(source, workers=1)
+    assert unbounded["status"] == "BROKEN"
+    assert unbounded["broken_at_event_id"] == records[0]["id"]
+    assert unbounded["checked_count"] == 1
+
+
+def test_verify_audit_chain_parallel_chunks_detect_boundary_break(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(audit_verify, "_MIN_CHUNK_BYTES", 512)
+    records = _build_chain(40)
+    ok_source = _write_ndjson(tmp_path / "ok.ndjson", records)
+    assert len(audit_verify._split_file(ok_source, 4)) == 4
+
+    assert verify_audit_chain(ok_source, workers=4)["status"] == "OK"
+
+    dropped = records[:20] + records[21:]
+    broken_source = _write_ndjson(tmp_path / "broken.ndjson", dropped)
+    result = verify_audit_chain(broken_source, workers=4)
+
+    assert result["status"] == "BROKEN"
+    assert result["broken_at_event_id"] == records[21]["id"]
+    assert result["checked_count"] == 21
+
+
+def test_verify_audit_chain_gzip_shard_directory(tmp_path: Path) -> None:
+    records = _build_chain(9)
+    shards = tmp_path / "shards"
+    shards.mkdir()
+    for index in range(3):
+        chunk = records[index * 3 : (index + 1) * 3]
+        with gzip.open(shards / f"part-{index:04d}.ndjson.gz", "wt", encoding="utf-8") as handle:
+            handle.writelines(json.dumps(record) + "\n" for record in chunk)
+
+    result = verify_audit_chain(shards, workers=2)
+
+    assert result["status"] == "OK"
+    assert result["checked_count"] == 9
+
+
+def test_cli_reports_json_and_exit_code(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    records = _build_chain(3)
+    records[1]["event_hash"] = None
+    source = _write_ndjson(tmp_path / "chain.ndjson", records)
+
+    exit_code = main([str(source), "--workers", "1"])
+
+    output = json.loads(capsys.readouterr().out)
+    assert exit_code == 3
+    assert output["status"] == "PARTIAL"
+    assert output["checked_count"] == 2
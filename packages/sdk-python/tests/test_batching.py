@@ -0,0 +1,135 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from limiq_sdk import AsyncLimiqClient, LimiqClient, VerifyBatcher
+from limiq_sdk.types import VerifyRequestBody
+
+
+def _payload(agent_id: str) -> VerifyRequestBody:
+    return {
+        "workspace_id": "workspace-1",
+        "agent_id": agent_id,
+        "action_type": "purchase",
+        "target_service": "stripe_proxy",
+        "payload": {"amount": 18},
+        "signature": "sig",
+        "capability_token": "tok",
+        "request_context": {},
+    }
+
+
+class _Server:
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.batch_sizes: list[int] = []
+
+    def _reply(self, request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/verify/batch"
+        items = json.loads(request.content)["items"]
+        self.batch_sizes.append(len(items))
+        if any(item["agent_id"] == "agent-fail" for item in items):
+            return httpx.Response(status_code=500, json={"detail": "boom"})
+        return httpx.Response(
+            status_code=200,
+            json={
+                "results": [
+                    {"decision": "ALLOW", "reason_code": None, "audit_event_id": item["agent_id"]}
+                    for item in items
+                ]
+            },
+        )
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return self._reply(request)
+
+
+def _client(server: _Server) -> AsyncLimiqClient:
+    return AsyncLimiqClient(
+        base_url="http://example.test",
+        workspace_id="workspace-1",
+        transport=httpx.MockTransport(server.handler),
+    )
+
+
+def test_verify_batch_posts_items_and_returns_results_in_order() -> None:
+    server = _Server()
+    with LimiqClient(
+        base_url="http://example.test",
+        workspace_id="workspace-1",
+        transport=httpx.MockTransport(server._reply),
+    ) as client:
+        results = client.verify_batch([_payload("agent-1"), _payload("agent-2")])
+
+    assert [result["audit_event_id"] for result in results] == ["agent-1", "agent-2"]
+    assert server.batch_sizes == [2]
+
+
+def test_batcher_sends_one_request_per_batch_and_bounds_in_flight_batches() -> None:
+    server = _Server()
+
+    async def run() -> None:
+        async with (
+            _client(server) as client,
+            VerifyBatcher(client, max_batch_size=8, max_in_flight=2) as batcher,
+        ):
+            agent_ids = [f"agent-{index}" for index in range(20)]
+            results = await asyncio.gather(
+                *(batcher.verify_action(_payload(agent_id)) for agent_id in agent_ids)
+            )
+            assert [result["audit_event_id"] for result in results] == agent_ids
+
+    asyncio.run(run())
+    assert server.batch_sizes == [8, 8, 4]
+    assert server.max_in_flight == 2
+
+
+def test_batcher_fails_every_caller_of_a_failed_batch() -> None:
+    server = _Server()
+
+    async def run() -> None:
+        async with _client(server) as client, VerifyBatcher(client) as batcher:
+            ok, failed = await asyncio.gather(
+                batcher.verify_action(_payload("agent-ok")),
+                batcher.verify_action(_payload("agent-fail")),
+                return_exceptions=True,
+            )
+            assert isinstance(ok, httpx.HTTPStatusError)
+            assert isinstance(failed, httpx.HTTPStatusError)
+
+    asyncio.run(run())
+    assert server.batch_sizes == [2]
+
+
+def test_batcher_flushes_partial_batch_after_delay_and_rejects_after_close() -> None:
+    server = _Server()
+
+    async def run() -> None:
+        async with _client(server) as client:
+            batcher = VerifyBatcher(client, max_batch_size=100, max_delay_seconds=0.01)
+            result = await asyncio.wait_for(batcher.verify_action(_payload("agent-1")), 1.0)
+            assert result["decision"] == "ALLOW"
+            await batcher.aclose()
+            with pytest.raises(RuntimeError):
+                await batcher.verify_action(_payload("agent-2"))
+
+    asyncio.run(run())
+    assert server.batch_sizes == [1]
+
+
+def test_batcher_rejects_batches_larger_than_the_api_accepts() -> None:
+    async def run() -> None:
+        async with AsyncLimiqClient(
+            base_url="http://example.test", workspace_id="workspace-1"
+        ) as client:
+            with pytest.raises(ValueError):
+                VerifyBatcher(client, max_batch_size=101)
+
+    asyncio.run(run())
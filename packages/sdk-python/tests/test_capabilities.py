@@ -0,0 +1,287 @@
+import asyncio
+import base64
+import json
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from itertools import count
+
+import httpx
+
+from limiq_sdk import (
+    AsyncCapabilityManager,
+    AsyncLimiqClient,
+    CapabilityManager,
+    LimiqClient,
+    extract_capability_jti,
+    generate_keys,
+    verify_signature,
+)
+from limiq_sdk.capabilities import capability_key
+from limiq_sdk.types import CapabilityResponse
+
+WORKSPACE_ID = "22222222-2222-2222-2222-222222222222"
+AGENT_ID = "11111111-1111-1111-1111-111111111111"
+
+
+class _Issuer:
+    def __init__(self, *, lifetime_seconds: float = 900.0, delay_seconds: float = 0.0) -> None:
+        self.requests: list[dict[str, object]] = []
+        self._sequence = count(1)
+        self._lifetime = lifetime_seconds
+        self._delay = delay_seconds
+        self._lock = threading.Lock()
+
+    def _response(self, request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/capabilities/request"
+        with self._lock:
+            self.requests.append(json.loads(request.content))
+            jti = f"jti-{next(self._sequence)}"
+        claims = base64.urlsafe_b64encode(json.dumps({"jti": jti}).encode()).decode().rstrip("=")
+        issued_at = datetime.now(tz=UTC)
+        return httpx.Response(
+            status_code=201,
+            json={
+                "token": f"eyJhbGciOiJFZERTQSJ9.{claims}.sig",
+                "jti": jti,
+                "issued_at": issued_at.isoformat(),
+                "expires_at": (issued_at + timedelta(seconds=self._lifetime)).isoformat(),
+            },
+        )
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        time.sleep(self._delay)
+        return self._response(request)
+
+    async def async_handler(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self._delay)
+        return self._response(request)
+
+
+def _client(issuer: _Issuer) -> LimiqClient:
+    return LimiqClient(
+        base_url="http://example.test",
+        workspace_id=WORKSPACE_ID,
+        transport=httpx.MockTransport(issuer.handler),
+    )
+
+
+def test_manager_caches_per_key_and_ignores_scope_order() -> None:
+    issuer = _Issuer()
+    with _client(issuer) as client, CapabilityManager(client, background_refresh=False) as manager:
+        first = manager.get_capability(
+            agent_id=AGENT_ID,
+            action="purchase",
+            target_service="stripe_proxy",
+            scopes=["purchase", "refund"],
+            limits={"amount": 20, "currency": "EUR"},
+        )
+        again = manager.get_capability(
+            agent_id=AGENT_ID,
+            action="purchase",
+            target_service="stripe_proxy",
+            scopes=["refund", "purchase"],
+            limits={"currency": "EUR", "amount": 20},
+        )
+        other = manager.get_capability(
+            agent_id=AGENT_ID,
+            action="purchase",
+            target_service="stripe_proxy",
+            scopes=["purchase", "refund"],
+            limits={"amount": 50, "currency": "EUR"},
+        )
+
+    assert first == again
+    assert other["jti"] != first["jti"]
+    assert len(issuer.requests) == 2
+    assert issuer.requests[0] == {
+        "workspace_id": WORKSPACE_ID,
+        "agent_id": AGENT_ID,
+        "action": "purchase",
+        "target_service": "stripe_proxy",
+        "requested_scopes": ["purchase", "refund"],
+        "requested_limits": {"amount": 20, "currency": "EUR"},
+        "ttl_minutes": 15,
+    }
+
+
+def test_manager_reissues_when_token_is_about_to_expire() -> None:
+    now = [1000.0]
+    issuer = _Issuer(lifetime_seconds=300)
+    with _client(issuer) as client:
+        manager = CapabilityManager(
+            client, background_refresh=False, min_remaining_seconds=5.0, clock=lambda: now[0]
+        )
+        first = manager.get_capability(
+            agent_id=AGENT_ID, action="purchase", target_service="stripe_proxy"
+        )
+        now[0] += 290
+        assert (
+            manager.get_capability(
+                agent_id=AGENT_ID, action="purchase", target_service="stripe_proxy"
+            )
+            == first
+        )
+        now[0] += 6
+        renewed = manager.get_capability(
+            agent_id=AGENT_ID, action="purchase", target_service="stripe_proxy"
+        )
+
+    assert renewed["jti"] != first["jti"]
+    assert len(issuer.requests) == 2
+
+
+def test_manager_coalesces_concurrent_misses_across_threads() -> None:
+    issuer = _Issuer(delay_seconds=0.05)
+    results: list[str] = []
+    with _client(issuer) as client, CapabilityManager(client, background_refresh=False) as manager:
+
+        def worker() -> None:
+            capability = manager.get_capability(
+                agent_id=AGENT_ID, action="purchase", target_service="stripe_proxy"
+            )
+            results.append(capability["jti"])
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert len(issuer.requests) == 1
+    assert results == ["jti-1"] * 8
+
+
+def test_manager_refreshes_used_tokens_in_background() -> None:
+    issuer = _Issuer(lifetime_seconds=1.0)
+    with (
+        _client(issuer) as client,
+        CapabilityManager(
+            client, refresh_before_ratio=0.5, jitter_ratio=0.0, min_remaining_seconds=0.0
+        ) as manager,
+    ):
+        first = manager.get_capability(
+            agent_id=AGENT_ID, action="purchase", target_service="stripe_proxy"
+        )
+        manager.get_capability(agent_id=AGENT_ID, action="purchase", target_service="stripe_proxy")
+
+        deadline = time.monotonic() + 2.0
+        while len(issuer.requests) < 2 and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+        refreshed = manager.get_capability(
+            agent_id=AGENT_ID, action="purchase", target_service="stripe_proxy"
+        )
+
+    assert len(issuer.requests) == 2
+    assert refreshed["jti"] != first["jti"]
+
+
+def test_manager_build_signed_request_uses_cached_capability() -> None:
+    issuer = _Issuer()
+    keys = generate_keys()
+    with _client(issuer) as client, CapabilityManager(client, background_refresh=False) as manager:
+        bodies = [
+            manager.build_signed_request(
+                agent_id=AGENT_ID,
+                action_type="purchase",
+                target_service="stripe_proxy",
+                payload={"amount": 18, "currency": "EUR"},
+                private_key_base64=keys["private_key_base64"],
+                limits={"amount": 20, "currency": "EUR"},
+            )
+            for _ in range(3)
+        ]
+
+    assert len(issuer.requests) == 1
+    body = bodies[0]
+    assert body["workspace_id"] == WORKSPACE_ID
+    assert extract_capability_jti(body["capability_token"]) == "jti-1"
+    canonical = json.dumps(
+        {
+            "agent_id": AGENT_ID,
+            "workspace_id": WORKSPACE_ID,
+            "action_type": "purchase",
+            "target_service": "stripe_proxy",
+            "payload": {"amount": 18, "currency": "EUR"},
+            "capability_jti": "jti-1",
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    assert verify_signature(
+        public_key_base64=keys["public_key_base64"],
+        signature_base64=body["signature"],
+        canonical_json=canonical,
+    )
+
+
+def test_async_manager_coalesces_and_caches() -> None:
+    issuer = _Issuer(delay_seconds=0.05)
+
+    async def run() -> None:
+        async with (
+            AsyncLimiqClient(
+                base_url="http://example.test",
+                workspace_id=WORKSPACE_ID,
+                transport=httpx.MockTransport(issuer.async_handler),
+            ) as client,
+            AsyncCapabilityManager(client) as manager,
+        ):
+            results = await asyncio.gather(
+                *(
+                    manager.get_capability(
+                        agent_id=AGENT_ID, action="purchase", target_service="stripe_proxy"
+                    )
+                    for _ in range(8)
+                )
+            )
+            assert {result["jti"] for result in results} == {"jti-1"}
+            cached = await manager.get_capability(
+                agent_id=AGENT_ID, action="purchase", target_service="stripe_proxy"
+            )
+            assert cached["jti"] == "jti-1"
+
+    asyncio.run(run())
+    assert len(issuer.requests) == 1
+
+
+def test_async_manager_cancelling_the_first_caller_does_not_fail_other_waiters() -> None:
+    issuer = _Issuer(delay_seconds=0.05)
+
+    async def run() -> None:
+        async with (
+            AsyncLimiqClient(
+                base_url="http://example.test",
+                workspace_id=WORKSPACE_ID,
+                transport=httpx.MockTransport(issuer.async_handler),
+            ) as client,
+            AsyncCapabilityManager(client) as manager,
+        ):
+
+            def request() -> asyncio.Task[CapabilityResponse]:
+                return asyncio.create_task(
+                    manager.get_capability(
+                        agent_id=AGENT_ID, action="purchase", target_service="stripe_proxy"
+                    )
+                )
+
+            owner = request()
+            await asyncio.sleep(0.01)
+            waiter = request()
+            await asyncio.sleep(0)
+            owner.cancel()
+
+            result = await waiter
+            assert owner.cancelled()
+            assert result["jti"] == "jti-1"
+
+    asyncio.run(run())
+    assert len(issuer.requests) == 1
+
+
+def test_capability_key_defaults_scopes_to_action() -> None:
+    key = capability_key(agent_id=AGENT_ID, action="purchase", target_service="stripe_proxy")
+    assert key.scopes == ("purchase",)
+    assert key.limits == "{}"
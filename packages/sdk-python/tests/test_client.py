@@ -1,6 +1,8 @@
 import asyncio
+from typing import Any
 
 import httpx
+import pytest
 
 from limiq_sdk.client import AsyncLimiqClient, LimiqClient
 
@@ -65,3 +67,54 @@ def test_async_client_verify_action() -> None:
         assert result["decision"] == "DENY"
 
     asyncio.run(run())
+
+
+def _allow_handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(
+        status_code=200,
+        json={
+            "decision": "ALLOW",
+            "reason_code": None,
+            "audit_event_id": "00000000-0000-0000-0000-000000000000",
+        },
+    )
+
+
+def test_sync_client_reuses_pooled_client_until_closed(monkeypatch: pytest.MonkeyPatch) -> None:
+    opened: list[httpx.Client] = []
+    original_init = httpx.Client.__init__
+
+    def tracking_init(self: httpx.Client, *args: Any, **kwargs: Any) -> None:
+        opened.append(self)
+        original_init(self, *args, **kwargs)
+
+    monkeypatch.setattr(httpx.Client, "__init__", tracking_init)
+
+    with LimiqClient(
+        base_url="http://example.test/",
+        workspace_id="workspace-1",
+        transport=httpx.MockTransport(_allow_handler),
+    ) as sdk:
+        for _ in range(3):
+            assert sdk.verify_action(_verify_payload())["decision"] == "ALLOW"
+        assert not sdk.is_closed
+
+    assert len(opened) == 1
+    assert sdk.is_closed
+
+
+def test_async_client_context_manager_closes_pool() -> None:
+    async def run() -> None:
+        async with AsyncLimiqClient(
+            base_url="http://example.test",
+            workspace_id="workspace-1",
+            transport=httpx.MockTransport(_allow_handler),
+            limits=httpx.Limits(max_connections=4, max_keepalive_connections=4),
+        ) as sdk:
+            results = await asyncio.gather(
+                *(sdk.verify_action(_verify_payload()) for _ in range(8))
+            )
+            assert {result["decision"] for result in results} == {"ALLOW"}
+        assert sdk.is_closed
+
+    asyncio.run(run())
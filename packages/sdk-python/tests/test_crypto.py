@@ -2,11 +2,13 @@ import base64
 
 from limiq_sdk.client import build_signed_request
 from limiq_sdk.crypto import (
+    AgentSigner,
     extract_capability_jti,
     generate_keys,
     sign_action,
     verify_signature,
 )
+from limiq_sdk.types import VerifyEnvelope
 
 
 def _fake_token(jti: str) -> str:
@@ -61,3 +63,37 @@ def test_build_signed_request_shape() -> None:
 
     assert request["signature"]
     assert request["request_context"] == {}
+
+
+def _actions(count: int) -> list[VerifyEnvelope]:
+    return [
+        {
+            "agent_id": "11111111-1111-1111-1111-111111111111",
+            "workspace_id": "22222222-2222-2222-2222-222222222222",
+            "action_type": "purchase",
+            "target_service": "stripe_proxy",
+            "payload": {
+                "amount": index,
+                "currency": "EUR",
+                "note": "Café crème 😀" if index % 2 else "plain",
+                "items": [{"sku": f"sku-{index}", "price": 9.25}],
+            },
+            "capability_jti": f"jti-{index}",
+        }
+        for index in range(count)
+    ]
+
+
+def test_agent_signer_is_byte_identical_to_sign_action() -> None:
+    keys = generate_keys()
+    actions = _actions(16)
+    expected = [
+        sign_action(**action, private_key_base64=keys["private_key_base64"]) for action in actions
+    ]
+
+    with AgentSigner(private_key_base64=keys["private_key_base64"], processes=2) as signer:
+        assert signer.public_key_base64 == keys["public_key_base64"]
+        assert [signer.sign(**action) for action in actions] == expected
+        assert signer.sign_many(actions) == expected
+        assert signer.sign_many(actions, parallel=True) == expected
+        assert signer.sign_many([], parallel=True) == []
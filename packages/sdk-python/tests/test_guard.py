@@ -0,0 +1,299 @@
+import asyncio
+import json
+from typing import Annotated, Any
+
+import httpx
+import pytest
+
+from limiq_sdk import ActionGuard, AsyncLimiqClient, CircuitBreakerPolicy, GuardOutcome
+from limiq_sdk.resilience import REQUEST_TIMEOUT_HEADER
+from limiq_sdk.types import VerifyRequestBody
+
+
+def _body(*, token: str = "tok", agent_id: str = "agent-1") -> VerifyRequestBody:
+    return {
+        "workspace_id": "workspace-1",
+        "agent_id": agent_id,
+        "action_type": "purchase",
+        "target_service": "stripe_proxy",
+        "payload": {"amount": 18},
+        "signature": "sig",
+        "capability_token": token,
+        "request_context": {},
+    }
+
+
+class _Server:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.status = 200
+        self.code = "BOOM"
+        self.delay = 0.0
+        self.headers: dict[str, str] = {}
+        self.timeout_headers: list[str | None] = []
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        self.timeout_headers.append(request.headers.get(REQUEST_TIMEOUT_HEADER))
+        await asyncio.sleep(self.delay)
+        if self.status != 200:
+            return httpx.Response(
+                self.status,
+                headers=self.headers,
+                json={"detail": {"code": self.code, "message": "x"}},
+            )
+        token = json.loads(request.content)["capability_token"]
+        if token == "tok":
+            return httpx.Response(
+                200, json={"decision": "ALLOW", "reason_code": None, "audit_event_id": "e1"}
+            )
+        reason = "SIGNATURE_INVALID" if token == "bad-signature" else "CAPABILITY_REVOKED"
+        return httpx.Response(
+            200, json={"decision": "DENY", "reason_code": reason, "audit_event_id": "e2"}
+        )
+
+
+def _client(server: _Server) -> AsyncLimiqClient:
+    return AsyncLimiqClient(
+        base_url="http://example.test",
+        workspace_id="workspace-1",
+        transport=httpx.MockTransport(server.handler),
+    )
+
+
+def test_guard_caches_token_level_denials_only() -> None:
+    server = _Server()
+    now = [0.0]
+    seen: list[GuardOutcome] = []
+    guard = ActionGuard(
+        _client(server),
+        negative_cache_ttl_seconds=5,
+        clock=lambda: now[0],
+        on_outcome=lambda outcome, _: seen.append(outcome),
+    )
+
+    async def run() -> None:
+        assert (await guard.verify(_body())).decision == "ALLOW"
+        revoked = [await guard.verify(_body(token="revoked")) for _ in range(3)]
+        assert [outcome.source for outcome in revoked] == [
+            "api",
+            "negative_cache",
+            "negative_cache",
+        ]
+        assert {outcome.reason_code for outcome in revoked} == {"CAPABILITY_REVOKED"}
+        assert server.calls == 2
+
+        # A bad signature depends on the payload, so it is always re-checked.
+        for _ in range(2):
+            await guard.verify(_body(token="bad-signature"))
+        assert server.calls == 4
+
+        now[0] = 6
+        assert (await guard.verify(_body(token="revoked"))).source == "api"
+        assert server.calls == 5
+
+    asyncio.run(run())
+
+    stats = guard.stats()
+    assert (stats.calls, stats.allowed, stats.denied, stats.negative_cache_hits) == (7, 1, 6, 2)
+    assert stats.latency_p50_ms is not None
+    assert len(seen) == 7
+
+
+def test_guard_circuit_breaker_opens_then_recovers_after_trial() -> None:
+    server = _Server()
+    now = [0.0]
+    guard = ActionGuard(
+        _client(server),
+        circuit_breaker=CircuitBreakerPolicy(failure_threshold=2, reset_timeout_seconds=10),
+        clock=lambda: now[0],
+    )
+
+    async def run() -> None:
+        server.status = 500
+        for _ in range(2):
+            outcome = await guard.verify(_body())
+            assert (outcome.decision, outcome.reason_code) == ("DENY", "VERIFIER_UNAVAILABLE")
+        assert guard.circuit_state == "open"
+
+        # Open: no calls reach the API.
+        assert (await guard.verify(_body())).source == "fail_closed"
+        assert server.calls == 2
+
+        now[0] = 11
+        server.status = 200
+        assert (await guard.verify(_body())).decision == "ALLOW"
+        assert guard.circuit_state == "closed"
+
+        # The API refusing a request is not an outage.
+        server.status = 422
+        for _ in range(3):
+            outcome = await guard.verify(_body())
+            assert (outcome.reason_code, outcome.status_code) == ("BOOM", 422)
+        assert guard.circuit_state == "closed"
+
+    asyncio.run(run())
+    assert guard.stats().upstream_failures == 2
+
+
+def test_guard_429_fails_closed_and_honours_retry_after_without_tripping_breaker() -> None:
+    server = _Server()
+    now = [0.0]
+    guard = ActionGuard(
+        _client(server),
+        fail_open=True,
+        circuit_breaker=CircuitBreakerPolicy(failure_threshold=1),
+        clock=lambda: now[0],
+    )
+
+    async def run() -> None:
+        server.status = 429
+        server.headers = {"Retry-After": "2"}
+        outcome = await guard.verify(_body())
+        assert (outcome.decision, outcome.source, outcome.status_code) == ("DENY", "throttled", 429)
+        assert (outcome.reason_code, outcome.retry_after_seconds) == ("BOOM", 2.0)
+        assert guard.circuit_state == "closed"
+
+        # Within Retry-After the API is not called, and fail_open never applies.
+        now[0] = 1.5
+        waiting = await guard.verify(_body())
+        assert (waiting.decision, waiting.source, waiting.retry_after_seconds) == (
+            "DENY",
+            "throttled",
+            0.5,
+        )
+        assert server.calls == 1
+
+        now[0] = 2.5
+        server.status = 200
+        assert (await guard.verify(_body())).decision == "ALLOW"
+
+    asyncio.run(run())
+    stats = guard.stats()
+    assert (stats.throttled, stats.upstream_failures, stats.fail_open) == (2, 0, 0)
+
+
+@pytest.mark.parametrize(
+    ("status", "code", "retry_after"),
+    [
+        (429, "WORKSPACE_BUSY", "1"),
+        (503, "OVERLOADED", "1"),
+        (503, "DEADLINE_EXCEEDED", None),
+    ],
+)
+def test_guard_treats_load_shedding_replies_as_throttling(
+    status: int, code: str, retry_after: str | None
+) -> None:
+    server = _Server()
+    server.status = status
+    server.code = code
+    server.headers = {} if retry_after is None else {"Retry-After": retry_after}
+    now = [0.0]
+    guard = ActionGuard(
+        _client(server),
+        fail_open=True,
+        circuit_breaker=CircuitBreakerPolicy(failure_threshold=1),
+        clock=lambda: now[0],
+    )
+
+    async def run() -> None:
+        outcome = await guard.verify(_body())
+        assert (outcome.decision, outcome.source, outcome.status_code) == (
+            "DENY",
+            "throttled",
+            status,
+        )
+        assert outcome.reason_code == code
+        assert guard.circuit_state == "closed"
+
+        # With Retry-After the next call is denied locally; without it the API is asked.
+        again = await guard.verify(_body())
+        assert (again.decision, again.source, again.status_code) == ("DENY", "throttled", status)
+        assert server.calls == (1 if retry_after is not None else 2)
+
+    asyncio.run(run())
+    stats = guard.stats()
+    assert (stats.throttled, stats.upstream_failures, stats.fail_open) == (2, 0, 0)
+
+
+def test_guard_fail_open_and_timeout_budget() -> None:
+    server = _Server()
+    server.delay = 1.0
+    guard = ActionGuard(_client(server), timeout_seconds=0.05, fail_open=True)
+
+    async def run() -> GuardOutcome:
+        return await guard.verify(_body())
+
+    outcome = asyncio.run(run())
+
+    assert (outcome.decision, outcome.source) == ("ALLOW", "fail_open")
+    assert int(server.timeout_headers[0] or 0) <= 50
+
+
+def test_fastapi_dependency_maps_outcomes_to_responses() -> None:
+    fastapi = pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+
+    from limiq_sdk.fastapi import VerifiedAction, verified_action
+
+    server = _Server()
+    guard = ActionGuard(_client(server), circuit_breaker=CircuitBreakerPolicy(failure_threshold=1))
+    app = fastapi.FastAPI()
+
+    @app.post("/purchase")
+    async def purchase(
+        action: Annotated[VerifiedAction, fastapi.Depends(verified_action(guard))],
+    ) -> dict[str, Any]:
+        return {"executed": True, "audit_event_id": action.outcome.audit_event_id}
+
+    client = TestClient(app)
+
+    allowed = client.post("/purchase", json=_body())
+    assert allowed.json() == {"executed": True, "audit_event_id": "e1"}
+
+    denied = client.post("/purchase", json=_body(token="revoked"))
+    assert denied.status_code == 403
+    assert denied.json()["detail"]["reason_code"] == "CAPABILITY_REVOKED"
+
+    assert client.post("/purchase", json={"agent_id": "a"}).status_code == 422
+    assert client.post("/purchase", content=b"{").status_code == 400
+
+    server.status = 503
+    unavailable = client.post("/purchase", json=_body())
+    assert unavailable.status_code == 503
+    assert unavailable.json()["detail"]["code"] == "VERIFIER_UNAVAILABLE"
+
+    # A 429 is passed on to the caller with its Retry-After.
+    throttled_server = _Server()
+    throttled_server.status = 429
+    throttled_server.headers = {"Retry-After": "1"}
+    throttled_guard = ActionGuard(_client(throttled_server))
+
+    @app.post("/refund")
+    async def refund(
+        action: Annotated[VerifiedAction, fastapi.Depends(verified_action(throttled_guard))],
+    ) -> dict[str, Any]:
+        return {"executed": True}
+
+    throttled = client.post("/refund", json=_body())
+    assert throttled.status_code == 429
+    assert throttled.headers["Retry-After"] == "1"
+    assert throttled.json()["detail"]["reason_code"] == "BOOM"
+
+    # So is a 503 shed by the API's admission limiter, instead of VERIFIER_UNAVAILABLE.
+    overloaded_server = _Server()
+    overloaded_server.status = 503
+    overloaded_server.code = "OVERLOADED"
+    overloaded_server.headers = {"Retry-After": "1"}
+    overloaded_guard = ActionGuard(_client(overloaded_server), fail_open=True)
+
+    @app.post("/cancel")
+    async def cancel(
+        action: Annotated[VerifiedAction, fastapi.Depends(verified_action(overloaded_guard))],
+    ) -> dict[str, Any]:
+        return {"executed": True}
+
+    overloaded = client.post("/cancel", json=_body())
+    assert overloaded.status_code == 503
+    assert overloaded.headers["Retry-After"] == "1"
+    assert overloaded.json()["detail"]["reason_code"] == "OVERLOADED"
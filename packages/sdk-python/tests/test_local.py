@@ -0,0 +1,307 @@
+import base64
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+from limiq_sdk import (
+    LimiqClient,
+    LocalVerifier,
+    StaleStateError,
+    build_signed_request,
+    generate_keys,
+)
+from nacl.signing import SigningKey
+
+WORKSPACE_ID = "22222222-2222-2222-2222-222222222222"
+AGENT_ID = "11111111-1111-1111-1111-111111111111"
+POLICY_ID = "33333333-3333-3333-3333-333333333333"
+JWT_KEY = SigningKey.generate()
+DECISION_VECTORS_DIR = Path(__file__).resolve().parents[3] / "shared-test-vectors" / "decisions"
+
+
+def _b64url(value: bytes) -> str:
+    return base64.urlsafe_b64encode(value).rstrip(b"=").decode("ascii")
+
+
+def _token(*, jti: str = "jti-1", scopes: list[str] | None = None, exp_in: int = 900) -> str:
+    now = int(time.time())
+    header = _b64url(json.dumps({"alg": "EdDSA", "kid": "k1", "typ": "JWT"}).encode())
+    claims = _b64url(
+        json.dumps(
+            {
+                "sub": AGENT_ID,
+                "workspace_id": WORKSPACE_ID,
+                "scopes": scopes or ["purchase"],
+                "iat": now,
+                "exp": now + exp_in,
+                "jti": jti,
+            }
+        ).encode()
+    )
+    signature = _b64url(JWT_KEY.sign(f"{header}.{claims}".encode()).signature)
+    return f"{header}.{claims}.{signature}"
+
+
+class _FakeApi:
+    def __init__(self, agent_public_key: str) -> None:
+        self.agents: list[dict[str, Any]] = [
+            {"id": AGENT_ID, "status": "active", "public_key": agent_public_key}
+        ]
+        self.capabilities: list[dict[str, Any]] = [{"jti": "jti-1", "status": "active"}]
+        self.revoked_jtis: list[str] = []
+        self.changes: list[dict[str, Any]] = []
+        self.state_calls = 0
+        self.change_calls: list[str | None] = []
+        self.shipped: list[dict[str, Any]] = []
+        self.fail_ingest = False
+
+    def add_change(self, entity_type: str, data: dict[str, Any]) -> None:
+        self.changes.append(
+            {
+                "cursor": len(self.changes) + 1,
+                "change_type": f"{entity_type}.updated",
+                "entity_type": entity_type,
+                "entity_id": "x",
+                "data": data,
+                "created_at": "2026-01-01T00:00:00+00:00",
+            }
+        )
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/changes":
+            cursor = int(request.url.params["cursor"])
+            self.change_calls.append(request.url.params.get("cursor"))
+            items = self.changes[cursor:]
+            next_cursor = items[-1]["cursor"] if items else cursor
+            return httpx.Response(200, json={"items": items, "next_cursor": next_cursor})
+        if request.url.path == "/verifier/state":
+            self.state_calls += 1
+            return httpx.Response(
+                200,
+                json={
+                    "workspace_id": WORKSPACE_ID,
+                    "as_of": "2026-01-01T00:00:00+00:00",
+                    "cursor": len(self.changes),
+                    "jwt_keys": [
+                        {
+                            "kty": "OKP",
+                            "crv": "Ed25519",
+                            "kid": "k1",
+                            "x": _b64url(bytes(JWT_KEY.verify_key)),
+                        }
+                    ],
+                    "agents": self.agents,
+                    "policies": [
+                        {
+                            "id": POLICY_ID,
+                            "is_active": True,
+                            "policy_json": {
+                                "allowed_tools": ["purchase"],
+                                "spend": {"max_per_tx": 50},
+                                "rate_limits": {"max_actions_per_min": 3},
+                            },
+                        }
+                    ],
+                    "bindings": [
+                        {
+                            "agent_id": AGENT_ID,
+                            "policy_id": POLICY_ID,
+                            "status": "active",
+                        }
+                    ],
+                    "capabilities": self.capabilities,
+                    "revoked_jtis": self.revoked_jtis,
+                },
+            )
+        assert request.url.path == "/verifier/decisions"
+        if self.fail_ingest:
+            return httpx.Response(500)
+        body = json.loads(request.content)
+        self.shipped.extend(body["decisions"])
+        return httpx.Response(201, json={"accepted": len(body["decisions"])})
+
+
+@pytest.fixture
+def keys() -> dict[str, str]:
+    return generate_keys()
+
+
+@pytest.fixture
+def api(keys: dict[str, str]) -> _FakeApi:
+    return _FakeApi(keys["public_key_base64"])
+
+
+@pytest.fixture
+def client(api: _FakeApi) -> LimiqClient:
+    return LimiqClient(
+        base_url="http://example.test",
+        workspace_id=WORKSPACE_ID,
+        transport=httpx.MockTransport(api.handler),
+    )
+
+
+def _body(keys: dict[str, str], *, amount: int = 18, token: str | None = None) -> Any:
+    return build_signed_request(
+        workspace_id=WORKSPACE_ID,
+        agent_id=AGENT_ID,
+        action_type="purchase",
+        target_service="stripe_proxy",
+        payload={"amount": amount, "currency": "EUR"},
+        capability_token=token or _token(),
+        private_key_base64=keys["private_key_base64"],
+    )
+
+
+def test_local_verifier_decides_like_the_api(
+    client: LimiqClient, api: _FakeApi, keys: dict[str, str]
+) -> None:
+    with LocalVerifier(client, background=False) as verifier:
+        allowed = verifier.verify_action(_body(keys))
+        over_limit = verifier.verify_action(_body(keys, amount=500))
+        wrong_scope = verifier.verify_action(_body(keys, token=_token(scopes=["refund"])))
+        expired = verifier.verify_action(_body(keys, token=_token(exp_in=-60)))
+
+        tampered = _body(keys)
+        tampered["payload"]["amount"] = 19
+        bad_signature = verifier.verify_action(tampered)
+
+        forged = _body(keys)
+        forged["capability_token"] = forged["capability_token"][:-4] + "AAAA"
+        forged_token = verifier.verify_action(forged)
+
+    assert allowed == {"decision": "ALLOW", "reason_code": None}
+    assert over_limit["reason_code"] == "SPEND_LIMIT_EXCEEDED"
+    assert wrong_scope["reason_code"] == "CAPABILITY_SCOPE_MISMATCH"
+    assert expired["reason_code"] == "CAPABILITY_EXPIRED"
+    assert bad_signature["reason_code"] == "SIGNATURE_INVALID"
+    assert forged_token["reason_code"] == "CAPABILITY_INVALID"
+
+    # close() ships everything still queued, in one batch.
+    assert [decision["decision"] for decision in api.shipped] == ["ALLOW"] + ["DENY"] * 5
+    assert api.shipped[0]["jti"] == "jti-1"
+
+
+def test_local_verifier_applies_changes_from_the_feed(
+    client: LimiqClient, api: _FakeApi, keys: dict[str, str]
+) -> None:
+    api.add_change("revocation", {"jti": "already-in-snapshot"})
+    verifier = LocalVerifier(client, background=False)
+    verifier.start()
+    assert verifier.verify_action(_body(keys))["decision"] == "ALLOW"
+
+    api.add_change("revocation", {"jti": "jti-1"})
+    assert verifier.sync() == 1
+    assert verifier.verify_action(_body(keys))["reason_code"] == "CAPABILITY_REVOKED"
+
+    api.add_change("agent", {"id": AGENT_ID, "status": "revoked", "public_key": ""})
+    assert verifier.sync() == 1
+    assert verifier.verify_action(_body(keys))["reason_code"] == "AGENT_REVOKED"
+    assert verifier.sync() == 0
+    verifier.close()
+
+    # One snapshot, then the feed from the snapshot cursor onwards.
+    assert api.state_calls == 1
+    assert api.change_calls == ["1", "2", "3"]
+
+
+def _capability_row_cases() -> list[dict[str, Any]]:
+    vector = json.loads(
+        (DECISION_VECTORS_DIR / "capability_rows.json").read_text(encoding="utf-8")
+    )
+    cases: list[dict[str, Any]] = vector["cases"]
+    return cases
+
+
+@pytest.mark.parametrize("case", _capability_row_cases(), ids=lambda case: case["name"])
+def test_local_verifier_matches_shared_capability_row_vectors(
+    client: LimiqClient, api: _FakeApi, keys: dict[str, str], case: dict[str, Any]
+) -> None:
+    status = case["capability_row"]
+    api.capabilities = [] if status is None else [{"jti": "jti-1", "status": status}]
+
+    with LocalVerifier(client, background=False) as verifier:
+        assert verifier.verify_action(_body(keys)) == case["expected"]
+
+
+def test_local_verifier_accepts_tokens_issued_after_the_snapshot(
+    client: LimiqClient, api: _FakeApi, keys: dict[str, str]
+) -> None:
+    with LocalVerifier(client, background=False) as verifier:
+        fresh = _body(keys, token=_token(jti="jti-2"))
+        assert verifier.verify_action(fresh)["reason_code"] == "CAPABILITY_REVOKED"
+
+        api.add_change("capability", {"jti": "jti-2", "status": "active"})
+        assert verifier.sync() == 1
+        assert verifier.verify_action(fresh) == {"decision": "ALLOW", "reason_code": None}
+
+
+def test_local_verifier_enforces_rate_limit_per_window(
+    client: LimiqClient, keys: dict[str, str]
+) -> None:
+    with LocalVerifier(client, background=False) as verifier:
+        decisions = [verifier.verify_action(_body(keys))["reason_code"] for _ in range(4)]
+
+    assert decisions[-1] == "RATE_LIMIT_EXCEEDED"
+    assert decisions.count(None) >= 2
+
+
+def test_local_verifier_refuses_to_decide_on_stale_state(
+    client: LimiqClient, keys: dict[str, str]
+) -> None:
+    now = [0.0]
+    verifier = LocalVerifier(
+        client, background=False, max_staleness_seconds=30, clock=lambda: now[0]
+    )
+    with pytest.raises(StaleStateError):
+        verifier.verify_action(_body(keys))
+
+    verifier.start()
+    now[0] += 31
+    with pytest.raises(StaleStateError):
+        verifier.verify_action(_body(keys))
+
+
+def test_local_verifier_keeps_audit_batch_on_failure_and_bounds_queue(
+    client: LimiqClient, api: _FakeApi, keys: dict[str, str]
+) -> None:
+    verifier = LocalVerifier(client, background=False, audit_queue_size=3)
+    verifier.start()
+    api.fail_ingest = True
+    for _ in range(2):
+        verifier.verify_action(_body(keys))
+    assert verifier.flush_audit() == 0
+    assert verifier.pending_audit_events == 2
+
+    for _ in range(2):
+        verifier.verify_action(_body(keys, amount=500))
+    assert verifier.pending_audit_events == 3
+    assert verifier.dropped_audit_events == 1
+
+    api.fail_ingest = False
+    assert verifier.flush_audit() == 3
+    assert [decision["decision"] for decision in api.shipped] == [
+        "ALLOW",
+        "DENY",
+        "DENY",
+    ]
+
+
+def test_local_verifier_ships_audit_in_background(
+    client: LimiqClient, api: _FakeApi, keys: dict[str, str]
+) -> None:
+    with LocalVerifier(
+        client,
+        audit_batch_size=2,
+        audit_flush_interval_seconds=10,
+        sync_interval_seconds=10,
+    ) as verifier:
+        verifier.verify_action(_body(keys))
+        verifier.verify_action(_body(keys))
+
+        deadline = time.monotonic() + 2.0
+        while len(api.shipped) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(api.shipped) == 2
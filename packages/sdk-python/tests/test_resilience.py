@@ -0,0 +1,184 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from limiq_sdk import (
+    AsyncLimiqClient,
+    DeadlineExceeded,
+    HedgePolicy,
+    LimiqClient,
+    RetryPolicy,
+)
+from limiq_sdk.resilience import REQUEST_TIMEOUT_HEADER
+from limiq_sdk.types import VerifyRequestBody
+
+FAST_RETRY = RetryPolicy(max_attempts=3, backoff_base_seconds=0.001, backoff_max_seconds=0.002)
+
+
+def _payload() -> VerifyRequestBody:
+    return {
+        "workspace_id": "workspace-1",
+        "agent_id": "agent-1",
+        "action_type": "purchase",
+        "target_service": "stripe_proxy",
+        "payload": {"amount": 18},
+        "signature": "sig",
+        "capability_token": "tok",
+        "request_context": {},
+    }
+
+
+def _allow() -> httpx.Response:
+    return httpx.Response(
+        status_code=200,
+        json={
+            "decision": "ALLOW",
+            "reason_code": None,
+            "audit_event_id": "00000000-0000-0000-0000-000000000000",
+        },
+    )
+
+
+def _client(handler: object, **kwargs: object) -> LimiqClient:
+    return LimiqClient(
+        base_url="http://example.test",
+        workspace_id="workspace-1",
+        transport=httpx.MockTransport(handler),  # type: ignore[arg-type]
+        **kwargs,  # type: ignore[arg-type]
+    )
+
+
+def test_retries_shed_responses_and_connect_errors_then_succeeds() -> None:
+    calls: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(1)
+        if len(calls) == 1:
+            raise httpx.ConnectError("refused", request=request)
+        if len(calls) == 2:
+            return httpx.Response(status_code=503, headers={"Retry-After": "0"})
+        return _allow()
+
+    with _client(handler, retry=FAST_RETRY) as client:
+        assert client.verify_action(_payload())["decision"] == "ALLOW"
+    assert len(calls) == 3
+
+
+@pytest.mark.parametrize("status_code", [500, 502, 504])
+def test_does_not_retry_failures_that_may_have_been_applied(status_code: int) -> None:
+    calls: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(1)
+        return httpx.Response(status_code=status_code)
+
+    with _client(handler, retry=FAST_RETRY) as client, pytest.raises(httpx.HTTPStatusError):
+        client.verify_action(_payload())
+    assert len(calls) == 1
+
+
+def test_does_not_retry_read_timeouts() -> None:
+    calls: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(1)
+        raise httpx.ReadTimeout("slow", request=request)
+
+    with _client(handler, retry=FAST_RETRY) as client, pytest.raises(httpx.ReadTimeout):
+        client.verify_action(_payload())
+    assert len(calls) == 1
+
+
+def test_gives_up_after_max_attempts() -> None:
+    calls: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(1)
+        return httpx.Response(status_code=503)
+
+    with _client(handler, retry=FAST_RETRY) as client, pytest.raises(httpx.HTTPStatusError):
+        client.verify_action(_payload())
+    assert len(calls) == 3
+
+
+def test_deadline_is_propagated_and_enforced() -> None:
+    seen: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(int(request.headers[REQUEST_TIMEOUT_HEADER]))
+        if len(seen) == 1:
+            return httpx.Response(status_code=503, headers={"Retry-After": "0.05"})
+        return _allow()
+
+    with _client(handler, retry=FAST_RETRY, deadline=2.0) as client:
+        assert client.verify_action(_payload())["decision"] == "ALLOW"
+        assert 0 < seen[1] < seen[0] <= 2000
+
+        # Retry-After longer than the remaining budget: fail fast instead of waiting.
+        seen.clear()
+        with pytest.raises(httpx.HTTPStatusError):
+            client.verify_action(_payload(), deadline=0.02)
+        assert len(seen) == 1
+
+        with pytest.raises(DeadlineExceeded):
+            client.verify_action(_payload(), deadline=0)
+
+
+def test_no_deadline_header_without_budget() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert REQUEST_TIMEOUT_HEADER not in request.headers
+        return _allow()
+
+    with _client(handler) as client:
+        client.verify_action(_payload())
+
+
+def test_sync_hedge_returns_the_faster_copy() -> None:
+    calls: list[float] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(time.monotonic())
+        # Warm-up calls are fast; afterwards the first copy stalls and the hedge wins.
+        if len(calls) == 21:
+            time.sleep(0.5)
+        return _allow()
+
+    hedge = HedgePolicy(percentile=90, min_samples=20, min_delay_seconds=0.01)
+    with _client(handler, hedge=hedge) as client:
+        for _ in range(20):
+            client.verify_action(_payload())
+        start = time.monotonic()
+        assert client.verify_action(_payload())["decision"] == "ALLOW"
+        elapsed = time.monotonic() - start
+
+    assert len(calls) == 22
+    assert elapsed < 0.4
+
+
+def test_async_hedge_returns_the_faster_copy() -> None:
+    calls: list[int] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(1)
+        if len(calls) == 21:
+            await asyncio.sleep(0.5)
+        return _allow()
+
+    async def run() -> float:
+        async with AsyncLimiqClient(
+            base_url="http://example.test",
+            workspace_id="workspace-1",
+            transport=httpx.MockTransport(handler),
+            hedge=HedgePolicy(percentile=90, min_samples=20, min_delay_seconds=0.01),
+        ) as client:
+            for _ in range(20):
+                await client.verify_action(_payload())
+            start = time.monotonic()
+            await client.verify_action(_payload())
+            return time.monotonic() - start
+
+    elapsed = asyncio.run(run())
+    assert len(calls) == 22
+    assert elapsed < 0.4
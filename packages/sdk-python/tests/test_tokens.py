@@ -0,0 +1,140 @@
+import base64
+import json
+import time
+from typing import Any
+
+import httpx
+import pytest
+from limiq_sdk import CapabilityTokenError, CapabilityTokenVerifier, LimiqClient
+from nacl.signing import SigningKey
+
+WORKSPACE_ID = "22222222-2222-2222-2222-222222222222"
+AGENT_ID = "11111111-1111-1111-1111-111111111111"
+
+
+def _b64url(value: bytes) -> str:
+    return base64.urlsafe_b64encode(value).rstrip(b"=").decode("ascii")
+
+
+def _token(
+    key: SigningKey,
+    *,
+    kid: str = "k1",
+    workspace_id: str = WORKSPACE_ID,
+    exp_in: int = 900,
+) -> str:
+    now = int(time.time())
+    header = _b64url(json.dumps({"alg": "EdDSA", "kid": kid, "typ": "JWT"}).encode())
+    claims = _b64url(
+        json.dumps(
+            {
+                "sub": AGENT_ID,
+                "workspace_id": workspace_id,
+                "scopes": ["purchase"],
+                "iat": now,
+                "exp": now + exp_in,
+                "jti": "jti-1",
+            }
+        ).encode()
+    )
+    signature = _b64url(key.sign(f"{header}.{claims}".encode()).signature)
+    return f"{header}.{claims}.{signature}"
+
+
+class _FakeJwks:
+    def __init__(self) -> None:
+        self.keys = {"k1": SigningKey.generate()}
+        self.requests: list[str | None] = []
+        self.fail = False
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/.well-known/jwks.json"
+        self.requests.append(request.headers.get("If-None-Match"))
+        if self.fail:
+            return httpx.Response(503)
+        etag = '"' + "-".join(sorted(self.keys)) + '"'
+        headers = {"ETag": etag, "Cache-Control": "public, max-age=60"}
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers=headers)
+        keys = [
+            {"kty": "OKP", "crv": "Ed25519", "kid": kid, "x": _b64url(bytes(key.verify_key))}
+            for kid, key in self.keys.items()
+        ]
+        return httpx.Response(200, json={"keys": keys}, headers=headers)
+
+
+@pytest.fixture
+def jwks() -> _FakeJwks:
+    return _FakeJwks()
+
+
+@pytest.fixture
+def client(jwks: _FakeJwks) -> LimiqClient:
+    return LimiqClient(
+        base_url="http://example.test",
+        workspace_id=WORKSPACE_ID,
+        transport=httpx.MockTransport(jwks.handler),
+    )
+
+
+def _reason(verifier: CapabilityTokenVerifier, token: str, **kwargs: Any) -> str:
+    with pytest.raises(CapabilityTokenError) as excinfo:
+        verifier.verify(token, **kwargs)
+    return excinfo.value.reason_code
+
+
+def test_token_verifier_checks_tokens_against_cached_jwks(
+    client: LimiqClient, jwks: _FakeJwks
+) -> None:
+    now = [0.0]
+    verifier = CapabilityTokenVerifier(client, clock=lambda: now[0])
+    key = jwks.keys["k1"]
+
+    assert verifier.verify(_token(key), agent_id=AGENT_ID)["jti"] == "jti-1"
+    assert _reason(verifier, _token(key, exp_in=-60)) == "CAPABILITY_EXPIRED"
+    assert _reason(verifier, _token(SigningKey.generate())) == "CAPABILITY_INVALID"
+    assert _reason(verifier, _token(key, workspace_id="other")) == "WORKSPACE_MISMATCH"
+    assert _reason(verifier, _token(key), agent_id="someone-else") == "WORKSPACE_MISMATCH"
+    assert _reason(verifier, "not-a-token") == "CAPABILITY_INVALID"
+    assert jwks.requests == [None]
+
+    # Past max-age the set is revalidated; a 304 keeps the cached keys.
+    now[0] = 61
+    verifier.verify(_token(key))
+    assert jwks.requests == [None, '"k1"']
+
+
+def test_token_verifier_refetches_for_unknown_kid_at_most_once_per_interval(
+    client: LimiqClient, jwks: _FakeJwks
+) -> None:
+    now = [0.0]
+    verifier = CapabilityTokenVerifier(
+        client, min_refresh_interval_seconds=30, clock=lambda: now[0]
+    )
+    verifier.refresh()
+    jwks.keys["k2"] = SigningKey.generate()
+
+    # Within the interval a new kid is not fetched, so made-up kids stay cheap.
+    assert _reason(verifier, _token(jwks.keys["k2"], kid="k2")) == "CAPABILITY_INVALID"
+    assert len(jwks.requests) == 1
+
+    now[0] = 31
+    assert verifier.verify(_token(jwks.keys["k2"], kid="k2"))["sub"] == AGENT_ID
+    assert len(jwks.requests) == 2
+
+
+def test_token_verifier_keeps_stale_keys_when_refresh_fails(
+    client: LimiqClient, jwks: _FakeJwks
+) -> None:
+    now = [0.0]
+    verifier = CapabilityTokenVerifier(client, clock=lambda: now[0])
+    verifier.refresh()
+    jwks.fail = True
+    now[0] = 120
+
+    assert verifier.verify(_token(jwks.keys["k1"]))["jti"] == "jti-1"
+    assert len(jwks.requests) == 2
+
+    fresh = CapabilityTokenVerifier(client)
+    with pytest.raises(httpx.HTTPStatusError):
+        fresh.verify(_token(jwks.keys["k1"]))
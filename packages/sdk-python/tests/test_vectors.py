@@ -2,10 +2,14 @@ import json
 from hashlib import sha256
 from pathlib import Path
 
-from limiq_sdk.canonical import canonicalize
+import pytest
 
+from limiq_sdk.canonical import CANONICAL_BACKENDS
 
-def test_shared_verify_vectors_match_python_sdk() -> None:
+
+@pytest.mark.parametrize("backend", sorted(CANONICAL_BACKENDS))
+def test_shared_verify_vectors_match_python_sdk(backend: str) -> None:
+    canonicalize = CANONICAL_BACKENDS[backend]
     vectors_dir = Path(__file__).resolve().parents[3] / "shared-test-vectors" / "verify"
     vector_files = sorted(vectors_dir.glob("*.json"))
     assert vector_files
@@ -17,3 +21,17 @@ def test_shared_verify_vectors_match_python_sdk() -> None:
 
         assert canonical == vector["expected"]["canonical_json"]
         assert digest == vector["expected"]["sha256_hex"]
+
+
+@pytest.mark.parametrize("backend", sorted(CANONICAL_BACKENDS))
+def test_canonical_backends_match_reference_on_nested_non_ascii(backend: str) -> None:
+    canonicalize = CANONICAL_BACKENDS[backend]
+    payloads = [
+        {"é": 1, "e": 2, "中文": {"z": [1.5, 1e16, 1e-7, None]}, "\U0001f600": "ok"},
+        {"nested": {"b": {"a": [{"y": True, "x": False}]}}, "amount": 18.25},
+        {"big": 2**70, "tab\t": "line\nbreak", "quote\"": "back\\slash"},
+    ]
+
+    for payload in payloads:
+        expected = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        assert canonicalize(payload) == expected
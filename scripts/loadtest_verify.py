@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""Drive POST /verify against a running API and report latency percentiles as JSON.
+
+Bootstraps a fresh workspace, agents, policies and capabilities through the real
+API, pre-signs a pool of requests with limiq_sdk.build_signed_request, then sends
+them either at a fixed arrival rate (open loop, --rate) or with a fixed number of
+in-flight requests (closed loop, --concurrency).
+
+Prerequisites: the API running against the docker-compose Postgres/Redis with
+KYA_WORKSPACE_BOOTSTRAP_TOKEN set, and `pip install -e packages/sdk-python`.
+
+    python scripts/loadtest_verify.py --rate 200 --duration 30 --deny-ratio 0.1
+    python scripts/loadtest_verify.py --concurrency 32 --requests 20000 --output report.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import uuid4
+
+import httpx
+from limiq_sdk import build_signed_request, generate_keys
+
+# ALLOW requests stay under the spend cap; DENY requests exceed it so they run the
+# full pipeline (JWT, revocation, signature, policy) before being rejected.
+_MAX_PER_TX = 50
+_ALLOW_AMOUNT = 18
+_DENY_AMOUNT = 500
+_DENY_REASON = "SPEND_LIMIT_EXCEEDED"
+_SIGNED_POOL_SIZE = 512
+
+
+@dataclass(frozen=True)
+class SignedRequest:
+    expected: str
+    body: dict[str, Any]
+
+
+@dataclass
+class Results:
+    latencies_ms: list[float] = field(default_factory=list)
+    decisions: Counter[str] = field(default_factory=Counter)
+    reason_codes: Counter[str] = field(default_factory=Counter)
+    http_errors: Counter[str] = field(default_factory=Counter)
+    exceptions: Counter[str] = field(default_factory=Counter)
+    unexpected_decisions: int = 0
+
+
+def _raise_for_status(response: httpx.Response, step: str) -> dict[str, Any]:
+    if response.is_error:
+        raise SystemExit(f"{step} failed: HTTP {response.status_code} {response.text}")
+    body: dict[str, Any] = response.json()
+    return body
+
+
+async def _bootstrap(
+    client: httpx.AsyncClient,
+    *,
+    bootstrap_token: str,
+    agent_count: int,
+) -> list[SignedRequest]:
+    suffix = uuid4().hex[:8]
+    workspace = _raise_for_status(
+        await client.post(
+            "/workspaces",
+            json={"name": f"loadtest {suffix}", "slug": f"loadtest-{suffix}"},
+            headers={"X-Bootstrap-Token": bootstrap_token},
+        ),
+        "create workspace",
+    )
+    workspace_id = str(workspace["id"])
+    headers = {"X-Workspace-Id": workspace_id}
+
+    policy = _raise_for_status(
+        await client.post(
+            "/policies",
+            json={
+                "workspace_id": workspace_id,
+                "name": f"loadtest-{suffix}",
+                "version": 1,
+                "schema_version": 1,
+                "policy_json": {
+                    "allowed_tools": ["purchase"],
+                    "spend": {"currency": "EUR", "max_per_tx": _MAX_PER_TX},
+                    # Keep the Redis rate-limit check on the path without tripping it.
+                    "rate_limits": {"max_actions_per_min": 1_000_000_000},
+                },
+            },
+            headers=headers,
+        ),
+        "create policy",
+    )
+
+    agents: list[tuple[str, str, str]] = []
+    for index in range(agent_count):
+        keys = generate_keys()
+        agent = _raise_for_status(
+            await client.post(
+                "/agents",
+                json={
+                    "workspace_id": workspace_id,
+                    "name": f"loadtest-agent-{index}",
+                    "public_key": keys["public_key_base64"],
+                    "metadata": {"loadtest": suffix},
+                },
+                headers=headers,
+            ),
+            "create agent",
+        )
+        agent_id = str(agent["id"])
+        _raise_for_status(
+            await client.post(
+                f"/agents/{agent_id}/bind_policy",
+                json={"workspace_id": workspace_id, "policy_id": policy["id"]},
+                headers=headers,
+            ),
+            "bind policy",
+        )
+        capability = _raise_for_status(
+            await client.post(
+                "/capabilities/request",
+                json={
+                    "workspace_id": workspace_id,
+                    "agent_id": agent_id,
+                    "action": "purchase",
+                    "target_service": "stripe_proxy",
+                    "requested_scopes": ["purchase"],
+                    "requested_limits": {"amount": _MAX_PER_TX, "currency": "EUR"},
+                    "ttl_minutes": 30,
+                },
+                headers=headers,
+            ),
+            "request capability",
+        )
+        agents.append((agent_id, keys["private_key_base64"], str(capability["token"])))
+
+    pool: list[SignedRequest] = []
+    for index in range(_SIGNED_POOL_SIZE):
+        agent_id, private_key, token = agents[index % len(agents)]
+        for expected, amount in (("ALLOW", _ALLOW_AMOUNT), ("DENY", _DENY_AMOUNT)):
+            body = build_signed_request(
+                workspace_id=workspace_id,
+                agent_id=agent_id,
+                action_type="purchase",
+                target_service="stripe_proxy",
+                payload={"amount": amount, "currency": "EUR", "order_id": f"{suffix}-{index}"},
+                capability_token=token,
+                private_key_base64=private_key,
+            )
+            pool.append(SignedRequest(expected=expected, body=dict(body)))
+    return pool
+
+
+def _pick(pool: list[SignedRequest], deny_ratio: float, rng: random.Random) -> SignedRequest:
+    expected = "DENY" if rng.random() < deny_ratio else "ALLOW"
+    while True:
+        candidate = pool[rng.randrange(len(pool))]
+        if candidate.expected == expected:
+            return candidate
+
+
+async def _send(
+    client: httpx.AsyncClient,
+    request: SignedRequest,
+    results: Results,
+    started_at: float,
+) -> None:
+    # started_at is the scheduled send time in rate mode, so queueing delay caused
+    # by a slow server is counted instead of hidden (no coordinated omission).
+    try:
+        response = await client.post(
+            "/verify",
+            json=request.body,
+            headers={"X-Workspace-Id": request.body["workspace_id"]},
+        )
+    except httpx.HTTPError as exc:
+        results.exceptions[type(exc).__name__] += 1
+        return
+    finally:
+        results.latencies_ms.append((time.perf_counter() - started_at) * 1000)
+
+    if response.status_code != 200:
+        results.http_errors[str(response.status_code)] += 1
+        return
+
+    body = response.json()
+    decision = str(body.get("decision"))
+    results.decisions[decision] += 1
+    results.reason_codes[str(body.get("reason_code") or "NONE")] += 1
+    expected_reason = None if request.expected == "ALLOW" else _DENY_REASON
+    if decision != request.expected or body.get("reason_code") != expected_reason:
+        results.unexpected_decisions += 1
+
+
+async def _run_fixed_rate(
+    client: httpx.AsyncClient,
+    pool: list[SignedRequest],
+    results: Results,
+    *,
+    rate: float,
+    total: int,
+    deny_ratio: float,
+    rng: random.Random,
+) -> None:
+    tasks: set[asyncio.Task[None]] = set()
+    start = time.perf_counter()
+    for index in range(total):
+        scheduled = start + index / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        task = asyncio.create_task(_send(client, _pick(pool, deny_ratio, rng), results, scheduled))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    if tasks:
+        await asyncio.gather(*tasks)
+
+
+async def _run_fixed_concurrency(
+    client: httpx.AsyncClient,
+    pool: list[SignedRequest],
+    results: Results,
+    *,
+    concurrency: int,
+    total: int,
+    deny_ratio: float,
+    rng: random.Random,
+) -> None:
+    remaining = total
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await _send(client, _pick(pool, deny_ratio, rng), results, time.perf_counter())
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+def _percentile(sorted_values: list[float], percentile: float) -> float | None:
+    if not sorted_values:
+        return None
+    # Nearest-rank percentile.
+    rank = max(1, -(-len(sorted_values) * percentile // 100))
+    return round(sorted_values[int(rank) - 1], 3)
+
+
+def _report(args: argparse.Namespace, results: Results, elapsed: float) -> dict[str, Any]:
+    latencies = sorted(results.latencies_ms)
+    sent = len(latencies)
+    errors = sum(results.http_errors.values()) + sum(results.exceptions.values())
+    return {
+        "config": {
+            "base_url": args.base_url,
+            "mode": "rate" if args.rate else "concurrency",
+            "rate": args.rate,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "agents": args.agents,
+            "deny_ratio": args.deny_ratio,
+            "seed": args.seed,
+        },
+        "duration_s": round(elapsed, 3),
+        "sent": sent,
+        "throughput_rps": round(sent / elapsed, 2) if elapsed > 0 else None,
+        "latency_ms": {
+            "min": round(latencies[0], 3) if latencies else None,
+            "mean": round(sum(latencies) / sent, 3) if sent else None,
+            "p50": _percentile(latencies, 50),
+            "p95": _percentile(latencies, 95),
+            "p99": _percentile(latencies, 99),
+            "p99_9": _percentile(latencies, 99.9),
+            "max": round(latencies[-1], 3) if latencies else None,
+        },
+        "decisions": dict(results.decisions),
+        "reason_codes": dict(results.reason_codes),
+        "unexpected_decisions": results.unexpected_decisions,
+        "errors": {
+            "http": dict(results.http_errors),
+            "exceptions": dict(results.exceptions),
+            "total": errors,
+            "rate": round(errors / sent, 6) if sent else None,
+        },
+    }
+
+
+async def _main(args: argparse.Namespace) -> dict[str, Any]:
+    rng = random.Random(args.seed)
+    limits = httpx.Limits(
+        max_connections=args.max_connections,
+        max_keepalive_connections=args.max_connections,
+    )
+    async with httpx.AsyncClient(
+        base_url=args.base_url.rstrip("/"), timeout=args.timeout, limits=limits
+    ) as client:
+        pool = await _bootstrap(
+            client, bootstrap_token=args.bootstrap_token, agent_count=args.agents
+        )
+
+        async def drive(results: Results, total: int) -> None:
+            if args.rate:
+                await _run_fixed_rate(
+                    client,
+                    pool,
+                    results,
+                    rate=args.rate,
+                    total=total,
+                    deny_ratio=args.deny_ratio,
+                    rng=rng,
+                )
+            else:
+                await _run_fixed_concurrency(
+                    client,
+                    pool,
+                    results,
+                    concurrency=args.concurrency,
+                    total=total,
+                    deny_ratio=args.deny_ratio,
+                    rng=rng,
+                )
+
+        if args.warmup:
+            await drive(Results(), args.warmup)
+
+        results = Results()
+        start = time.perf_counter()
+        await drive(results, args.requests)
+        elapsed = time.perf_counter() - start
+
+    return _report(args, results, elapsed)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test POST /verify.")
+    parser.add_argument(
+        "--base-url", default=os.environ.get("LIMIQ_API_URL", "http://localhost:8000")
+    )
+    parser.add_argument(
+        "--bootstrap-token",
+        default=os.environ.get("KYA_WORKSPACE_BOOTSTRAP_TOKEN"),
+        help="Workspace bootstrap token (default: $KYA_WORKSPACE_BOOTSTRAP_TOKEN)",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--rate", type=float, help="Fixed arrival rate in requests per second")
+    mode.add_argument("--concurrency", type=int, help="Fixed in-flight requests (default 16)")
+    parser.add_argument("--requests", type=int, default=5000, help="Measured requests")
+    parser.add_argument("--duration", type=float, help="With --rate: run for this many seconds")
+    parser.add_argument("--warmup", type=int, default=200, help="Unmeasured warmup requests")
+    parser.add_argument("--agents", type=int, default=8)
+    parser.add_argument("--deny-ratio", type=float, default=0.0)
+    parser.add_argument("--max-connections", type=int, default=100)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    if not args.bootstrap_token:
+        parser.error("--bootstrap-token or KYA_WORKSPACE_BOOTSTRAP_TOKEN is required")
+    if not 0.0 <= args.deny_ratio <= 1.0:
+        parser.error("--deny-ratio must be between 0 and 1")
+    if not args.rate and args.concurrency is None:
+        args.concurrency = 16
+    if args.duration is not None:
+        if not args.rate:
+            parser.error("--duration requires --rate")
+        args.requests = int(args.rate * args.duration)
+
+    report = asyncio.run(_main(args))
+    rendered = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(rendered + "\n")
+    sys.stdout.write(rendered + "\n")
+    return 0 if report["errors"]["total"] == 0 and report["unexpected_decisions"] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())